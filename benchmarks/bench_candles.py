@@ -0,0 +1,47 @@
+"""
+Benchmark for the vectorized candlestick renderer.
+
+Renders synthetic 1m candles with the Agg backend and prints the time per
+size and per candle. Render time should grow roughly linearly with the
+number of candles.
+
+Usage:
+    python -m benchmarks.bench_candles [--sizes 1000 10000 100000 1000000]
+"""
+import argparse
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+
+from benchmarks.synthetic import synthetic_ohlcv
+from chart_tools.candles import draw_candles
+
+
+def bench(n: int) -> float:
+    df = synthetic_ohlcv(n)
+    fig, ax = plt.subplots(figsize=(14, 4))
+    start = time.perf_counter()
+    draw_candles(ax, df)
+    fig.canvas.draw()
+    elapsed = time.perf_counter() - start
+    plt.close(fig)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'candles':>10} {'seconds':>10} {'us/candle':>10}")
+    for n in args.sizes:
+        elapsed = bench(n)
+        print(f"{n:>10} {elapsed:>10.3f} {elapsed / n * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
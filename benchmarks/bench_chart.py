@@ -0,0 +1,50 @@
+"""
+Benchmarks of the chart pipeline stages: loading a JSON export, normalising
+it and rendering the figure (Agg backend, with decimation).
+
+Usage:
+    python -m pytest benchmarks/bench_chart.py [--bench-max-rows 100000]
+"""
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import pytest
+
+from benchmarks.conftest import rounds_for
+from benchmarks.synthetic import write_json_export
+from chart_tools import load_json, normalise, plot_indicators
+
+PLOT_KWARGS = dict(sma=True, ema=True, bbands=True, rsi=True, macd=True, atr=True)
+
+
+@pytest.fixture(scope="module")
+def export(rows, tmp_path_factory):
+    return write_json_export(tmp_path_factory.mktemp("exports") / f"export_{rows}.json", rows)
+
+
+@pytest.fixture(scope="module")
+def raw(export):
+    return load_json(export)
+
+
+def test_load_json(benchmark, export, rows):
+    df = benchmark.pedantic(load_json, args=(export,), rounds=rounds_for(rows))
+    assert len(df) == rows
+
+
+def test_normalise(benchmark, raw, rows):
+    df = benchmark.pedantic(normalise, setup=lambda: ((raw.copy(),), {}), rounds=rounds_for(rows))
+    assert "MACD_hist" in df
+
+
+def test_render(benchmark, raw, rows):
+    df = normalise(raw.copy())
+
+    def render():
+        fig = plot_indicators(df, **PLOT_KWARGS)
+        fig.canvas.draw()
+        plt.close(fig)
+
+    benchmark.pedantic(render, rounds=rounds_for(rows))
@@ -0,0 +1,82 @@
+"""
+Benchmarks of the BackendStrategy hot paths.
+
+populate_entry_trend requests its plan from a local stub server on every
+round, custom_exit and custom_stoploss run over thousands of open trades
+(max_open_trades set to match, which sizes the parsed entry tag cache; the
+larger counts exceed its 1024-tag minimum).
+
+Usage:
+    python -m pytest benchmarks/bench_strategy.py [--bench-max-rows 100000]
+"""
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+from benchmarks.conftest import load_strategy, rounds_for
+from benchmarks.synthetic import dummy_trades, strategy_dataframe
+
+TRADE_COUNTS = (1_000, 10_000, 20_000)
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="module")
+def dataframe(rows):
+    return strategy_dataframe(rows)
+
+
+def test_populate_indicators(benchmark, strategy, dataframe, rows):
+    result = benchmark.pedantic(strategy.populate_indicators, setup=lambda: ((dataframe.copy(), {"pair": "BTC/USDT"}), {}),
+                                rounds=rounds_for(rows))
+    assert result["sma_period_50_close"].notna().any()
+
+
+def test_populate_entry_trend(benchmark, strategy, trade_plan_server, dataframe, rows):
+    strategy.trade_plan_client.url = trade_plan_server.url
+
+    def run():
+        # Without the per-candle cache every round requests the plan
+        strategy.trade_plan_cache.clear()
+        return strategy.populate_entry_trend(dataframe, {"pair": "BTC/USDT"})
+
+    result = benchmark.pedantic(run, rounds=rounds_for(rows) * 5, warmup_rounds=1)
+    assert result["enter_long"].iloc[-1] == 1
+
+
+def test_replay_entry_trend(benchmark, strategy, dataframe, rows):
+    from trade_plan_replay import PLAN_FIELDS, TradePlanReplay
+    times = dataframe["date"].iloc[::20] + pd.Timedelta(minutes=5, seconds=2)
+    plans = pd.DataFrame({"pair": "BTC/USDT", "time": times.astype("datetime64[ns, UTC]")})
+    for field in PLAN_FIELDS:
+        plans[field] = None
+    plans["direction"] = "long"
+    strategy.trade_plan_replay = TradePlanReplay(plans.reset_index(drop=True))
+
+    result = benchmark.pedantic(strategy.populate_entry_trend, setup=lambda: ((dataframe.copy(), {"pair": "BTC/USDT"}), {}),
+                                rounds=rounds_for(rows))
+    assert result["enter_long"].sum() == len(plans)
+
+
+@pytest.mark.parametrize("trades", TRADE_COUNTS)
+def test_custom_exit(benchmark, trades):
+    strategy = load_strategy(max_open_trades=trades)
+    open_trades = dummy_trades(trades)
+
+    def run():
+        return sum(strategy.custom_exit(trade.pair, trade, NOW, 100.0, 0.05) for trade in open_trades)
+
+    assert benchmark(run) > 0
+
+
+@pytest.mark.parametrize("trades", TRADE_COUNTS)
+def test_custom_stoploss(benchmark, trades):
+    strategy = load_strategy(max_open_trades=trades)
+    open_trades = dummy_trades(trades)
+
+    def run():
+        return [strategy.custom_stoploss(trade.pair, trade, NOW, 100.0, 0.0, True) for trade in open_trades]
+
+    stops = benchmark(run)
+    assert all(-0.05 <= stop < 0 for stop in stops)
@@ -0,0 +1,57 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+FREQTRADE_DIR = Path(__file__).resolve().parent.parent / "freqtrade"
+
+# The strategy modules live next to the freqtrade config, not in a package
+sys.path.insert(0, str(FREQTRADE_DIR))
+
+from benchmarks.synthetic import SIZES  # noqa: E402
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bench-max-rows", type=int, default=SIZES[-1],
+                     help="largest synthetic dataset (rows) to benchmark")
+
+
+def pytest_generate_tests(metafunc):
+    if "rows" in metafunc.fixturenames:
+        max_rows = metafunc.config.getoption("--bench-max-rows")
+        metafunc.parametrize("rows", [n for n in SIZES if n <= max_rows], scope="module")
+
+
+def rounds_for(rows: int) -> int:
+    """
+    Fewer rounds for the large datasets, so the full suite stays within minutes.
+    """
+    return max(1, min(10, 1_000_000 // rows))
+
+
+def load_strategy(**overrides):
+    """
+    BackendStrategy of the example config, with top-level settings overridden.
+    """
+    from backend_strategy import BackendStrategy
+    with (FREQTRADE_DIR / "config.json").open() as f:
+        config = json.load(f)
+    strategy = BackendStrategy({**config, **overrides})
+    # No open trades, without querying the database
+    strategy._open_pairs = set()
+    return strategy
+
+
+@pytest.fixture
+def strategy():
+    return load_strategy()
+
+
+@pytest.fixture(scope="session")
+def trade_plan_server():
+    from trade_plan_stub import TradePlanStub
+    with TradePlanStub() as stub:
+        yield stub
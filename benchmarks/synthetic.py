@@ -0,0 +1,94 @@
+"""
+Synthetic inputs for the benchmarks: random-walk OHLCV candles, chart exports
+and dummy trades of any size.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from chart_tools import indicators
+
+# Row counts covered by the benchmarks (limited with --bench-max-rows)
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+
+def synthetic_ohlcv(n: int, seed: int = 42, freq: str = "1min") -> pd.DataFrame:
+    """
+    Random-walk OHLCV candles, indexed by time.
+    """
+    rng = np.random.default_rng(seed)
+    close = 50_000 + np.cumsum(rng.normal(0, 10, n))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = np.abs(rng.normal(0, 5, n))
+    index = pd.date_range("2025-01-01", periods=n, freq=freq, tz="UTC", name="time")
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) + spread,
+            "low": np.minimum(open_, close) - spread,
+            "close": close,
+            "volume": np.abs(rng.normal(100, 30, n)),
+        },
+        index=index,
+    )
+
+
+def strategy_dataframe(n: int, seed: int = 42, freq: str = "5min") -> pd.DataFrame:
+    """
+    Candles as freqtrade hands them to a strategy, with a "date" column.
+    """
+    return synthetic_ohlcv(n, seed, freq).rename_axis("date").reset_index()
+
+
+def write_json_export(path, n: int, timeframe: str = "5m", seed: int = 42) -> Path:
+    """
+    Writes a chart export ({timeframe: {"candles": [...], "indicators": [...]}})
+    with nested macd/bbands objects, like the trading server produces.
+    """
+    df = synthetic_ohlcv(n, seed, freq=timeframe.replace("m", "min"))
+    close = df["close"].to_numpy()
+    times = df.index.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    macd, signal, hist = indicators.macd(close)
+    lower, middle, upper = indicators.bbands(close)
+    candles = df.reset_index(drop=True).assign(time=times)
+    values = pd.DataFrame({
+        "time": times,
+        "sma": indicators.sma(close),
+        "ema": indicators.ema(close),
+        "rsi": indicators.rsi(close),
+        "atr": indicators.atr(df["high"], df["low"], close),
+    })
+    values["macd"] = [{"macd": m, "signal": s, "hist": h} for m, s, h in zip(macd, signal, hist)]
+    values["bbands"] = [{"lower": lo, "middle": mi, "upper": up} for lo, mi, up in zip(lower, middle, upper)]
+
+    path = Path(path)
+    with path.open("w") as f:
+        f.write(f'{{{json.dumps(timeframe)}: {{"candles": ')
+        f.write(candles.to_json(orient="records", double_precision=10))
+        f.write(', "indicators": ')
+        f.write(values.to_json(orient="records", double_precision=10))
+        f.write("}}")
+    return path
+
+
+class DummyTrade:
+    def __init__(self, pair: str, enter_tag: str):
+        self.pair = pair
+        self.enter_tag = enter_tag
+
+
+def dummy_trades(n: int, seed: int = 42) -> list[DummyTrade]:
+    """
+    Open trades with distinct entry tags (stoploss in percent, partly with a
+    lost decimal point, and takeProfit), as the strategy stores them.
+    """
+    rng = np.random.default_rng(seed)
+    stoploss = np.where(rng.random(n) < 0.2, rng.integers(100, 999, n), rng.uniform(0.5, 5.0, n).round(2))
+    take_profit = rng.uniform(1.0, 10.0, n).round(2)
+    return [
+        DummyTrade(f"PAIR{i}/USDT", json.dumps({"id": i, "price": 100.0, "stoploss": float(sl), "takeProfit": float(tp),
+                                                "leverage": 3, "pos": 0.6}))
+        for i, (sl, tp) in enumerate(zip(stoploss, take_profit))
+    ]
@@ -0,0 +1,45 @@
+"""
+Chart tools: load, normalise and render candlestick charts with indicators.
+
+The public API is imported lazily, so ``import chart_tools`` does not pull in
+pandas or matplotlib until a function is actually used:
+
+    import chart_tools
+    df = chart_tools.normalise(chart_tools.load("data.json"))
+    fig = chart_tools.plot_indicators(df)
+"""
+import importlib
+
+_EXPORTS = {
+    "load": "chart_tools.loaders",
+    "load_json": "chart_tools.loaders",
+    "load_csv": "chart_tools.loaders",
+    "load_frame": "chart_tools.loaders",
+    "list_timeframes": "chart_tools.loaders",
+    "normalise": "chart_tools.schema",
+    "plot_indicators": "chart_tools.render",
+    "create_figure": "chart_tools.render",
+    "render_batch": "chart_tools.batch",
+    "FrameCache": "chart_tools.cache",
+    "draw_candles": "chart_tools.candles",
+    "load_timeframes": "chart_tools.multitf",
+    "align_timeframes": "chart_tools.multitf",
+    "plot_timeframes": "chart_tools.multitf",
+    "OHLCPyramid": "chart_tools.viewer",
+    "ChartViewer": "chart_tools.viewer",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'chart_tools' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,5 @@
+import sys
+
+from chart_tools.cli import main
+
+sys.exit(main(prog="python -m chart_tools"))
@@ -0,0 +1,205 @@
+"""
+Headless batch rendering of many chart exports to image files.
+
+Charts are rendered with the Agg backend in a pool of worker processes. Each
+worker keeps one figure per subplot layout and reuses it for every chart
+with that layout instead of creating a new figure per chart.
+
+    python -m chart_tools.batch exports/ "archive/*.csv" -o charts/ --format svg --workers 8
+"""
+import argparse
+import glob
+import logging
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+INPUT_SUFFIXES = (".json", ".csv")
+
+# Per-process figure templates, keyed by the tuple of extra subplots
+_templates: dict = {}
+
+
+@dataclass
+class BatchReport:
+    charts: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+    # Peak resident memory in MB per worker pid
+    peak_memory_mb: dict[int, float] = field(default_factory=dict)
+    outputs: list[Path] = field(default_factory=list)
+
+    @property
+    def charts_per_second(self) -> float:
+        return self.charts / self.seconds if self.seconds > 0 else 0.0
+
+    def summary(self) -> str:
+        lines = [
+            f"rendered {self.charts} charts ({self.failed} failed) in {self.seconds:.2f}s, "
+            f"{self.charts_per_second:.2f} charts/s"
+        ]
+        for pid, peak in sorted(self.peak_memory_mb.items()):
+            lines.append(f"  worker {pid}: peak memory {peak:.1f} MB")
+        return "\n".join(lines)
+
+
+def collect_inputs(sources) -> list[Path]:
+    """
+    Expands directories and glob patterns into a sorted list of JSON/CSV files.
+    """
+    paths = set()
+    for source in sources:
+        source = str(source)
+        if os.path.isdir(source):
+            candidates = Path(source).iterdir()
+        else:
+            candidates = (Path(p) for p in glob.glob(source, recursive=True))
+        paths.update(p for p in candidates if p.is_file() and p.suffix.lower() in INPUT_SUFFIXES)
+    return sorted(paths)
+
+
+def _peak_memory_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _template_axes(extras: list[str]):
+    key = tuple(extras)
+    if key not in _templates:
+        from chart_tools.render import create_figure
+        _templates[key] = create_figure(extras)
+    return _templates[key][1]
+
+
+def render_file(path, output: Path, timeframe: str | None = None, dpi: int = 100, cache=None,
+                **plot_kwargs) -> Path:
+    """
+    Loads, normalises and renders one export to an image file, reusing this
+    process' figure template for the chart's subplot layout.
+    """
+    from chart_tools.loaders import load_frame
+    from chart_tools.render import panels_for, plot_indicators
+
+    df = load_frame(path, timeframe=timeframe, cache=cache)
+
+    extras = panels_for(df, **{k: plot_kwargs.get(k, True) for k in ("rsi", "macd", "atr")})
+    axes = _template_axes(extras)
+    # Decimation targets are derived from the figure dpi
+    axes[0].figure.set_dpi(dpi)
+    fig = plot_indicators(df, axes=axes, **plot_kwargs)
+    fig.savefig(output, dpi=dpi)
+    return output
+
+
+def _render_task(path, output, timeframe, dpi, cache, plot_kwargs):
+    render_file(path, output, timeframe=timeframe, dpi=dpi, cache=cache, **plot_kwargs)
+    return output, os.getpid(), _peak_memory_mb()
+
+
+def output_path(path, out_dir, fmt: str, timeframe: str | None = None) -> Path:
+    stem = Path(path).stem
+    if timeframe:
+        stem = f"{stem}_{timeframe}"
+    return Path(out_dir) / f"{stem}.{fmt}"
+
+
+def render_batch(sources, out_dir, fmt: str = "png", workers: int | None = None, timeframe: str | None = None,
+                 all_timeframes: bool = False, dpi: int = 100, cache=None, **plot_kwargs) -> BatchReport:
+    """
+    Renders every JSON/CSV export matched by sources into out_dir.
+
+    :param sources: files, directories or glob patterns
+    :param fmt: image format understood by savefig, e.g. "png" or "svg"
+    :param workers: number of worker processes, defaults to the CPU count
+    :param timeframe: timeframe to render from JSON exports (default: first in file)
+    :param all_timeframes: render one chart per timeframe of each JSON export
+    :param cache: optional chart_tools.cache.FrameCache shared by all workers
+    :return: BatchReport with throughput and peak memory per worker
+    """
+    from chart_tools.loaders import list_timeframes
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    tasks = []
+    seen = set()
+    for path in collect_inputs(sources):
+        if all_timeframes and path.suffix.lower() == ".json":
+            timeframes = list_timeframes(path)
+        else:
+            timeframes = [timeframe]
+        for tf in timeframes:
+            output = output_path(path, out_dir, fmt, tf)
+            if output in seen:
+                # e.g. data.json and data.csv in the same directory
+                output = output.with_name(f"{output.stem}_{path.suffix.lstrip('.').lower()}{output.suffix}")
+            seen.add(output)
+            tasks.append((path, output, tf))
+
+    report = BatchReport()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {
+            pool.submit(_render_task, path, output, tf, dpi, cache, plot_kwargs): path
+            for path, output, tf in tasks
+        }
+        for future in as_completed(futures):
+            try:
+                output, pid, peak = future.result()
+            except Exception as e:
+                logger.error(f"Error rendering {futures[future]}: {e}")
+                report.failed += 1
+                continue
+            report.charts += 1
+            report.outputs.append(output)
+            report.peak_memory_mb[pid] = max(peak, report.peak_memory_mb.get(pid, 0.0))
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m chart_tools.batch", description="Render many chart exports to image files."
+    )
+    parser.add_argument("sources", nargs="+", help="JSON/CSV files, directories or glob patterns")
+    parser.add_argument("-o", "--out-dir", required=True, help="directory for the rendered images")
+    parser.add_argument("--format", default="png", help="image format, e.g. png or svg (default: png)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--dpi", type=int, default=100)
+    parser.add_argument("--no-cache", dest="cache", action="store_false",
+                        help="do not read or write the on-disk cache of parsed exports")
+    parser.add_argument("--cache-dir", default=None,
+                        help="cache directory (default: $CHART_TOOLS_CACHE_DIR or ~/.cache/chart_tools)")
+    tf_group = parser.add_mutually_exclusive_group()
+    tf_group.add_argument("--tf", dest="timeframe", default=None,
+                          help="timeframe to render from JSON exports (default: first in file)")
+    tf_group.add_argument("--all-timeframes", action="store_true",
+                          help="render every timeframe of each JSON export")
+    args = parser.parse_args(argv)
+
+    from chart_tools.cache import FrameCache
+
+    logging.basicConfig(level=logging.INFO)
+    report = render_batch(
+        args.sources, args.out_dir, fmt=args.format, workers=args.workers,
+        timeframe=args.timeframe, all_timeframes=args.all_timeframes, dpi=args.dpi,
+        cache=FrameCache(args.cache_dir) if args.cache else None,
+    )
+    print(report.summary())
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
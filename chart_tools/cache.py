@@ -0,0 +1,179 @@
+"""
+Content-hashed on-disk cache for normalised chart frames.
+
+Each entry is a directory holding the time index and all float64 columns as
+.npy arrays, which are memory-mapped copy-on-write on load, so re-plotting a
+large export skips parsing, date conversion and normalisation entirely, and
+frames from the cache can be modified like freshly loaded ones.
+
+Entries are keyed by a hash of the source file's content plus the loader
+arguments. The content hash of a source is remembered together with its size
+and mtime and only recomputed when either changes. The cache is bounded in
+size, the least recently used entries are evicted first.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+# Bumped whenever the stored layout or the normalised schema changes
+CACHE_VERSION = 2
+
+
+def default_cache_dir() -> Path:
+    return Path(os.environ.get("CHART_TOOLS_CACHE_DIR", Path.home() / ".cache" / "chart_tools"))
+
+
+def file_digest(path, chunk_size: int = 1024 * 1024) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _write_json_atomic(path: Path, data: dict):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data))
+    os.replace(tmp, path)
+
+
+class FrameCache:
+    """
+    Size-bounded LRU cache of DataFrames with a DatetimeIndex and float64 columns.
+    """
+
+    def __init__(self, directory=None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.entries = self.directory / "entries"
+        self.sources = self.directory / "sources"
+        self.entries.mkdir(parents=True, exist_ok=True)
+        self.sources.mkdir(parents=True, exist_ok=True)
+
+    def source_digest(self, path) -> str:
+        """
+        Content hash of path, recomputed only if its size or mtime changed.
+        """
+        path = Path(path).resolve()
+        stat = path.stat()
+        record_path = self.sources / f"{hashlib.blake2b(str(path).encode(), digest_size=16).hexdigest()}.json"
+        try:
+            record = json.loads(record_path.read_text())
+            if record["size"] == stat.st_size and record["mtime_ns"] == stat.st_mtime_ns:
+                return record["digest"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        digest = file_digest(path)
+        _write_json_atomic(record_path, {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "digest": digest})
+        return digest
+
+    def key(self, path, **params) -> str:
+        """
+        Cache key for the source file plus loader arguments.
+        """
+        payload = json.dumps(
+            {"version": CACHE_VERSION, "digest": self.source_digest(path), "params": params},
+            sort_keys=True,
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        entry = self.entries / key
+        try:
+            meta = json.loads((entry / "meta.json").read_text())
+            values = np.load(entry / "values.npy", mmap_mode="c")
+            times = np.load(entry / "time.npy", mmap_mode="c")
+        except (OSError, ValueError):
+            return None
+
+        # Mark as recently used for LRU eviction
+        os.utime(entry)
+
+        index = pd.DatetimeIndex(times.view("datetime64[ns]"), name=meta["index_name"])
+        if meta["tz"]:
+            index = index.tz_localize("UTC").tz_convert(meta["tz"])
+        # values is stored as (columns, rows), the layout of a pandas float block
+        df = pd.DataFrame(values.T, index=index, columns=meta["columns"], copy=False)
+        df.attrs.update(meta["attrs"])
+        return df
+
+    def put(self, key: str, df: pd.DataFrame):
+        """
+        Stores the numeric columns of df under key. Entries are written to a
+        temporary directory and renamed into place, so concurrent readers
+        never see partial entries.
+        """
+        df = df.select_dtypes(include="number")
+        index = df.index
+        tz = str(index.tz) if index.tz is not None else None
+        if tz:
+            index = index.tz_convert("UTC").tz_localize(None)
+
+        tmp = Path(tempfile.mkdtemp(dir=self.entries, prefix=".tmp-"))
+        try:
+            np.save(tmp / "time.npy", index.as_unit("ns").asi8)
+            np.save(tmp / "values.npy", np.ascontiguousarray(df.to_numpy(dtype=np.float64).T))
+            meta = {
+                "columns": [str(c) for c in df.columns],
+                "index_name": df.index.name,
+                "tz": tz,
+                "attrs": {k: v for k, v in df.attrs.items() if isinstance(v, (str, int, float))},
+            }
+            (tmp / "meta.json").write_text(json.dumps(meta))
+            try:
+                os.replace(tmp, self.entries / key)
+            except OSError:
+                # Another process stored the same entry first
+                shutil.rmtree(tmp, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self.evict()
+
+    def evict(self):
+        """
+        Removes least recently used entries until the cache fits into max_bytes.
+        """
+        entries = []
+        total = 0
+        for entry in self.entries.iterdir():
+            if entry.name.startswith("."):
+                continue
+            try:
+                size = sum(f.stat().st_size for f in entry.iterdir())
+                entries.append((entry.stat().st_mtime, size, entry))
+            except OSError:
+                # Evicted concurrently by another process
+                continue
+            total += size
+
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.entries.mkdir(parents=True, exist_ok=True)
+        self.sources.mkdir(parents=True, exist_ok=True)
+
+    def load(self, path, loader, **params) -> pd.DataFrame:
+        """
+        Returns loader(path, **params) from the cache, computing and storing it on a miss.
+        """
+        key = self.key(path, loader=loader.__name__, **params)
+        df = self.get(key)
+        if df is None:
+            df = loader(path, **params)
+            self.put(key, df)
+        return df
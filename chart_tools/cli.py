@@ -0,0 +1,80 @@
+import argparse
+import logging
+import sys
+
+
+def build_parser(prog: str | None = None) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog=prog, description="Candlestick chart with technical indicators from a JSON or CSV export."
+    )
+    parser.add_argument("datafile", help="JSON or CSV chart export")
+    parser.add_argument("--tf", dest="timeframe", default=None,
+                        help="timeframe to plot from a JSON export (default: first in file), "
+                             "several comma-separated timeframes (e.g. 5m,1h,4h) are drawn aligned")
+    parser.add_argument("--layout", choices=("overlay", "stacked"), default="overlay",
+                        help="multi-timeframe layout: larger timeframes as lines on the base chart "
+                             "or one candle panel per timeframe (default: overlay)")
+    parser.add_argument("--start", default=None,
+                        help="first candle time to load, e.g. 2025-04-23 or 2025-04-23T13:30Z (UTC if no zone)")
+    parser.add_argument("--end", default=None, help="last candle time to load (inclusive)")
+    parser.add_argument("--stream", action="store_true",
+                        help="stream JSON exports of any size with ijson: less memory, but slower to parse "
+                             "(default: only exports of 64 MB or more)")
+    parser.add_argument("-o", "--output", default=None,
+                        help="write the chart to this image file instead of opening a window")
+    parser.add_argument("--no-cache", dest="cache", action="store_false",
+                        help="do not read or write the on-disk cache of parsed exports")
+    parser.add_argument("--cache-dir", default=None,
+                        help="cache directory (default: $CHART_TOOLS_CACHE_DIR or ~/.cache/chart_tools)")
+    parser.add_argument("--no-decimate", dest="decimate", action="store_false",
+                        help="draw every candle instead of reducing them to the figure's resolution")
+    for name in ("sma", "ema", "bbands", "rsi", "macd", "atr"):
+        parser.add_argument(f"--no-{name}", dest=name, action="store_false", help=f"hide {name.upper()}")
+    return parser
+
+
+def main(argv: list[str] | None = None, prog: str | None = None, fmt: str | None = None) -> int:
+    """
+    Loads, normalises and renders one chart export.
+
+    :param fmt: force "json" or "csv" instead of detecting it from the file extension
+    """
+    args = build_parser(prog).parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.output:
+        import matplotlib
+        matplotlib.use("Agg")
+
+    from chart_tools.cache import FrameCache
+    from chart_tools.loaders import load_frame
+    from chart_tools.render import plot_indicators
+
+    plot_kwargs = dict(
+        sma=args.sma, ema=args.ema, bbands=args.bbands,
+        rsi=args.rsi, macd=args.macd, atr=args.atr, decimate=args.decimate,
+    )
+    if args.timeframe and "," in args.timeframe:
+        from chart_tools.multitf import load_timeframes, plot_timeframes
+
+        # All timeframes come from one parse of the export (or one stream per timeframe),
+        # the cache holds single timeframes only
+        frames = load_timeframes(args.datafile, [tf.strip() for tf in args.timeframe.split(",")],
+                                 start=args.start, end=args.end, stream_min_bytes=0 if args.stream else None)
+        fig = plot_timeframes(frames, layout=args.layout, **plot_kwargs)
+    else:
+        cache = FrameCache(args.cache_dir) if args.cache else None
+        df = load_frame(args.datafile, timeframe=args.timeframe, fmt=fmt, cache=cache, start=args.start, end=args.end,
+                        stream_min_bytes=0 if args.stream else None)
+        fig = plot_indicators(df, **plot_kwargs)
+
+    if args.output:
+        fig.savefig(args.output)
+    else:
+        import matplotlib.pyplot as plt
+        plt.show()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
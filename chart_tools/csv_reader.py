@@ -0,0 +1,140 @@
+"""
+Loader for the flat CSV chart format.
+
+Known columns are read with a fixed float64 dtype map instead of being
+inferred, the ISO-8601 "time" column is parsed by the CSV engine (pyarrow
+when installed, otherwise one vectorized pd.to_datetime with an explicit
+format). With a start/end window the file (sorted by time) is searched
+for the first row at or after start by bisecting over byte offsets, then
+read in chunks from there; reading stops at the first chunk past the end.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    ENGINE = "pyarrow"
+except ImportError:  # optional dependency
+    ENGINE = "c"
+
+# Rows per chunk when loading a time window
+CHUNK_ROWS = 16_384
+
+# Bisection stops once the remaining byte range is this small
+SEEK_GRANULARITY = 64 * 1024
+
+# Column dtypes of the CSV export. float64 throughout: normalise() and the
+# renderer work on float64, narrower columns would be converted back (copied).
+DTYPES = {
+    name: np.float64
+    for name in (
+        "open", "high", "low", "close", "volume", "sma", "ema", "rsi",
+        "macd", "signal", "hist", "atr", "bbLower", "bbMiddle", "bbUpper",
+    )
+}
+
+
+def _time_index(values) -> pd.DatetimeIndex:
+    if isinstance(values.dtype, pd.DatetimeTZDtype):
+        index = pd.DatetimeIndex(values).tz_convert("UTC")
+    elif pd.api.types.is_datetime64_dtype(values.dtype):
+        index = pd.DatetimeIndex(values).tz_localize("UTC")
+    else:
+        index = pd.DatetimeIndex(pd.to_datetime(values, utc=True, format="ISO8601"))
+    return index.as_unit("ns").rename("time")
+
+
+def _finish(df: pd.DataFrame) -> pd.DataFrame:
+    index = _time_index(df["time"])
+    df = df.drop(columns="time")
+    df.index = index
+    return df
+
+
+def _to_timestamp(value) -> pd.Timestamp | None:
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def seek_offset(path, start: pd.Timestamp) -> tuple[list[str], int]:
+    """
+    Binary search over the byte offsets of a CSV file sorted by time.
+
+    :return: the header columns and the offset of a line start such that every
+             row before it is older than start
+    """
+    with open(path, "rb") as f:
+        header = f.readline()
+        columns = header.decode().strip().split(",")
+        column = columns.index("time")
+        lo, hi = f.tell(), os.fstat(f.fileno()).st_size
+        # Invariant: lo is a line start and all rows before it are older than start
+        while hi - lo > SEEK_GRANULARITY:
+            mid = (lo + hi) // 2
+            f.seek(mid)
+            f.readline()
+            line_start = f.tell()
+            line = f.readline()
+            if not line.strip():
+                hi = mid
+                continue
+            if _to_timestamp(line.split(b",")[column].decode()) < start:
+                lo = line_start
+            else:
+                hi = mid
+    return columns, lo
+
+
+def load_csv(path, start=None, end=None, chunk_rows: int = CHUNK_ROWS) -> pd.DataFrame:
+    """
+    Loads a flat CSV export with a "time" column, OHLCV and indicator columns.
+
+    :param start: first candle time to keep (inclusive), anything pd.Timestamp accepts;
+                  the file must be sorted by time to seek to it
+    :param end: last candle time to keep (inclusive)
+    :param chunk_rows: rows read at once when a window is given
+    :return: DataFrame indexed by a UTC DatetimeIndex named "time"
+    """
+    start, end = _to_timestamp(start), _to_timestamp(end)
+    if start is None and end is None:
+        return _finish(pd.read_csv(path, engine=ENGINE, dtype=DTYPES))
+
+    if start is not None:
+        columns, offset = seek_offset(path, start)
+    else:
+        columns, offset = None, 0
+
+    parts = []
+    with open(path, "rb") as f:
+        f.seek(offset)
+        header = dict(names=columns, header=None) if offset else {}
+        if end is None:
+            # Nothing to stop at, the rest of the file is read at once
+            df = _finish(pd.read_csv(f, engine=ENGINE, dtype=DTYPES, **header))
+            return df[df.index >= start]
+
+        # The pyarrow engine cannot read in chunks
+        # round_trip parses floats exactly like the pyarrow engine of full loads
+        with pd.read_csv(f, dtype=DTYPES, chunksize=chunk_rows, float_precision="round_trip", **header) as reader:
+            for chunk in reader:
+                chunk = _finish(chunk)
+                if len(chunk) == 0:
+                    continue
+                if end is not None and chunk.index[0] > end:
+                    break
+                mask = np.ones(len(chunk), dtype=bool)
+                if start is not None:
+                    mask &= chunk.index >= start
+                if end is not None:
+                    mask &= chunk.index <= end
+                if mask.any():
+                    parts.append(chunk[mask])
+                if end is not None and chunk.index[-1] > end:
+                    break
+    if not parts:
+        return _finish(pd.read_csv(path, dtype=DTYPES, nrows=0))
+    return pd.concat(parts)
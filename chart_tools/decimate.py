@@ -0,0 +1,120 @@
+"""
+Decimation of large chart ranges before rendering.
+
+A 14 inch figure at 100 dpi has 1400 pixel columns, drawing 500k candles into
+it costs a lot of time and memory without showing more detail. Candles are
+therefore merged into coarser OHLC buckets (first open, max high, min low,
+last close, summed volume) and indicator lines are reduced with
+Largest-Triangle-Three-Buckets, which keeps visible peaks and troughs.
+"""
+import numpy as np
+import pandas as pd
+
+# Minimum horizontal pixels per drawn candle
+PX_PER_CANDLE = 3
+
+# Line points per horizontal pixel
+POINTS_PER_PX = 2
+
+
+def target_candles(width_px: float) -> int:
+    return max(int(width_px // PX_PER_CANDLE), 1)
+
+
+def target_points(width_px: float) -> int:
+    return max(int(width_px * POINTS_PER_PX), 3)
+
+
+def bucket_starts(n: int, n_buckets: int) -> np.ndarray:
+    """
+    Start offsets of n_buckets contiguous, equally sized buckets over n rows.
+    """
+    size = int(np.ceil(n / n_buckets))
+    return np.arange(0, n, size)
+
+
+def resample_ohlc(df: pd.DataFrame, n_buckets: int) -> pd.DataFrame:
+    """
+    Merges consecutive candles into at most n_buckets OHLCV bars, indexed by
+    the time of each bucket's first candle. Returns df unchanged if it is
+    small enough already.
+    """
+    n = len(df)
+    if n <= n_buckets:
+        return df
+
+    starts = bucket_starts(n, n_buckets)
+    ends = np.append(starts[1:], n) - 1
+    data = {
+        "open": df["open"].to_numpy(dtype=float)[starts],
+        "high": np.fmax.reduceat(df["high"].to_numpy(dtype=float), starts),
+        "low": np.fmin.reduceat(df["low"].to_numpy(dtype=float), starts),
+        "close": df["close"].to_numpy(dtype=float)[ends],
+    }
+    if "volume" in df:
+        data["volume"] = np.add.reduceat(np.nan_to_num(df["volume"].to_numpy(dtype=float)), starts)
+    out = pd.DataFrame(data, index=df.index[starts])
+    out.attrs.update(df.attrs)
+    return out
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of n_out points of (x, y) that
+    preserve the visual shape of the line. NaN points are never selected.
+    """
+    valid = np.flatnonzero(~np.isnan(y))
+    if len(valid) <= n_out or n_out < 3:
+        return valid
+
+    xv = x[valid]
+    yv = y[valid]
+    n = len(xv)
+    # First and last point are always kept, the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) as third triangle vertex
+        if i + 2 < len(edges):
+            nxt = slice(edges[i + 1], edges[i + 2])
+            avg_x, avg_y = xv[nxt].mean(), yv[nxt].mean()
+        else:
+            avg_x, avg_y = xv[-1], yv[-1]
+        area = np.abs(
+            (xv[a] - avg_x) * (yv[start:end] - yv[a]) - (xv[a] - xv[start:end]) * (avg_y - yv[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return valid[selected]
+
+
+def minmax_indices(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    Indices of the minimum and maximum of each of n_buckets buckets (in
+    order), for series like histograms where every extreme must stay visible.
+    """
+    n = len(y)
+    valid = ~np.isnan(y)
+    if n <= 2 * n_buckets:
+        return np.flatnonzero(valid)
+
+    starts = bucket_starts(n, n_buckets)
+    size = starts[1] - starts[0]
+    padded = np.full(len(starts) * size, np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(len(starts), size)
+    filled = ~np.isnan(blocks).all(axis=1)
+    lo = np.nanargmin(np.where(filled[:, None], blocks, 0.0), axis=1) + starts
+    hi = np.nanargmax(np.where(filled[:, None], blocks, 0.0), axis=1) + starts
+    idx = np.unique(np.concatenate([lo[filled], hi[filled]]))
+    return idx[valid[idx]]
+
+
+def reduction_ratio(n_in: int, n_out: int) -> float:
+    return n_in / n_out if n_out else 1.0
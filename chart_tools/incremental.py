@@ -0,0 +1,275 @@
+"""
+Incremental (append-only) indicator updates for live candles.
+
+Freqtrade hands the strategy the full candle window on every new candle. The
+classes below keep the running state of each indicator (rolling sums, EMA
+and Wilder state, Bollinger windows) so a new candle costs O(1) per
+indicator. IndicatorCache keeps that state per pair and falls back to a full
+recomputation whenever the dataframe does not continue the cached history.
+
+The values match chart_tools.indicators (and therefore TA-Lib) within
+floating point tolerance.
+"""
+import math
+from collections import deque
+from dataclasses import dataclass, field
+
+import numpy as np
+
+NAN = float("nan")
+
+
+class SMA:
+    __slots__ = ("period", "window", "total")
+
+    def __init__(self, period: int = 20):
+        self.period = period
+        self.window = deque(maxlen=period)
+        self.total = 0.0
+
+    def update(self, value: float) -> float:
+        if len(self.window) == self.period:
+            self.total -= self.window[0]
+        self.window.append(value)
+        self.total += value
+        return self.total / self.period if len(self.window) == self.period else NAN
+
+
+class EMA:
+    """
+    Exponential smoothing seeded with the SMA of the first period values.
+    NaN inputs before the first valid value are skipped, like in indicators.ema.
+    """
+    __slots__ = ("period", "alpha", "count", "total", "value")
+
+    def __init__(self, period: int = 20, alpha: float | None = None):
+        self.period = period
+        self.alpha = 2.0 / (period + 1) if alpha is None else alpha
+        self.count = 0
+        self.total = 0.0
+        self.value = NAN
+
+    def update(self, value: float) -> float:
+        if self.count == 0 and math.isnan(value):
+            return NAN
+        self.count += 1
+        if self.count < self.period:
+            self.total += value
+            return NAN
+        if self.count == self.period:
+            self.value = (self.total + value) / self.period
+        else:
+            self.value = self.alpha * value + (1.0 - self.alpha) * self.value
+        return self.value
+
+
+class Wilder(EMA):
+    __slots__ = ()
+
+    def __init__(self, period: int = 14):
+        super().__init__(period, alpha=1.0 / period)
+
+
+class RSI:
+    __slots__ = ("prev", "gain", "loss")
+
+    def __init__(self, period: int = 14):
+        self.prev = None
+        self.gain = Wilder(period)
+        self.loss = Wilder(period)
+
+    def update(self, close: float) -> float:
+        if self.prev is None:
+            self.prev = close
+            return NAN
+        delta = close - self.prev
+        self.prev = close
+        gain = self.gain.update(max(delta, 0.0))
+        loss = self.loss.update(max(-delta, 0.0))
+        if math.isnan(gain):
+            return NAN
+        total = gain + loss
+        return 0.0 if total == 0 else 100.0 * gain / total
+
+
+class ATR:
+    __slots__ = ("prev_close", "smoothing")
+
+    def __init__(self, period: int = 14):
+        self.prev_close = None
+        self.smoothing = Wilder(period)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        prev_close = self.prev_close
+        self.prev_close = close
+        if prev_close is None:
+            return NAN
+        tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        return self.smoothing.update(tr)
+
+
+class MACD:
+    __slots__ = ("offset", "count", "fast", "slow", "signal")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        # Like TA-Lib, the fast EMA starts together with the slow one
+        self.offset = slow - fast
+        self.count = 0
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+
+    def update(self, close: float) -> tuple[float, float, float]:
+        self.count += 1
+        fast = self.fast.update(close) if self.count > self.offset else NAN
+        line = fast - self.slow.update(close)
+        signal = self.signal.update(line)
+        if math.isnan(signal):
+            return NAN, NAN, NAN
+        return line, signal, line - signal
+
+
+class BBands:
+    """
+    Bollinger Bands (SMA +/- nbdev population standard deviations). Values are
+    shifted by the first close to keep the running sums well conditioned.
+    """
+    __slots__ = ("period", "nbdev", "shift", "window", "total", "total_sq")
+
+    def __init__(self, period: int = 20, nbdev: float = 2.0):
+        self.period = period
+        self.nbdev = nbdev
+        self.shift = None
+        self.window = deque(maxlen=period)
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def update(self, close: float) -> tuple[float, float, float]:
+        if self.shift is None:
+            self.shift = close
+        x = close - self.shift
+        if len(self.window) == self.period:
+            old = self.window[0]
+            self.total -= old
+            self.total_sq -= old * old
+        self.window.append(x)
+        self.total += x
+        self.total_sq += x * x
+        if len(self.window) < self.period:
+            return NAN, NAN, NAN
+        mean = self.total / self.period
+        std = math.sqrt(max(self.total_sq / self.period - mean * mean, 0.0))
+        middle = mean + self.shift
+        return middle - self.nbdev * std, middle, middle + self.nbdev * std
+
+
+def _inputs(indicator):
+    """
+    Input columns of an indicator's update() call.
+    """
+    if isinstance(indicator, ATR):
+        return ("high", "low", "close")
+    return ("close",)
+
+
+@dataclass
+class _PairState:
+    indicators: dict
+    times: list = field(default_factory=list)
+    closes: list = field(default_factory=list)
+    outputs: dict = field(default_factory=dict)
+
+
+class IndicatorCache:
+    """
+    Incrementally maintained indicator columns, keyed by pair.
+
+    :param spec: output column name (or tuple of names for multi-output
+                 indicators) -> factory returning a fresh indicator, e.g.
+                 {"rsi": lambda: RSI(14), ("bb_lower", "bb_mid", "bb_upper"): lambda: BBands(20)}
+    :param max_history: number of candles kept per pair (at least the dataframe length)
+    """
+
+    def __init__(self, spec: dict, max_history: int = 5000):
+        self.spec = spec
+        self.max_history = max_history
+        self.pairs: dict[str, _PairState] = {}
+        self.full_recomputes = 0
+        self.incremental_updates = 0
+
+    def _new_state(self) -> _PairState:
+        state = _PairState(indicators={key: factory() for key, factory in self.spec.items()})
+        for key in self.spec:
+            for name in (key if isinstance(key, tuple) else (key,)):
+                state.outputs[name] = []
+        return state
+
+    @staticmethod
+    def _start(state: _PairState, times: np.ndarray, closes: np.ndarray) -> int | None:
+        """
+        Position of the first candle in the dataframe that is not part of the
+        cached history, or None if the dataframe does not continue it.
+        """
+        if not state.times:
+            return None
+        last = int(np.searchsorted(times, state.times[-1]))
+        if last >= len(times) or times[last] != state.times[-1] or closes[last] != state.closes[-1]:
+            return None
+        first = len(state.times) - 1 - last
+        if first < 0 or state.times[first] != times[0]:
+            return None
+        return last + 1
+
+    def _feed(self, state: _PairState, times: np.ndarray, columns: dict, start: int):
+        # Plain floats are much faster than NumPy scalars in the per-candle loop
+        new = {name: values[start:].tolist() for name, values in columns.items()}
+        for i in range(len(times) - start):
+            for key, indicator in state.indicators.items():
+                value = indicator.update(*(new[name][i] for name in _inputs(indicator)))
+                if isinstance(key, tuple):
+                    for name, v in zip(key, value):
+                        state.outputs[name].append(v)
+                else:
+                    state.outputs[key].append(value)
+        state.times.extend(times[start:].tolist())
+        state.closes.extend(new["close"])
+
+    def _trim(self, state: _PairState, keep: int):
+        excess = len(state.times) - max(self.max_history, keep)
+        # Trim in batches, not on every candle
+        if excess > max(self.max_history, keep) // 4:
+            del state.times[:excess]
+            del state.closes[:excess]
+            for values in state.outputs.values():
+                del values[:excess]
+
+    def update(self, pair: str, dataframe, date_column: str = "date"):
+        """
+        Adds the indicator columns to dataframe, computing only candles that
+        are new since the last call for pair.
+        """
+        n = len(dataframe)
+        times = dataframe[date_column].to_numpy(dtype="datetime64[ns]").view(np.int64)
+        columns = {name: dataframe[name].to_numpy(dtype=float) for name in ("high", "low", "close")}
+
+        state = self.pairs.get(pair)
+        start = self._start(state, times, columns["close"]) if state is not None else None
+        if start is None:
+            state = self._new_state()
+            self.pairs[pair] = state
+            start = 0
+            self.full_recomputes += 1
+        else:
+            self.incremental_updates += 1
+
+        self._feed(state, times, columns, start)
+        self._trim(state, n)
+        for name, values in state.outputs.items():
+            dataframe[name] = np.array(values[-n:], dtype=float) if n else np.array([], dtype=float)
+        return dataframe
+
+    def reset(self, pair: str | None = None):
+        if pair is None:
+            self.pairs.clear()
+        else:
+            self.pairs.pop(pair, None)
@@ -0,0 +1,168 @@
+"""
+Vectorized technical indicators over NumPy arrays.
+
+Pure NumPy (scipy is used for the recursive filters when installed), so
+neither the chart tools nor the freqtrade strategy need a native TA-Lib
+build. Results follow TA-Lib's conventions: same warm-up length (NaN), EMA
+seeded with the SMA of the first period values, Wilder smoothing for RSI/ATR,
+population standard deviation for Bollinger Bands.
+"""
+import numpy as np
+
+try:
+    from scipy.signal import lfilter
+except ImportError:  # optional dependency
+    lfilter = None
+
+
+def _as_float(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _first_valid(x: np.ndarray) -> int:
+    valid = np.flatnonzero(~np.isnan(x))
+    return int(valid[0]) if len(valid) else len(x)
+
+
+def rolling_sum(x, period: int) -> np.ndarray:
+    """
+    Sum over the trailing period values, NaN for the first period - 1 rows.
+    """
+    x = _as_float(x)
+    out = np.full(len(x), np.nan)
+    if len(x) < period:
+        return out
+    csum = np.cumsum(np.insert(x, 0, 0.0))
+    out[period - 1:] = csum[period:] - csum[:-period]
+    return out
+
+
+def recursive_filter(x, alpha: float, seed: float) -> np.ndarray:
+    """
+    y[i] = alpha * x[i] + (1 - alpha) * y[i - 1], with y[-1] = seed.
+    """
+    x = _as_float(x)
+    if lfilter is not None:
+        y, _ = lfilter([alpha], [1.0, alpha - 1.0], x, zi=[(1.0 - alpha) * seed])
+        return y
+
+    y = np.empty(len(x))
+    prev = seed
+    for i, value in enumerate(x.tolist()):
+        prev = alpha * value + (1.0 - alpha) * prev
+        y[i] = prev
+    return y
+
+
+def _smoothed(x: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    """
+    Exponential smoothing seeded with the SMA of the first period valid values.
+    """
+    out = np.full(len(x), np.nan)
+    start = _first_valid(x)
+    seed_end = start + period
+    if len(x) < seed_end:
+        return out
+    seed = x[start:seed_end].mean()
+    out[seed_end - 1] = seed
+    out[seed_end:] = recursive_filter(x[seed_end:], alpha, seed)
+    return out
+
+
+def sma(close, period: int = 20) -> np.ndarray:
+    return rolling_sum(close, period) / period
+
+
+def ema(close, period: int = 20) -> np.ndarray:
+    return _smoothed(_as_float(close), period, 2.0 / (period + 1))
+
+
+def wilder(x, period: int) -> np.ndarray:
+    """
+    Wilder's moving average (RMA), as used by RSI and ATR.
+    """
+    return _smoothed(_as_float(x), period, 1.0 / period)
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    close = _as_float(close)
+    out = np.full(len(close), np.nan)
+    if len(close) <= period:
+        return out
+    delta = np.diff(close)
+    avg_gain = wilder(np.clip(delta, 0.0, None), period)
+    avg_loss = wilder(np.clip(-delta, 0.0, None), period)
+    total = avg_gain + avg_loss
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out[1:] = np.where(total == 0, 0.0, 100.0 * avg_gain / total)
+    return out
+
+
+def true_range(high, low, close) -> np.ndarray:
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    tr = np.full(len(close), np.nan)
+    prev_close = close[:-1]
+    tr[1:] = np.maximum.reduce([high[1:] - low[1:], np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close)])
+    return tr
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    return wilder(true_range(high, low, close), period)
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    :return: tuple of (macd, signal, histogram)
+    """
+    close = _as_float(close)
+    # Like TA-Lib, the fast EMA starts together with the slow one
+    offset = slow - fast
+    fast_ema = np.full(len(close), np.nan)
+    fast_ema[offset:] = ema(close[offset:], fast)
+    line = fast_ema - ema(close, slow)
+    signal_line = ema(line, signal)
+    # All three outputs start once the signal line is defined
+    line[np.isnan(signal_line)] = np.nan
+    return line, signal_line, line - signal_line
+
+
+def bbands(close, period: int = 20, nbdev: float = 2.0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    :return: tuple of (lower, middle, upper)
+    """
+    close = _as_float(close)
+    # Shifted by the first value to keep the running sums well conditioned
+    shifted = close - (close[_first_valid(close)] if len(close) else 0.0)
+    mean = rolling_sum(shifted, period) / period
+    var = rolling_sum(shifted * shifted, period) / period - mean * mean
+    std = np.sqrt(np.clip(var, 0.0, None))
+    middle = sma(close, period)
+    return middle - nbdev * std, middle, middle + nbdev * std
+
+
+def add_indicators(df, overwrite: bool = False, sma_period: int = 20, ema_period: int = 20,
+                   rsi_period: int = 14, atr_period: int = 14, bb_period: int = 20):
+    """
+    Adds the canonical chart columns (SMA, EMA, RSI, MACD*, ATR, BB_*) computed
+    from OHLC data. Columns that already exist are kept unless overwrite is set.
+    """
+    close = df["close"].to_numpy(dtype=np.float64)
+
+    def missing(*columns):
+        return overwrite or not any(c in df.columns for c in columns)
+
+    if missing("SMA"):
+        df["SMA"] = sma(close, sma_period)
+    if missing("EMA"):
+        df["EMA"] = ema(close, ema_period)
+    if missing("RSI"):
+        df["RSI"] = rsi(close, rsi_period)
+    if missing("MACD", "MACD_signal", "MACD_hist"):
+        df["MACD"], df["MACD_signal"], df["MACD_hist"] = macd(close)
+    if {"high", "low"}.issubset(df.columns):
+        if missing("ATR"):
+            df["ATR"] = atr(df["high"].to_numpy(dtype=np.float64), df["low"].to_numpy(dtype=np.float64),
+                            close, atr_period)
+        if missing("BB_lower", "BB_middle", "BB_upper"):
+            df["BB_lower"], df["BB_middle"], df["BB_upper"] = bbands(close, bb_period)
+    return df
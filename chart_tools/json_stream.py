@@ -0,0 +1,358 @@
+"""
+Streaming loader for the multi-timeframe JSON chart format.
+
+Records of the "candles" and "indicators" arrays of one timeframe are written
+straight into growable NumPy columns. Files up to STREAM_MIN_BYTES are parsed
+at once with the standard json module, which is about twice as fast as
+streaming. Larger files are streamed with ijson (with its C backend when
+available) so memory stays bounded: other timeframes are skipped without
+building Python objects for them.
+"""
+import bisect
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import ijson
+except ImportError:  # optional dependency
+    ijson = None
+
+# Number of records converted to columns at once
+CHUNK_SIZE = 16_384
+
+# Files from this size on are streamed with ijson; json.load needs about 4.5x
+# the file size in memory, but parses about twice as fast
+STREAM_MIN_BYTES = 64 * 1024 * 1024
+
+# Columns of a candle frame without any records (e.g. an empty time window)
+CANDLE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+class ColumnBuilder:
+    """
+    Collects records into float64 columns plus an int64 (ns) time column.
+
+    Records are buffered in small chunks which are converted column-wise into
+    preallocated arrays that grow geometrically. Nested objects are flattened
+    to dotted names ("macd.signal"), values that are missing or not numeric
+    end up as NaN. With a start/end window (ns since epoch) records outside it
+    are dropped before conversion and past_end is set once a record after end
+    was seen.
+    """
+
+    def __init__(self, capacity: int = CHUNK_SIZE, start: int | None = None, end: int | None = None):
+        self.capacity = capacity
+        self.start = start
+        self.end = end
+        self.past_end = False
+        self.length = 0
+        self.columns: dict[str, np.ndarray] = {}
+        self.time = np.empty(capacity, dtype=np.int64)
+        self._chunk: list[dict] = []
+
+    def _reserve(self, n: int):
+        if self.length + n <= self.capacity:
+            return
+        while self.length + n > self.capacity:
+            self.capacity *= 2
+        self.time = np.resize(self.time, self.capacity)
+        for name, column in self.columns.items():
+            grown = np.full(self.capacity, np.nan)
+            grown[:self.length] = column[:self.length]
+            self.columns[name] = grown
+
+    def _store(self, name: str, values: list):
+        sample = next((v for v in values if v is not None), None)
+        if sample is None:
+            return
+        if isinstance(sample, dict):
+            keys = set().union(*(v for v in values if isinstance(v, dict)))
+            for key in keys:
+                self._store(f"{name}.{key}", [v.get(key) if isinstance(v, dict) else None for v in values])
+            return
+        try:
+            converted = np.array(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            if isinstance(sample, str):
+                # Non-numeric field (e.g. a label), not plotted
+                return
+            converted = np.array([v if isinstance(v, (int, float)) else np.nan for v in values], dtype=np.float64)
+
+        column = self.columns.get(name)
+        if column is None:
+            column = np.full(self.capacity, np.nan)
+            self.columns[name] = column
+        column[self.length:self.length + len(values)] = converted
+
+    def _flush(self, times: np.ndarray | None = None):
+        chunk = self._chunk
+        self._chunk = []
+        if not chunk:
+            return
+        if times is None:
+            times = _parse_times(chunk).as_unit("ns").asi8
+        if self.start is not None or self.end is not None:
+            keep = np.ones(len(times), dtype=bool)
+            if self.start is not None:
+                keep &= times >= self.start
+            if self.end is not None:
+                keep &= times <= self.end
+                self.past_end = self.past_end or bool(times[-1] > self.end)
+            if not keep.all():
+                chunk = [record for record, k in zip(chunk, keep) if k]
+                times = times[keep]
+            if not chunk:
+                return
+        self._reserve(len(chunk))
+        keys = set().union(*chunk)
+        keys.discard("time")
+        for key in keys:
+            self._store(key, [record.get(key) for record in chunk])
+        self.time[self.length:self.length + len(chunk)] = times
+        self.length += len(chunk)
+
+    def append(self, record: dict):
+        self._chunk.append(record)
+        if len(self._chunk) >= CHUNK_SIZE:
+            self._flush()
+
+    def extend(self, records: list, times: np.ndarray | None = None):
+        """
+        Converts a list of records at once, with their times (ns) if already known.
+        """
+        self._flush()
+        self._chunk = records
+        self._flush(times)
+
+    def to_columns(self) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        """
+        :return: the int64 (ns) time column and the float64 columns by name
+        """
+        self._flush()
+        n = self.length
+        return self.time[:n], {name: column[:n] for name, column in self.columns.items()}
+
+
+def _parse_times(records) -> pd.DatetimeIndex:
+    return pd.to_datetime([record["time"] for record in records], utc=True, format="ISO8601")
+
+
+def _to_ns(value) -> int | None:
+    """
+    Nanoseconds since epoch of a window bound, naive times are taken as UTC.
+    """
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return ts.as_unit("ns").value
+
+
+def _record_ns(record: dict) -> int:
+    return pd.Timestamp(record["time"]).as_unit("ns").value
+
+
+def _window(records: list, start: int | None, end: int | None) -> list:
+    """
+    Slice of records (sorted by time) between start and end, found by binary
+    search so only O(log n) timestamps are parsed.
+    """
+    lo = bisect.bisect_left(records, start, key=_record_ns) if start is not None else 0
+    hi = bisect.bisect_right(records, end, lo=lo, key=_record_ns) if end is not None else len(records)
+    return records[lo:hi]
+
+
+def _first_key(path) -> str | None:
+    with open(path, "rb") as f:
+        for prefix, event, value in ijson.parse(f):
+            if prefix == "" and event == "map_key":
+                return value
+    return None
+
+
+def list_timeframes(path) -> list[str]:
+    """
+    Returns the timeframes (top-level keys) of a JSON chart export.
+    """
+    if ijson is None:
+        with open(path, "r") as f:
+            return list(json.load(f).keys())
+
+    timeframes = []
+    with open(path, "rb") as f:
+        for prefix, event, value in ijson.parse(f):
+            if prefix == "" and event == "map_key":
+                timeframes.append(value)
+    return timeframes
+
+
+def _stream_section(path, timeframe: str, section: str):
+    with open(path, "rb") as f:
+        yield from ijson.items(f, f"{timeframe}.{section}.item", use_float=True)
+
+
+def _build(records, start: int | None = None, end: int | None = None) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """
+    Columns of streamed records, stopping at the first chunk past end. Closing
+    a streaming generator early also stops reading the file.
+    """
+    builder = ColumnBuilder(start=start, end=end)
+    for record in records:
+        builder.append(record)
+        if builder.past_end:
+            break
+    if hasattr(records, "close"):
+        records.close()
+    return builder.to_columns()
+
+
+def _build_section(candle_records: list, indicator_records: list) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """
+    Aligned columns of one timeframe's parsed candles and indicators, each
+    converted in one pass. The indicator times are only parsed if they differ
+    from the candle times.
+    """
+    builder = ColumnBuilder(capacity=max(len(candle_records), 1))
+    builder.extend(candle_records)
+    time, candles = builder.to_columns()
+    same_times = len(indicator_records) == len(candle_records) and all(
+        indicator["time"] == candle["time"] for indicator, candle in zip(indicator_records, candle_records))
+    builder = ColumnBuilder(capacity=max(len(indicator_records), 1))
+    builder.extend(indicator_records, time if same_times else None)
+    return time, _align(time, candles, *builder.to_columns())
+
+
+def _align(time: np.ndarray, candles: dict, indicator_time: np.ndarray, indicators: dict) -> dict:
+    """
+    Left-joins indicator columns onto the candle times, looking the times up
+    with searchsorted. The lookup is skipped when both arrays already share
+    the same timestamps (the usual case).
+    """
+    columns = dict(candles)
+    if not indicators:
+        return columns
+    if np.array_equal(time, indicator_time):
+        aligned = indicators
+    else:
+        positions = np.minimum(np.searchsorted(indicator_time, time), len(indicator_time) - 1)
+        found = indicator_time[positions] == time
+        aligned = {}
+        for name, values in indicators.items():
+            column = np.full(len(time), np.nan)
+            column[found] = values[positions[found]]
+            aligned[name] = column
+    for name, column in aligned.items():
+        columns.setdefault(name, column)
+    return columns
+
+
+def _frame(time: np.ndarray, columns: dict, timeframe: str | None) -> pd.DataFrame:
+    """
+    DataFrame of aligned columns on a UTC DatetimeIndex, with the candle
+    columns present (empty) even if no record was loaded.
+    """
+    if not len(time):
+        for column in CANDLE_COLUMNS:
+            columns.setdefault(column, np.empty(0, dtype=np.float64))
+    index = pd.DatetimeIndex(time.view("datetime64[ns]"), name="time").tz_localize("UTC")
+    df = pd.DataFrame(columns, index=index)
+    df.attrs["timeframe"] = timeframe
+    return df
+
+
+def load_json(path, timeframe: str | None = None, start=None, end=None,
+              stream_min_bytes: int | None = None) -> pd.DataFrame:
+    """
+    Loads candles and indicators of one timeframe from a JSON chart export,
+    streaming files of stream_min_bytes or more.
+
+    Records before start are skipped without being converted, streaming stops
+    at the first chunk past end (records are expected in time order).
+
+    :param path: JSON file with {"<tf>": {"candles": [...], "indicators": [...]}}
+    :param timeframe: timeframe to load, defaults to the first one in the file
+    :param start: first candle time to keep (inclusive), anything pd.Timestamp accepts
+    :param end: last candle time to keep (inclusive)
+    :param stream_min_bytes: files from this size on are streamed with ijson
+                             (default STREAM_MIN_BYTES, 0 always streams)
+    :return: DataFrame indexed by time with float64 columns, nested indicator
+             objects flattened to dotted names (e.g. "bbands.lower")
+    """
+    start_ns, end_ns = _to_ns(start), _to_ns(end)
+    if stream_min_bytes is None:
+        stream_min_bytes = STREAM_MIN_BYTES
+    if ijson is None or os.path.getsize(path) < stream_min_bytes:
+        with open(path, "r") as f:
+            data = json.load(f)
+        timeframe = timeframe or next(iter(data), None)
+        if timeframe not in data:
+            raise KeyError(f"Timeframe {timeframe} not in {path}, available: {list(data.keys())}")
+        section = data[timeframe]
+        time, columns = _build_section(_window(section.get("candles", []), start_ns, end_ns),
+                                       _window(section.get("indicators", []), start_ns, end_ns))
+        return _frame(time, columns, timeframe)
+
+    return _stream_timeframe(path, timeframe or _first_key(path), start_ns, end_ns)
+
+
+def _stream_timeframe(path, timeframe: str, start_ns: int | None, end_ns: int | None) -> pd.DataFrame:
+    """
+    Streams the candles and indicators of one timeframe into aligned columns,
+    one pass over the file per section.
+    """
+    time, candles = _build(_stream_section(path, timeframe, "candles"), start_ns, end_ns)
+    if not len(time):
+        # Only now pay for listing the timeframes of the file
+        available = list_timeframes(path)
+        if timeframe not in available:
+            raise KeyError(f"Timeframe {timeframe} not in {path}, available: {available}")
+    indicators = _build(_stream_section(path, timeframe, "indicators"), start_ns, end_ns)
+    return _frame(time, _align(time, candles, *indicators), timeframe)
+
+
+def load_json_timeframes(path, timeframes: list[str] | None = None, start=None, end=None,
+                         stream_min_bytes: int | None = None) -> dict[str, pd.DataFrame]:
+    """
+    Loads several timeframes of a JSON chart export.
+
+    Files below stream_min_bytes are parsed once with json.load, cheaper than
+    one streaming pass per section when most of the file is needed anyway.
+    Each section is converted straight to NumPy columns and aligned on the
+    time arrays, so one DataFrame is built per timeframe. Larger files are
+    streamed timeframe by timeframe like in load_json, so memory stays bounded
+    by the selected timeframes' columns.
+
+    :param timeframes: timeframes to load, defaults to all of them
+    :param start: first candle time to keep (inclusive), see load_json
+    :param end: last candle time to keep (inclusive)
+    :param stream_min_bytes: files from this size on are streamed, see load_json
+    :return: dict of timeframe -> DataFrame as returned by load_json, in file order
+    """
+    start_ns, end_ns = _to_ns(start), _to_ns(end)
+    if stream_min_bytes is None:
+        stream_min_bytes = STREAM_MIN_BYTES
+    if ijson is not None and os.path.getsize(path) >= stream_min_bytes:
+        available = list_timeframes(path)
+        missing = [tf for tf in timeframes or [] if tf not in available]
+        if missing:
+            raise KeyError(f"Timeframes {missing} not in {path}, available: {available}")
+        return {timeframe: _stream_timeframe(path, timeframe, start_ns, end_ns) for timeframe in available
+                if timeframes is None or timeframe in timeframes}
+
+    with open(path, "r") as f:
+        data = json.load(f)
+    missing = [tf for tf in timeframes or [] if tf not in data]
+    if missing:
+        raise KeyError(f"Timeframes {missing} not in {path}, available: {list(data.keys())}")
+
+    frames = {}
+    for timeframe, section in data.items():
+        if timeframes is not None and timeframe not in timeframes:
+            continue
+        time, columns = _build_section(_window(section.get("candles", []), start_ns, end_ns),
+                                       _window(section.get("indicators", []), start_ns, end_ns))
+        frames[timeframe] = _frame(time, columns, timeframe)
+    return frames
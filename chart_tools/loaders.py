@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import pandas as pd
+
+from chart_tools.csv_reader import load_csv
+from chart_tools.indicators import add_indicators
+from chart_tools.json_stream import list_timeframes, load_json
+from chart_tools.schema import normalise
+
+
+def load(path, timeframe: str | None = None, fmt: str | None = None, start=None, end=None,
+         stream_min_bytes: int | None = None) -> pd.DataFrame:
+    """
+    Loads a chart export, picking the loader by file extension.
+
+    :param timeframe: timeframe of a JSON export, ignored for CSV
+    :param fmt: "json" or "csv" to override the file extension
+    :param start: first candle time to load (inclusive), pushed down into the loader
+    :param end: last candle time to load (inclusive)
+    :param stream_min_bytes: JSON exports from this size on are streamed, see load_json
+    """
+    fmt = fmt or Path(path).suffix.lower().lstrip(".")
+    if fmt == "json":
+        return load_json(path, timeframe=timeframe, start=start, end=end, stream_min_bytes=stream_min_bytes)
+    if fmt == "csv":
+        return load_csv(path, start=start, end=end)
+    raise ValueError(f"Unsupported file type: {path}")
+
+
+def load_normalised(path, timeframe: str | None = None, fmt: str | None = None, start=None,
+                    end=None, stream_min_bytes: int | None = None) -> pd.DataFrame:
+    """
+    Loads and normalises a chart export. Indicators missing from the export
+    are computed from its OHLC columns.
+    """
+    return add_indicators(normalise(load(path, timeframe=timeframe, fmt=fmt, start=start, end=end,
+                                         stream_min_bytes=stream_min_bytes)))
+
+
+def load_frame(path, timeframe: str | None = None, fmt: str | None = None, cache=None, start=None,
+               end=None, stream_min_bytes: int | None = None) -> pd.DataFrame:
+    """
+    Loads and normalises a chart export.
+
+    :param cache: optional chart_tools.cache.FrameCache, the normalised frame is
+                  then read from / stored in the on-disk cache. Not used for a
+                  start/end window, whose cost already scales with the window
+                  while keying the cache would hash the whole file.
+    """
+    if cache is None or start is not None or end is not None:
+        return load_normalised(path, timeframe=timeframe, fmt=fmt, start=start, end=end,
+                               stream_min_bytes=stream_min_bytes)
+    return cache.load(path, load_normalised, timeframe=timeframe, fmt=fmt, stream_min_bytes=stream_min_bytes)
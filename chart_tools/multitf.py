@@ -0,0 +1,168 @@
+"""
+Multi-timeframe charts from one JSON export.
+
+All timeframes are parsed in a single pass. Higher-timeframe columns are
+forward-filled onto the base (smallest) timeframe's index by candle close
+time, so a 1h value only shows up once its hour has closed, exactly as it
+was known at that point. The charts are drawn either stacked (one candle
+panel per timeframe) or overlaid (higher-timeframe lines on the base chart),
+always with a shared time axis.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from chart_tools.candles import draw_candles
+from chart_tools.decimate import resample_ohlc, target_candles, target_points
+from chart_tools.indicators import add_indicators
+from chart_tools.json_stream import load_json_timeframes
+from chart_tools.render import plot_indicators, plot_line
+from chart_tools.schema import normalise
+
+# Lines drawn per timeframe in the stacked and overlay layouts
+OVERLAY_COLUMNS = ("SMA", "EMA")
+LAYOUTS = ("overlay", "stacked")
+
+_UNITS = {"s": "s", "m": "min", "h": "h", "d": "D", "w": "W"}
+
+
+def timeframe_to_timedelta(timeframe: str) -> pd.Timedelta:
+    """
+    Length of a timeframe like "5m", "1h" or "1d".
+    """
+    match = re.fullmatch(r"(\d+)([smhdw])", timeframe)
+    if match is None:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return pd.Timedelta(int(match.group(1)), _UNITS[match.group(2)])
+
+
+def load_timeframes(path, timeframes: list[str] | None = None, start=None, end=None,
+                    stream_min_bytes: int | None = None) -> dict[str, pd.DataFrame]:
+    """
+    Loads and normalises several timeframes of a JSON export (parsed once,
+    or streamed per timeframe from stream_min_bytes on).
+
+    :param start: first candle time to keep (inclusive)
+    :param end: last candle time to keep (inclusive)
+    :return: dict of timeframe -> normalised frame, from the smallest to the largest timeframe
+    """
+    frames = load_json_timeframes(path, timeframes, start=start, end=end, stream_min_bytes=stream_min_bytes)
+    ordered = sorted(frames, key=timeframe_to_timedelta)
+    return {tf: add_indicators(normalise(frames[tf])) for tf in ordered}
+
+
+def align_to(base: pd.DataFrame, other: pd.DataFrame, base_tf: str, other_tf: str,
+             columns=None) -> pd.DataFrame:
+    """
+    Forward-fills columns of other onto the index of base: each base candle
+    gets the values of the last other candle that closed no later than it.
+
+    :return: DataFrame on base.index with columns named "<column>@<other_tf>"
+    """
+    columns = [c for c in (columns or other.columns) if c in other.columns]
+    base_close = (base.index + timeframe_to_timedelta(base_tf)).asi8
+    other_close = (other.index + timeframe_to_timedelta(other_tf)).asi8
+    pos = np.searchsorted(other_close, base_close, side="right") - 1
+    known = pos >= 0
+    take = np.where(known, pos, 0)
+
+    aligned = {}
+    for column in columns:
+        values = other[column].to_numpy(dtype=float)
+        aligned[f"{column}@{other_tf}"] = np.where(known, values[take], np.nan) if len(values) else np.nan
+    return pd.DataFrame(aligned, index=base.index)
+
+
+def align_timeframes(frames: dict[str, pd.DataFrame], base: str | None = None, columns=None) -> pd.DataFrame:
+    """
+    Base timeframe frame with the columns of all larger timeframes forward-filled onto it.
+
+    :param base: base timeframe, defaults to the smallest one
+    """
+    base = base or min(frames, key=timeframe_to_timedelta)
+    base_df = frames[base]
+    parts = [base_df]
+    for tf, df in frames.items():
+        if timeframe_to_timedelta(tf) > timeframe_to_timedelta(base):
+            parts.append(align_to(base_df, df, base, tf, columns))
+    aligned = pd.concat(parts, axis=1)
+    aligned.attrs.update(base_df.attrs)
+    return aligned
+
+
+def _higher(frames: dict, base: str) -> list[str]:
+    return [tf for tf in frames if timeframe_to_timedelta(tf) > timeframe_to_timedelta(base)]
+
+
+def plot_overlay(frames: dict[str, pd.DataFrame], base: str | None = None, decimate: bool = True, **plot_kwargs):
+    """
+    Base timeframe chart (see render.plot_indicators) with the SMA/EMA and RSI of
+    the larger timeframes overlaid as forward-filled lines.
+    """
+    base = base or min(frames, key=timeframe_to_timedelta)
+    higher = _higher(frames, base)
+    df = align_timeframes(frames, base, columns=OVERLAY_COLUMNS + ("RSI",))
+    title = f"Candlestick + Overlays ({base}, {', '.join(higher)})" if higher else None
+    fig = plot_indicators(df, title=title, decimate=decimate, **plot_kwargs)
+
+    axes = fig.axes
+    for ax in axes[1:]:
+        ax.sharex(axes[0])
+    max_points = target_points(fig.get_figwidth() * fig.dpi) if decimate else None
+    for tf in higher:
+        for column in OVERLAY_COLUMNS:
+            if f"{column}@{tf}" in df and plot_kwargs.get(column.lower(), True):
+                plot_line(axes[0], df, f"{column}@{tf}", max_points, label=f"{column} {tf}",
+                          linestyle=":", drawstyle="steps-post")
+        rsi_axes = [ax for ax in axes[1:] if ax.get_title() == "RSI"]
+        if rsi_axes and f"RSI@{tf}" in df:
+            plot_line(rsi_axes[0], df, f"RSI@{tf}", max_points, label=f"RSI {tf}", drawstyle="steps-post")
+            rsi_axes[0].legend()
+    axes[0].legend()
+    return fig
+
+
+def plot_stacked(frames: dict[str, pd.DataFrame], decimate: bool = True, sma: bool = True, ema: bool = True,
+                 **plot_kwargs):
+    """
+    One candle panel (with SMA/EMA) per timeframe, stacked from the smallest
+    timeframe down, sharing the time axis. Other plot_indicators options
+    (panels, bands) are ignored.
+    """
+    import matplotlib.pyplot as plt
+
+    timeframes = sorted(frames, key=timeframe_to_timedelta)
+    fig, axes = plt.subplots(len(timeframes), 1, sharex=True, figsize=(14, 1 + 3 * len(timeframes)), squeeze=False)
+    width_px = fig.get_figwidth() * fig.dpi
+    for ax, tf in zip(axes[:, 0], timeframes):
+        df = frames[tf]
+        candles = resample_ohlc(df, target_candles(width_px)) if decimate else df
+        max_points = target_points(width_px) if decimate else None
+        draw_candles(ax, candles)
+        if sma and "SMA" in df:
+            plot_line(ax, df, "SMA", max_points, label="SMA", color="blue")
+        if ema and "EMA" in df:
+            plot_line(ax, df, "EMA", max_points, label="EMA", color="orange")
+        ax.set_title(f"Candlestick ({tf})")
+        ax.set_ylabel("Price")
+        if ax.get_legend_handles_labels()[0]:
+            ax.legend(loc="upper left")
+        ax.grid(True)
+    fig.tight_layout()
+    return fig
+
+
+def plot_timeframes(frames: dict[str, pd.DataFrame], layout: str = "overlay", **kwargs):
+    """
+    Draws several timeframes with a shared time axis.
+
+    :param layout: "overlay" (larger timeframes as lines on the base chart) or
+                   "stacked" (one candle panel per timeframe)
+    :return: the matplotlib Figure
+    """
+    if layout == "overlay":
+        return plot_overlay(frames, **kwargs)
+    if layout == "stacked":
+        return plot_stacked(frames, **kwargs)
+    raise ValueError(f"Unknown layout {layout}, expected one of {LAYOUTS}")
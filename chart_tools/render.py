@@ -0,0 +1,159 @@
+import logging
+
+from chart_tools.candles import date_index_to_num, draw_bars, draw_candles
+from chart_tools.decimate import (
+    lttb_indices, minmax_indices, reduction_ratio, resample_ohlc, target_candles, target_points,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def panels_for(df, rsi: bool = True, macd: bool = True, atr: bool = True) -> list[str]:
+    """
+    Returns the extra subplots (below the candle chart) that can be drawn for df.
+    """
+    extras = []
+    if rsi and "RSI" in df.columns:
+        extras.append("RSI")
+    if macd and "MACD" in df.columns:
+        extras.append("MACD")
+    if atr and "ATR" in df.columns:
+        extras.append("ATR")
+    return extras
+
+
+def plot_line(ax, df, column: str, max_points: int | None = None, **kwargs):
+    """
+    Plots df[column] over the time index, reduced to max_points with LTTB.
+    """
+    y = df[column].to_numpy(dtype=float)
+    if max_points is not None and len(y) > max_points:
+        idx = lttb_indices(date_index_to_num(df.index), y, max_points)
+        return ax.plot(df.index[idx], y[idx], **kwargs)
+    return ax.plot(df.index, y, **kwargs)
+
+
+def create_figure(extras: list[str]):
+    """
+    Creates the figure and axes for a candle chart with the given extra subplots.
+
+    :return: tuple of (Figure, list of Axes)
+    """
+    # Imported lazily so callers can select a backend first
+    import matplotlib.pyplot as plt
+
+    n_plots = 1 + len(extras)
+    # Dynamic height: base 4 + 2 per additional chart
+    fig, axes = plt.subplots(
+        n_plots,
+        1,
+        figsize=(14, 4 + 2 * len(extras)),
+        gridspec_kw={"height_ratios": [3] + [1] * len(extras)},
+    )
+    # If only 1 plot is returned, wrap in list
+    if n_plots == 1:
+        axes = [axes]
+    return fig, list(axes)
+
+
+def plot_indicators(
+    df,
+    sma: bool = True,
+    ema: bool = True,
+    bbands: bool = True,
+    rsi: bool = True,
+    macd: bool = True,
+    atr: bool = True,
+    title: str | None = None,
+    axes=None,
+    decimate: bool = True,
+):
+    """
+    Draws:
+      - Candlestick
+      - overlaid SMA/EMA/BBands in the first chart, if available and desired
+      - Separate subplot for RSI, MACD, ATR, if available and desired
+
+    Expects a frame produced by chart_tools.normalise(). Does not show the
+    figure, the caller decides whether to show or save it.
+
+    :param axes: axes from create_figure() to reuse, they are cleared first.
+                 Must match the subplots selected for df.
+    :param decimate: merge candles and thin out indicator lines to what the
+                     figure width at its dpi can show
+    :return: the matplotlib Figure
+    """
+    # Which extra subplots should be created?
+    extras = panels_for(df, rsi=rsi, macd=macd, atr=atr)
+
+    if axes is None:
+        fig, axes = create_figure(extras)
+    else:
+        if len(axes) != 1 + len(extras):
+            raise ValueError(f"Expected {1 + len(extras)} axes for {extras}, got {len(axes)}")
+        fig = axes[0].figure
+        for ax in axes:
+            ax.cla()
+
+    # Decimation targets from the figure's pixel width
+    candles = df
+    max_points = None
+    if decimate:
+        width_px = fig.get_figwidth() * fig.dpi
+        candles = resample_ohlc(df, target_candles(width_px))
+        max_points = target_points(width_px)
+        if len(candles) < len(df):
+            logger.info(
+                f"Decimated {len(df)} candles to {len(candles)} "
+                f"(ratio {reduction_ratio(len(df), len(candles)):.1f}x), lines to {max_points} points"
+            )
+
+    # --- Plot 1: Candles + SMA/EMA/BBands ---
+    ax0 = axes[0]
+    draw_candles(ax0, candles)
+
+    # Overlay
+    if sma and "SMA" in df:
+        plot_line(ax0, df, "SMA", max_points, label="SMA", color="blue")
+    if ema and "EMA" in df:
+        plot_line(ax0, df, "EMA", max_points, label="EMA", color="orange")
+    if bbands and "BB_lower" in df:
+        plot_line(ax0, df, "BB_lower", max_points, label="BB Lower", linestyle="--")
+        plot_line(ax0, df, "BB_middle", max_points, label="BB Middle", linestyle="--")
+        plot_line(ax0, df, "BB_upper", max_points, label="BB Upper", linestyle="--")
+    if title is None:
+        timeframe = df.attrs.get("timeframe")
+        title = f"Candlestick + Overlays ({timeframe})" if timeframe else "Candlestick + Overlays"
+    ax0.set_title(title)
+    ax0.set_ylabel("Price")
+    ax0.legend()
+    ax0.grid(True)
+
+    # --- Further subplots in the order extras ---
+    for i, name in enumerate(extras, start=1):
+        ax = axes[i]
+        if name == "RSI":
+            plot_line(ax, df, "RSI", max_points, label="RSI")
+            ax.axhline(70, linestyle="--")
+            ax.axhline(30, linestyle="--")
+            ax.set_ylabel("RSI")
+        elif name == "MACD":
+            plot_line(ax, df, "MACD", max_points, label="MACD")
+            plot_line(ax, df, "MACD_signal", max_points, label="Signal")
+            hist = df["MACD_hist"].to_numpy(dtype=float)
+            if decimate and len(hist) > len(candles):
+                # Keep every bucket's extremes of the histogram
+                idx = minmax_indices(hist, len(candles))
+                draw_bars(ax, df.index[idx], hist[idx], alpha=0.5)
+            else:
+                draw_bars(ax, df.index, hist, alpha=0.5)
+            ax.set_ylabel("MACD")
+        elif name == "ATR":
+            plot_line(ax, df, "ATR", max_points, label="ATR")
+            ax.set_ylabel("ATR")
+        ax.set_title(name)
+        ax.legend()
+        ax.grid(True)
+
+    fig.tight_layout()
+    return fig
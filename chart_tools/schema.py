@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+# Canonical column -> accepted source names, first match wins.
+# Dotted names come from nested JSON objects (see json_stream), the others
+# are the flat CSV export names.
+SCHEMA = {
+    "SMA": ("sma",),
+    "EMA": ("ema",),
+    "RSI": ("rsi",),
+    "MACD": ("macd.macd", "macd"),
+    "MACD_signal": ("macd.signal", "signal"),
+    "MACD_hist": ("macd.hist", "hist"),
+    "ATR": ("atr",),
+    "BB_lower": ("bbands.lower", "bbLower"),
+    "BB_middle": ("bbands.middle", "bbMiddle"),
+    "BB_upper": ("bbands.upper", "bbUpper"),
+}
+
+# Columns that are drawn together: if one is present, all of them exist
+GROUPS = (
+    ("MACD", "MACD_signal", "MACD_hist"),
+    ("BB_lower", "BB_middle", "BB_upper"),
+)
+
+OHLCV = ("open", "high", "low", "close", "volume")
+
+
+def flatten_objects(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Expands object columns holding dicts (e.g. {"macd": ..., "signal": ...})
+    into float64 columns named "<column>.<key>". Rows without an object get NaN.
+    """
+    for name in [c for c in df.columns if df[c].dtype == object]:
+        values = df[name].to_numpy()
+        is_dict = np.fromiter((isinstance(v, dict) for v in values), dtype=bool, count=len(values))
+        if not is_dict.any():
+            continue
+        flat = pd.json_normalize([v if d else {} for v, d in zip(values, is_dict)])
+        flat = flat.apply(pd.to_numeric, errors="coerce").astype(np.float64)
+        flat.columns = [f"{name}.{key}" for key in flat.columns]
+        flat.index = df.index
+        df = pd.concat([df.drop(columns=[name]), flat], axis=1)
+    return df
+
+
+def normalise(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Maps raw export columns onto the canonical schema used by the renderer
+    (SMA, EMA, RSI, MACD, MACD_signal, MACD_hist, ATR, BB_lower, BB_middle,
+    BB_upper) as float64 columns.
+
+    JSON exports (nested macd/bbands objects, flattened by the loader or still
+    held as dicts) and flat CSV exports (macd/signal/hist, bbLower/...) go
+    through the same path. Columns are renamed, not copied.
+    """
+    df = flatten_objects(df)
+
+    rename = {}
+    for canonical, sources in SCHEMA.items():
+        if canonical in df.columns:
+            continue
+        source = next((s for s in sources if s in df.columns and s not in rename), None)
+        if source is not None:
+            rename[source] = canonical
+    df = df.rename(columns=rename)
+
+    for group in GROUPS:
+        if any(c in df.columns for c in group):
+            for column in group:
+                if column not in df.columns:
+                    df[column] = np.nan
+
+    for column in (*OHLCV, *SCHEMA):
+        if column in df.columns and df[column].dtype != np.float64:
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype(np.float64)
+
+    return df
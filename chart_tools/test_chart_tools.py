@@ -0,0 +1,471 @@
+import json
+import subprocess
+import sys
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import pandas as pd
+import pytest
+
+import chart_tools
+
+
+def _candle(time, price):
+    return {"time": time, "open": price, "high": price + 2, "low": price - 2, "close": price + 1, "volume": 10.0}
+
+
+def _indicator(time, value):
+    return {
+        "time": time,
+        "sma": value,
+        "ema": value,
+        "rsi": 50.0,
+        "macd": {"macd": 1.0, "signal": 0.5, "hist": 0.5},
+        "atr": 2.0,
+        "bbands": {"lower": value - 5, "middle": value, "upper": value + 5},
+    }
+
+
+@pytest.fixture
+def json_export(tmp_path):
+    times = ["2025-04-23T13:30:00.000Z", "2025-04-23T13:35:00.000Z", "2025-04-23T13:40:00.000Z"]
+    data = {
+        "5m": {
+            "candles": [_candle(t, 100.0 + i) for i, t in enumerate(times)],
+            "indicators": [_indicator(t, 100.0 + i) for i, t in enumerate(times)],
+        },
+        "1h": {
+            "candles": [_candle(times[0], 200.0)],
+            "indicators": [_indicator(times[0], 200.0)],
+        },
+    }
+    path = tmp_path / "export.json"
+    path.write_text(json.dumps(data))
+    return path
+
+
+@pytest.fixture
+def csv_export(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_text(
+        "time,open,high,low,close,volume,sma,ema,rsi,macd,signal,hist,atr,bbLower,bbMiddle,bbUpper\n"
+        "2025-04-23T13:30:00.000Z,100,102,98,101,10,100,100,50,1,0.5,0.5,2,95,100,105\n"
+        "2025-04-23T13:35:00.000Z,101,103,99,102,10,101,101,50,1,0.5,0.5,2,96,101,106\n"
+    )
+    return path
+
+
+def test_import_is_side_effect_free():
+    code = "import sys, chart_tools; from chart_tools import chart_plotter; " \
+           "print('pandas' in sys.modules, 'matplotlib.pyplot' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False False"
+
+
+def test_load_json_first_timeframe(json_export):
+    df = chart_tools.load_json(json_export)
+    assert df.attrs["timeframe"] == "5m"
+    assert len(df) == 3
+
+
+def test_load_json_selected_timeframe(json_export):
+    df = chart_tools.load_json(json_export, timeframe="1h")
+    assert len(df) == 1
+    assert df["open"].iloc[0] == 200.0
+
+
+def test_load_json_unknown_timeframe(json_export):
+    with pytest.raises(KeyError):
+        chart_tools.load_json(json_export, timeframe="1d")
+
+
+def test_normalise_json_and_csv_share_columns(json_export, csv_export):
+    from_json = chart_tools.normalise(chart_tools.load(json_export))
+    from_csv = chart_tools.normalise(chart_tools.load(csv_export))
+    columns = ["SMA", "EMA", "RSI", "MACD", "MACD_signal", "MACD_hist", "ATR", "BB_lower", "BB_middle", "BB_upper"]
+    for column in columns:
+        assert column in from_json
+        assert column in from_csv
+    assert from_json["MACD_signal"].iloc[0] == 0.5
+    assert from_csv["BB_upper"].iloc[1] == 106
+
+
+def test_plot_indicators_returns_figure(json_export):
+    df = chart_tools.normalise(chart_tools.load(json_export))
+    fig = chart_tools.plot_indicators(df, atr=False)
+    # candles + RSI + MACD
+    assert len(fig.axes) == 3
+    assert fig.axes[0].get_title() == "Candlestick + Overlays (5m)"
+
+
+def test_cli_writes_image(json_export, tmp_path):
+    from chart_tools.cli import main
+    output = tmp_path / "chart.png"
+    assert main([str(json_export), "-o", str(output)]) == 0
+    assert output.stat().st_size > 0
+
+
+def test_render_batch_all_timeframes(json_export, csv_export, tmp_path):
+    from chart_tools.batch import render_batch
+    report = render_batch([json_export.parent], tmp_path / "charts", workers=1, all_timeframes=True)
+    assert report.failed == 0
+    assert sorted(p.name for p in report.outputs) == ["export.png", "export_1h.png", "export_5m.png"]
+    assert report.charts_per_second > 0
+    assert len(report.peak_memory_mb) == 1
+
+
+def test_plot_indicators_reuses_axes(json_export):
+    from chart_tools.render import create_figure, panels_for
+    df = chart_tools.normalise(chart_tools.load(json_export))
+    fig, axes = create_figure(panels_for(df))
+    assert chart_tools.plot_indicators(df, axes=axes) is fig
+    assert chart_tools.plot_indicators(df, axes=axes) is fig
+    # Cleared before drawing again: one wick and one body collection
+    assert len(axes[0].collections) == 2
+
+
+def test_stream_min_bytes_forces_streaming(json_export, tmp_path, monkeypatch):
+    pytest.importorskip("ijson")
+    from chart_tools import json_stream
+    from chart_tools.cli import main
+    expected = json_stream.load_json(json_export)
+
+    def no_json_load(f):
+        raise AssertionError("small file should be streamed")
+    monkeypatch.setattr(json_stream.json, "load", no_json_load)
+    pd.testing.assert_frame_equal(json_stream.load_json(json_export, stream_min_bytes=0), expected)
+    out = tmp_path / "streamed.png"
+    assert main([str(json_export), "--stream", "--no-cache", "-o", str(out)]) == 0
+    assert out.stat().st_size > 0
+
+
+@pytest.mark.parametrize("use_ijson", [True, False])
+def test_load_json_streaming_and_fallback(json_export, monkeypatch, use_ijson):
+    from chart_tools import json_stream
+    if use_ijson:
+        pytest.importorskip("ijson")
+        monkeypatch.setattr(json_stream, "STREAM_MIN_BYTES", 0)
+    else:
+        monkeypatch.setattr(json_stream, "ijson", None)
+    df = json_stream.load_json(json_export)
+    assert df.attrs["timeframe"] == "5m"
+    assert df.index.tz is not None
+    assert df["macd.signal"].dtype == "float64"
+    assert list(df["bbands.upper"]) == [105.0, 106.0, 107.0]
+    assert json_stream.list_timeframes(json_export) == ["5m", "1h"]
+    with pytest.raises(KeyError):
+        json_stream.load_json(json_export, timeframe="1d")
+
+
+def test_load_json_timeframes_aligns_indicator_gaps(tmp_path):
+    from chart_tools import json_stream
+    times = pd.date_range("2025-01-01", periods=6, freq="5min", tz="UTC")
+    iso = [t.strftime("%Y-%m-%dT%H:%M:%SZ") for t in times]
+    # Indicators miss the first and fourth candle and have one row after the last candle
+    indicators = [_indicator(iso[i], 10.0 * i) for i in (1, 2, 4, 5)] + [{"time": "2025-01-01T00:30:00Z", "sma": 99.0}]
+    path = tmp_path / "gaps.json"
+    path.write_text(json.dumps({"5m": {"candles": [_candle(t, 100.0) for t in iso], "indicators": indicators}}))
+
+    df = json_stream.load_json_timeframes(path)["5m"]
+    assert df.index.equals(pd.DatetimeIndex(times, name="time").as_unit("ns"))
+    assert df["sma"].tolist()[1:3] == [10.0, 20.0] and df["sma"].tolist()[4:] == [40.0, 50.0]
+    assert df["sma"].isna().tolist() == [True, False, False, True, False, False]
+    assert df.attrs["timeframe"] == "5m"
+    pd.testing.assert_frame_equal(df, json_stream.load_json(path))
+
+def test_load_json_missing_values_are_nan(tmp_path):
+    data = {
+        "5m": {
+            "candles": [_candle("2025-04-23T13:30:00.000Z", 100.0), _candle("2025-04-23T13:35:00.000Z", 101.0)],
+            # First indicator row lacks macd, second one is missing entirely
+            "indicators": [{"time": "2025-04-23T13:30:00.000Z", "sma": 100.0, "macd": None}],
+        }
+    }
+    path = tmp_path / "gaps.json"
+    path.write_text(json.dumps(data))
+    df = chart_tools.load_json(path)
+    assert len(df) == 2
+    assert df["sma"].iloc[0] == 100.0
+    assert df["sma"].isna().iloc[1]
+    assert "macd.macd" not in df
+
+
+def test_normalise_dict_columns_with_gaps():
+    index = pd.date_range("2025-04-23T13:30Z", periods=3, freq="5min", name="time")
+    df = pd.DataFrame(
+        {
+            "open": [1, 2, 3],
+            "macd": [{"macd": 1.0, "signal": 2.0, "hist": 3.0}, None, {"macd": 4.0, "signal": 5.0}],
+            "bbands": [None, {"lower": 1.0, "middle": 2.0, "upper": 3.0}, None],
+        },
+        index=index,
+    )
+    out = chart_tools.normalise(df)
+    assert out["open"].dtype == "float64"
+    assert out["MACD"].tolist()[::2] == [1.0, 4.0]
+    assert out["MACD"].isna().iloc[1]
+    assert out["MACD_hist"].isna().iloc[2]
+    assert out["BB_upper"].iloc[1] == 3.0
+    assert "macd" not in out
+
+
+def test_normalise_partial_group_is_completed():
+    index = pd.date_range("2025-04-23T13:30Z", periods=2, freq="5min", name="time")
+    out = chart_tools.normalise(pd.DataFrame({"macd": [1.0, 2.0]}, index=index))
+    assert out["MACD"].tolist() == [1.0, 2.0]
+    assert out["MACD_signal"].isna().all()
+
+
+def test_frame_cache_roundtrip_and_invalidation(json_export, tmp_path):
+    from chart_tools.cache import FrameCache
+    cache = FrameCache(tmp_path / "cache")
+    first = chart_tools.load_frame(json_export, cache=cache)
+    cached = chart_tools.load_frame(json_export, cache=cache)
+    pd.testing.assert_frame_equal(first, cached, check_freq=False)
+    assert cached.attrs["timeframe"] == "5m"
+
+    # Rewriting the source with other content invalidates the entry
+    data = json.loads(json_export.read_text())
+    data["5m"]["candles"][0]["close"] = 999.0
+    json_export.write_text(json.dumps(data))
+    assert chart_tools.load_frame(json_export, cache=cache)["close"].iloc[0] == 999.0
+
+
+def test_frame_cache_hit_is_writable(json_export, tmp_path):
+    from chart_tools.cache import FrameCache
+    cache = FrameCache(tmp_path / "cache")
+    chart_tools.load_frame(json_export, cache=cache)
+    cached = chart_tools.load_frame(json_export, cache=cache)
+    cached.loc[cached.index[0], "close"] = -1.0
+    cached["mid"] = (cached["high"] + cached["low"]) / 2
+    cached["close"] *= 2
+    assert cached["close"].iloc[0] == -2.0
+    # Edits stay in memory, the stored entry is unchanged
+    assert chart_tools.load_frame(json_export, cache=cache)["close"].iloc[0] != -1.0
+
+
+def test_frame_cache_lru_eviction(json_export, csv_export, tmp_path):
+    from chart_tools.cache import FrameCache
+    cache = FrameCache(tmp_path / "cache", max_bytes=1)
+    chart_tools.load_frame(json_export, cache=cache)
+    chart_tools.load_frame(csv_export, cache=cache)
+    # Older entries are evicted first
+    assert len([e for e in cache.entries.iterdir() if not e.name.startswith(".")]) <= 1
+
+
+def test_resample_ohlc_keeps_extremes():
+    from chart_tools.decimate import resample_ohlc
+    index = pd.date_range("2025-01-01", periods=10, freq="1min", tz="UTC", name="time")
+    df = pd.DataFrame(
+        {
+            "open": range(10), "close": range(1, 11), "volume": [1.0] * 10,
+            "high": [20, 11, 12, 13, 14, 15, 16, 17, 18, 19], "low": [0, 1, 2, 3, -5, 5, 6, 7, 8, 9],
+        },
+        index=index, dtype=float,
+    )
+    out = resample_ohlc(df, 3)
+    assert list(out["open"]) == [0, 4, 8]
+    assert list(out["close"]) == [4, 8, 10]
+    assert list(out["high"]) == [20, 17, 19]
+    assert list(out["low"]) == [0, -5, 8]
+    assert list(out["volume"]) == [4, 4, 2]
+    assert out.index[1] == index[4]
+
+
+def test_lttb_keeps_endpoints_and_spike():
+    import numpy as np
+    from chart_tools.decimate import lttb_indices
+    y = np.zeros(1000)
+    y[500] = 100.0
+    y[:10] = np.nan
+    idx = lttb_indices(np.arange(1000.0), y, 50)
+    assert len(idx) == 50
+    assert idx[0] == 10 and idx[-1] == 999
+    assert 500 in idx
+
+
+def test_align_higher_timeframe_without_lookahead():
+    from chart_tools.multitf import align_to
+    base = pd.DataFrame({"close": range(6)},
+                        index=pd.date_range("2025-01-01 00:00", periods=6, freq="30min", tz="UTC"))
+    hourly = pd.DataFrame({"RSI": [10.0, 20.0, 30.0]},
+                          index=pd.date_range("2025-01-01 00:00", periods=3, freq="1h", tz="UTC"))
+    aligned = align_to(base, hourly, "30m", "1h")
+    # The 00:00 hour is known once the 00:30 candle has closed
+    assert aligned["RSI@1h"].tolist()[1:] == [10.0, 10.0, 20.0, 20.0, 30.0]
+    assert pd.isna(aligned["RSI@1h"].iloc[0])
+
+
+def test_load_timeframes_parses_once(json_export, monkeypatch):
+    from chart_tools import json_stream, multitf
+    loads = []
+    real_load = json_stream.json.load
+    monkeypatch.setattr(json_stream.json, "load", lambda f: loads.append(1) or real_load(f))
+    frames = multitf.load_timeframes(json_export)
+    assert list(frames) == ["5m", "1h"] and len(loads) == 1
+    aligned = multitf.align_timeframes(frames, columns=["SMA"])
+    assert aligned.index.equals(frames["5m"].index)
+    assert aligned["SMA@1h"].isna().tolist() == [True, True, True]  # the hour has not closed yet
+    with pytest.raises(KeyError):
+        multitf.load_timeframes(json_export, ["4h"])
+
+
+def test_load_timeframes_streams_large_files(json_export, monkeypatch):
+    pytest.importorskip("ijson")
+    from chart_tools import json_stream, multitf
+    expected = multitf.load_timeframes(json_export, start="2025-04-23T13:35Z")
+
+    def no_json_load(f):
+        raise AssertionError("large file should be streamed")
+    monkeypatch.setattr(json_stream.json, "load", no_json_load)
+    monkeypatch.setattr(json_stream, "STREAM_MIN_BYTES", 0)
+    frames = multitf.load_timeframes(json_export, start="2025-04-23T13:35Z")
+    assert list(frames) == list(expected)
+    for timeframe, df in expected.items():
+        pd.testing.assert_frame_equal(frames[timeframe], df)
+    assert list(json_stream.load_json_timeframes(json_export, ["1h"])) == ["1h"]
+    with pytest.raises(KeyError):
+        json_stream.load_json_timeframes(json_export, ["4h"])
+
+
+@pytest.mark.parametrize("layout, n_axes", [("overlay", 4), ("stacked", 2)])
+def test_cli_multi_timeframe(json_export, tmp_path, layout, n_axes):
+    from chart_tools import multitf
+    from chart_tools.cli import main
+    fig = multitf.plot_timeframes(multitf.load_timeframes(json_export), layout=layout)
+    assert len(fig.axes) == n_axes
+
+    out = tmp_path / f"{layout}.png"
+    assert main([str(json_export), "--tf", "5m,1h", "--layout", layout, "-o", str(out)]) == 0
+    assert out.stat().st_size > 0
+
+
+def test_ohlc_pyramid_levels_match_buckets():
+    import numpy as np
+    from chart_tools.viewer import OHLCPyramid
+    rng = np.random.default_rng(0)
+    close = 100 + rng.normal(size=11).cumsum()
+    open_ = np.r_[100.0, close[:-1]]
+    high, low = np.maximum(open_, close) + 1, np.minimum(open_, close) - 1
+    pyramid = OHLCPyramid(np.arange(11.0), open_, high, low, close)
+    assert [len(level[0]) for level in pyramid.levels] == [11, 6, 3, 2, 1]
+    x, o, h, l, c = pyramid.levels[2]
+    assert x.tolist() == [1.5, 5.5, 9.25]
+    for bucket, (start, stop) in enumerate([(0, 4), (4, 8), (8, 11)]):
+        assert o[bucket] == open_[start] and c[bucket] == close[stop - 1]
+        assert h[bucket] == high[start:stop].max() and l[bucket] == low[start:stop].min()
+
+
+def test_viewer_draws_only_visible_bars():
+    import numpy as np
+    from chart_tools.viewer import ChartViewer
+    index = pd.date_range("2025-01-01", periods=100_000, freq="1min", tz="UTC", name="time")
+    close = 100 + np.random.default_rng(1).normal(size=len(index)).cumsum()
+    df = pd.DataFrame({"open": close, "high": close + 1, "low": close - 1, "close": close}, index=index)
+    viewer = ChartViewer(df, max_bars=500)
+    assert viewer.drawn <= 502 and viewer.level == 8
+
+    # Zooming in to 200 candles draws them one by one
+    x = viewer.pyramid.levels[0][0]
+    viewer.ax.set_xlim(x[5_000], x[5_199])
+    assert viewer.level == 0 and viewer.drawn == 202
+    low, high = viewer.ax.get_ylim()
+    assert low < df["low"].iloc[5_000:5_200].min() and high > df["high"].iloc[5_000:5_200].max()
+    viewer.ax.figure.canvas.draw()
+
+
+@pytest.mark.parametrize("engine", ["pyarrow", "c"])
+def test_load_csv_dtypes_and_window(tmp_path, monkeypatch, engine):
+    from chart_tools import csv_reader
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(csv_reader, "ENGINE", engine)
+    times = pd.date_range("2025-01-01", periods=50, freq="1min", tz="UTC")
+    path = tmp_path / "long.csv"
+    pd.DataFrame({
+        "time": times.strftime("%Y-%m-%dT%H:%M:%S.000Z"), "open": range(50), "high": range(50),
+        "low": range(50), "close": range(50), "volume": 1, "sma": [None] * 49 + [1.5],
+    }).to_csv(path, index=False)
+
+    df = csv_reader.load_csv(path)
+    assert df.index.equals(times.rename("time").as_unit("ns"))
+    assert all(df[c].dtype == "float64" for c in df.columns)
+
+    window = csv_reader.load_csv(path, start=times[7], end="2025-01-01 00:21", chunk_rows=4)
+    assert window.index[0] == times[7] and window.index[-1] == times[21] and len(window) == 15
+    assert csv_reader.load_csv(path, start="2026-01-01").empty
+
+
+@pytest.mark.parametrize("use_ijson", [True, False])
+def test_load_json_time_window(tmp_path, monkeypatch, use_ijson):
+    from chart_tools import json_stream
+    if use_ijson:
+        pytest.importorskip("ijson")
+        monkeypatch.setattr(json_stream, "STREAM_MIN_BYTES", 0)
+    else:
+        monkeypatch.setattr(json_stream, "ijson", None)
+    monkeypatch.setattr(json_stream, "CHUNK_SIZE", 8)
+    times = pd.date_range("2025-01-01", periods=100, freq="5min", tz="UTC").strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    path = tmp_path / "long.json"
+    path.write_text(json.dumps({"5m": {"candles": [_candle(t, 100.0 + i) for i, t in enumerate(times)],
+                                       "indicators": [_indicator(t, 100.0 + i) for i, t in enumerate(times)]}}))
+
+    parsed = []
+    real_parse = json_stream._parse_times
+    monkeypatch.setattr(json_stream, "_parse_times", lambda records: parsed.append(len(records)) or real_parse(records))
+    df = json_stream.load_json(path, start="2025-01-01 01:00", end=pd.Timestamp("2025-01-01 02:00", tz="UTC"))
+    assert df.index[0] == pd.Timestamp("2025-01-01 01:00", tz="UTC") and len(df) == 13
+    assert list(df["sma"]) == [112.0 + i for i in range(13)]
+    # Streaming stops shortly after the end instead of reading all 100 candles
+    assert sum(parsed) < 2 * 100
+    assert json_stream.load_json(path, start="2026-01-01").empty
+
+    frames = json_stream.load_json_timeframes(path, start="2025-01-01 07:30")
+    assert len(frames["5m"]) == 10
+
+
+def test_csv_seek_and_cli_window(tmp_path, monkeypatch):
+    from chart_tools import csv_reader
+    from chart_tools.cli import main
+    monkeypatch.setattr(csv_reader, "SEEK_GRANULARITY", 64)
+    times = pd.date_range("2025-01-01", periods=500, freq="1min", tz="UTC")
+    path = tmp_path / "long.csv"
+    pd.DataFrame({"time": times.strftime("%Y-%m-%dT%H:%M:%SZ"), "open": 1.0, "high": 2.0, "low": 0.5,
+                  "close": range(500), "volume": 1.0}).to_csv(path, index=False)
+
+    columns, offset = csv_reader.seek_offset(path, times[300])
+    assert columns[0] == "time" and offset > 10_000
+    with open(path, "rb") as f:
+        f.seek(offset)
+        first = pd.Timestamp(f.readline().split(b",")[0].decode())
+    assert times[290] <= first <= times[300]
+
+    window = csv_reader.load_csv(path, start=times[300], end=times[309], chunk_rows=4)
+    assert list(window["close"]) == list(range(300, 310))
+    assert list(csv_reader.load_csv(path, start=times[495])["close"]) == list(range(495, 500))
+
+    out = tmp_path / "window.png"
+    assert main([str(path), "--start", "2025-01-01 05:00", "--end", "2025-01-01 06:00", "-o", str(out)]) == 0
+    assert out.stat().st_size > 0
+
+
+@pytest.mark.parametrize("use_ijson", [True, False])
+def test_empty_json_window_renders(json_export, tmp_path, monkeypatch, use_ijson):
+    from chart_tools import json_stream, multitf
+    from chart_tools.cli import main
+    if use_ijson:
+        pytest.importorskip("ijson")
+        monkeypatch.setattr(json_stream, "STREAM_MIN_BYTES", 0)
+    else:
+        monkeypatch.setattr(json_stream, "ijson", None)
+    df = chart_tools.load_frame(json_export, start="2030-01-01")
+    assert df.empty and {"open", "high", "low", "close", "SMA"} <= set(df.columns)
+    frames = multitf.load_timeframes(json_export, start="2030-01-01")
+    assert all(frame.empty and "close" in frame for frame in frames.values())
+
+    for tf in ("5m", "5m,1h"):
+        out = tmp_path / f"empty_{tf.replace(',', '_')}.png"
+        assert main([str(json_export), "--tf", tf, "--start", "2030-01-01", "-o", str(out)]) == 0
+        assert out.stat().st_size > 0
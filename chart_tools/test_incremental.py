@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from chart_tools import indicators
+from chart_tools.incremental import ATR, MACD, RSI, SMA, BBands, EMA, IndicatorCache
+
+SPEC = {
+    "sma": lambda: SMA(20),
+    "ema": lambda: EMA(20),
+    "rsi": lambda: RSI(14),
+    "atr": lambda: ATR(14),
+    ("macd", "macdsignal", "macdhist"): lambda: MACD(12, 26, 9),
+    ("bb_lower", "bb_middle", "bb_upper"): lambda: BBands(20, 2.0),
+}
+
+
+def candles(n: int, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 30_000 + np.cumsum(rng.normal(0, 15, n))
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2025-01-01", periods=n, freq="5min", tz="UTC"),
+            "open": close,
+            "high": close + rng.uniform(0, 20, n),
+            "low": close - rng.uniform(0, 20, n),
+            "close": close,
+            "volume": 1.0,
+        }
+    )
+
+
+def full(df: pd.DataFrame) -> dict:
+    high, low, close = (df[c].to_numpy() for c in ("high", "low", "close"))
+    expected = {
+        "sma": indicators.sma(close, 20),
+        "ema": indicators.ema(close, 20),
+        "rsi": indicators.rsi(close, 14),
+        "atr": indicators.atr(high, low, close, 14),
+    }
+    expected.update(zip(("macd", "macdsignal", "macdhist"), indicators.macd(close)))
+    expected.update(zip(("bb_lower", "bb_middle", "bb_upper"), indicators.bbands(close, 20, 2.0)))
+    return expected
+
+
+def assert_matches_full(df: pd.DataFrame):
+    for name, values in full(df).items():
+        np.testing.assert_allclose(df[name].to_numpy(), values, rtol=1e-9, atol=1e-9, equal_nan=True,
+                                   err_msg=name)
+
+
+def test_incremental_matches_full_recomputation():
+    data = candles(700)
+    cache = IndicatorCache(SPEC)
+    window = 300
+    # Sliding window like freqtrade: one new candle, oldest one dropped
+    for end in range(window, len(data) + 1):
+        df = data.iloc[:end].copy() if end == window else data.iloc[end - window:end].copy()
+        cache.update("BTC/USDT", df)
+    assert cache.full_recomputes == 1
+    assert cache.incremental_updates == len(data) - window
+
+    # The window has lost its first candles, so compare against the full history
+    full_history = data.copy()
+    IndicatorCache(SPEC).update("BTC/USDT", full_history)
+    assert_matches_full(full_history)
+    for name in full(full_history):
+        np.testing.assert_allclose(df[name].to_numpy(), full_history[name].to_numpy()[-window:],
+                                   rtol=1e-9, equal_nan=True, err_msg=name)
+
+
+def test_same_candle_twice_is_a_noop():
+    df = candles(100)
+    cache = IndicatorCache(SPEC)
+    cache.update("ETH/USDT", df.copy())
+    again = cache.update("ETH/USDT", df.copy())
+    assert cache.full_recomputes == 1
+    assert_matches_full(again)
+
+
+@pytest.mark.parametrize("mutate", ["gap", "changed_close", "older_start"])
+def test_mismatched_history_recomputes(mutate):
+    data = candles(200)
+    cache = IndicatorCache(SPEC)
+    cache.update("BTC/USDT", data.iloc[:150].copy())
+    if mutate == "gap":
+        df = data.iloc[160:200].copy()
+    elif mutate == "changed_close":
+        df = data.iloc[:151].copy()
+        df.loc[149, "close"] += 1.0
+    else:
+        df = data.iloc[:120].copy()
+    result = cache.update("BTC/USDT", df)
+    assert cache.full_recomputes == 2
+    assert_matches_full(result)
+
+
+def test_pairs_are_independent():
+    cache = IndicatorCache(SPEC)
+    a = cache.update("A", candles(100, seed=1))
+    b = cache.update("B", candles(100, seed=2))
+    assert_matches_full(a)
+    assert_matches_full(b)
+    assert set(cache.pairs) == {"A", "B"}
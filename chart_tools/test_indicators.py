@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from chart_tools import indicators
+
+talib = pytest.importorskip("talib")
+
+TOLERANCE = 1e-6
+
+
+@pytest.fixture(scope="module")
+def ohlc():
+    rng = np.random.default_rng(7)
+    n = 3000
+    close = 50_000 + np.cumsum(rng.normal(0, 25, n))
+    high = close + rng.uniform(0, 40, n)
+    low = close - rng.uniform(0, 40, n)
+    return high, low, close
+
+
+def assert_matches(actual, expected):
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+    np.testing.assert_allclose(actual, expected, rtol=TOLERANCE, equal_nan=True)
+
+
+@pytest.mark.parametrize("period", [5, 20, 50])
+def test_sma_ema(ohlc, period):
+    close = ohlc[2]
+    assert_matches(indicators.sma(close, period), talib.SMA(close, period))
+    assert_matches(indicators.ema(close, period), talib.EMA(close, period))
+
+
+@pytest.mark.parametrize("period", [7, 14])
+def test_rsi_atr(ohlc, period):
+    high, low, close = ohlc
+    assert_matches(indicators.rsi(close, period), talib.RSI(close, period))
+    assert_matches(indicators.atr(high, low, close, period), talib.ATR(high, low, close, period))
+
+
+def test_macd(ohlc):
+    close = ohlc[2]
+    for actual, expected in zip(indicators.macd(close), talib.MACD(close, 12, 26, 9)):
+        assert_matches(actual, expected)
+
+
+def test_bbands(ohlc):
+    close = ohlc[2]
+    upper, middle, lower = talib.BBANDS(close, 20, 2.0, 2.0)
+    for actual, expected in zip(indicators.bbands(close, 20, 2.0), (lower, middle, upper)):
+        assert_matches(actual, expected)
+
+
+def test_recursive_filter_fallback_matches(ohlc, monkeypatch):
+    close = ohlc[2]
+    expected = indicators.ema(close, 20)
+    monkeypatch.setattr(indicators, "lfilter", None)
+    assert_matches(indicators.ema(close, 20), expected)
+
+
+def test_short_input_is_all_nan():
+    close = np.arange(5, dtype=float)
+    assert np.isnan(indicators.ema(close, 20)).all()
+    assert np.isnan(indicators.rsi(close, 14)).all()
+    assert all(np.isnan(line).all() for line in indicators.macd(close))
+
+
+def test_add_indicators_keeps_existing_columns(ohlc):
+    high, low, close = ohlc
+    df = pd.DataFrame({"open": close, "high": high, "low": low, "close": close, "SMA": 1.0})
+    indicators.add_indicators(df)
+    assert (df["SMA"] == 1.0).all()
+    for column in ("EMA", "RSI", "MACD", "MACD_signal", "MACD_hist", "ATR", "BB_lower", "BB_middle", "BB_upper"):
+        assert column in df
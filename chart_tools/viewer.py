@@ -0,0 +1,203 @@
+"""
+Interactive candle viewer for very large datasets.
+
+The candles are reduced once into a pyramid of OHLC levels, level k holding
+buckets of 2**k candles (first open, max high, min low, last close). On
+every zoom or pan only the bars inside the visible range are drawn, from the
+finest level that still fits the axes' pixel width, so navigating millions
+of candles stays as fast as drawing a few hundred.
+
+Usage:
+    python -m chart_tools.viewer path/to/export.json [--tf 1m]
+"""
+import argparse
+import logging
+import math
+import sys
+
+import numpy as np
+from matplotlib.collections import LineCollection, PolyCollection
+
+from chart_tools.candles import box_verts, date_index_to_num
+from chart_tools.decimate import target_candles
+
+logger = logging.getLogger(__name__)
+
+
+class OHLCPyramid:
+    """
+    Multi-resolution OHLC levels of a candle series. Each level is a tuple of
+    (x, open, high, low, close) arrays, x being the bucket's center in
+    matplotlib date numbers.
+    """
+
+    def __init__(self, x: np.ndarray, o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray):
+        self.levels = [tuple(np.asarray(a, dtype=float) for a in (x, o, h, l, c))]
+        while len(self.levels[-1][0]) > 1:
+            self.levels.append(self._halve(*self.levels[-1]))
+
+    @classmethod
+    def from_frame(cls, df) -> "OHLCPyramid":
+        return cls(date_index_to_num(df.index), *(df[col].to_numpy(dtype=float)
+                                                  for col in ("open", "high", "low", "close")))
+
+    @staticmethod
+    def _halve(x, o, h, l, c):
+        """
+        Merges each pair of neighbouring buckets, an odd last bucket is kept as is.
+        """
+        n = len(x)
+        m = n // 2
+        tail = slice(2 * m, n)
+        return (
+            np.concatenate(((x[0:2 * m:2] + x[1:2 * m:2]) / 2, x[tail])),
+            np.concatenate((o[0:2 * m:2], o[tail])),
+            np.concatenate((np.fmax(h[0:2 * m:2], h[1:2 * m:2]), h[tail])),
+            np.concatenate((np.fmin(l[0:2 * m:2], l[1:2 * m:2]), l[tail])),
+            np.concatenate((c[1:2 * m:2], c[tail])),
+        )
+
+    def __len__(self) -> int:
+        return len(self.levels[0][0])
+
+    def level_for(self, n_visible: int, max_bars: int) -> int:
+        """
+        Finest level at which n_visible candles take at most max_bars bars.
+        """
+        if n_visible <= max_bars:
+            return 0
+        return min(math.ceil(math.log2(n_visible / max_bars)), len(self.levels) - 1)
+
+    def window(self, x0: float, x1: float, max_bars: int):
+        """
+        Bars between x0 and x1 (plus one on either side, so partially visible
+        bars are drawn) at the finest level that fits max_bars.
+
+        :return: tuple of (level, x, open, high, low, close)
+        """
+        base_x = self.levels[0][0]
+        n_visible = int(np.searchsorted(base_x, x1, side="right") - np.searchsorted(base_x, x0, side="left"))
+        level = self.level_for(max(n_visible, 1), max_bars)
+        arrays = self.levels[level]
+        start = max(int(np.searchsorted(arrays[0], x0, side="left")) - 1, 0)
+        stop = int(np.searchsorted(arrays[0], x1, side="right")) + 1
+        return (level, *(a[start:stop] for a in arrays))
+
+
+class ChartViewer:
+    """
+    Candle chart on a matplotlib axes that redraws the visible range from an
+    OHLCPyramid whenever the x limits change (zoom, pan, home button).
+
+    :param max_bars: bars drawn at most, defaults to what the axes' pixel width can show
+    """
+
+    def __init__(self, df, ax=None, max_bars: int | None = None, up_color: str = "green",
+                 down_color: str = "red", wick_color: str = "black", alpha: float = 0.8):
+        if ax is None:
+            import matplotlib.pyplot as plt
+            _, ax = plt.subplots(figsize=(14, 6))
+        self.ax = ax
+        self.max_bars = max_bars
+        self.up_color = up_color
+        self.down_color = down_color
+        self.pyramid = OHLCPyramid.from_frame(df)
+        self.level = 0
+        self.drawn = 0
+
+        self.wicks = LineCollection([], colors=wick_color, linewidths=1.0, zorder=1)
+        self.bodies = PolyCollection([], alpha=alpha, zorder=2)
+        ax.add_collection(self.wicks)
+        ax.add_collection(self.bodies)
+        ax.xaxis_date()
+        ax.grid(True)
+        timeframe = df.attrs.get("timeframe")
+        ax.set_title(f"Candlestick ({timeframe})" if timeframe else "Candlestick")
+
+        x = self.pyramid.levels[0][0]
+        if len(x):
+            ax.set_xlim(x[0], x[-1] if len(x) > 1 else x[0] + 1)
+        self._updating = False
+        self._cid = ax.callbacks.connect("xlim_changed", self._on_xlim_changed)
+        self.update()
+
+    def _max_bars(self) -> int:
+        if self.max_bars is not None:
+            return self.max_bars
+        return target_candles(self.ax.get_window_extent().width)
+
+    def update(self):
+        """
+        Replaces the drawn bars with the ones of the current x range.
+        """
+        x0, x1 = self.ax.get_xlim()
+        level, x, o, h, l, c = self.pyramid.window(x0, x1, self._max_bars())
+        self.level = level
+        self.drawn = len(x)
+
+        segments = np.empty((len(x), 2, 2), dtype=float)
+        segments[:, 0, 0] = x
+        segments[:, 0, 1] = l
+        segments[:, 1, 0] = x
+        segments[:, 1, 1] = h
+        self.wicks.set_segments(segments)
+
+        width = (np.median(np.diff(x)) if len(x) > 1 else 1 / (24 * 60)) * 0.8
+        colors = np.where(c >= o, self.up_color, self.down_color)
+        self.bodies.set_verts(box_verts(x, np.minimum(o, c), np.maximum(o, c), width))
+        self.bodies.set_facecolor(colors)
+        self.bodies.set_edgecolor(colors)
+
+        visible = (x >= x0) & (x <= x1)
+        if visible.any() and not np.isnan(l[visible]).all():
+            low, high = np.nanmin(l[visible]), np.nanmax(h[visible])
+            margin = (high - low) * 0.05 or 1.0
+            self.ax.set_ylim(low - margin, high + margin)
+        logger.debug(f"Drew {self.drawn} bars at level {level} (x {2 ** level} candles per bar)")
+
+    def _on_xlim_changed(self, ax):
+        if self._updating:
+            return
+        self._updating = True
+        try:
+            self.update()
+        finally:
+            self._updating = False
+        ax.figure.canvas.draw_idle()
+
+    def disconnect(self):
+        self.ax.callbacks.disconnect(self._cid)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m chart_tools.viewer",
+                                     description="Interactive candle viewer for large chart exports.")
+    parser.add_argument("datafile", help="JSON or CSV chart export")
+    parser.add_argument("--tf", dest="timeframe", default=None,
+                        help="timeframe to show from a JSON export (default: first in file)")
+    parser.add_argument("--start", default=None, help="first candle time to load (UTC if no zone)")
+    parser.add_argument("--end", default=None, help="last candle time to load (inclusive)")
+    parser.add_argument("--stream", action="store_true",
+                        help="stream JSON exports of any size with ijson (default: only exports of 64 MB or more)")
+    parser.add_argument("--no-cache", dest="cache", action="store_false",
+                        help="do not read or write the on-disk cache of parsed exports")
+    parser.add_argument("--cache-dir", default=None,
+                        help="cache directory (default: $CHART_TOOLS_CACHE_DIR or ~/.cache/chart_tools)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    import matplotlib.pyplot as plt
+
+    from chart_tools.cache import FrameCache
+    from chart_tools.loaders import load_frame
+
+    df = load_frame(args.datafile, timeframe=args.timeframe, cache=FrameCache(args.cache_dir) if args.cache else None,
+                    start=args.start, end=args.end, stream_min_bytes=0 if args.stream else None)
+    viewer = ChartViewer(df)
+    logger.info(f"{len(viewer.pyramid)} candles in {len(viewer.pyramid.levels)} levels, zoom and pan to navigate")
+    plt.show()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
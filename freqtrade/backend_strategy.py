@@ -1,16 +1,31 @@
 import requests
+import functools
 import logging
-import json
-from datetime import datetime
+import os
+import time
+from datetime import datetime, timedelta, timezone
 from pandas import DataFrame
 from freqtrade.strategy.interface import IStrategy
+from freqtrade.enums import RunMode
+from freqtrade.exchange import timeframe_to_prev_date, timeframe_to_seconds
 from freqtrade.persistence import Trade
+from chart_tools import indicators
+from chart_tools.incremental import RSI, SMA, IndicatorCache
+from strategy_timing import TimingRegistry, instrument
+from trade_plan import (UNLIMITED_TAG_CACHE_SIZE, TradePlan, clamp_entry_price, plan_tag, tag_parser,
+                        take_profit_reached)
+from trade_plan_cache import TradePlanCache
+from trade_plan_client import TradePlanClient
+from trade_plan_poller import TradePlanPoller
+from trade_plan_prefetch import TradePlanPrefetcher
+from trade_plan_recorder import TradePlanRecorder
+from trade_plan_replay import TradePlanReplay
 
 logger = logging.getLogger(__name__)
 
 class BackendStrategy(IStrategy):
 
-    # URL of the external trade signal server
+    # URL of the external trade signal server, can be overridden by "trade_plan_server.url" in the config
     external_server_url = "http://trading-server:3000/api/v1/trading/tradePlan"
 
     # Enable short trading
@@ -33,12 +48,168 @@ class BackendStrategy(IStrategy):
         "0": 0.10
     }
 
+    # Indicators maintained incrementally per pair in live/dry-run mode
+    incremental_indicators = {
+        'rsi_period_14_close': lambda: RSI(14),
+        'sma_period_20_close': lambda: SMA(20),
+        'sma_period_50_close': lambda: SMA(50),
+    }
+
+    def __init__(self, config: dict) -> None:
+        super().__init__(config)
+        self.indicator_cache = IndicatorCache(self.incremental_indicators)
+        server = config.get("trade_plan_server", {})
+        self.trade_plan_client = TradePlanClient.from_config(config, self.external_server_url)
+        self.trade_plan_prefetcher = TradePlanPrefetcher(max_workers=int(server.get("max_workers", 8)))
+        # Batch mode: one request for all pairs, switched off if the server does not support it
+        self.trade_plan_batch = bool(server.get("batch", False))
+        self.trade_plan_batch_url = server.get("batch_url")
+        # Plans requested outside the prefetch, at most one request per pair and candle
+        self.trade_plan_cache = TradePlanCache(
+            max_size=int(server.get("cache_size", 256)),
+            ttl=float(server.get("cache_ttl", timeframe_to_seconds(self.timeframe))))
+        # Candle whose bot loop last logged the cache statistics
+        self._trade_plan_cache_reported = None
+        # Background polling of all pairs (live/dry-run, poll_interval > 0), started in bot_start
+        self.trade_plan_poll_interval = float(server.get("poll_interval", 0))
+        # Polled plans older than max_age seconds are not used, defaults to two poll rounds in bot_start
+        self.trade_plan_max_age = server.get("max_age")
+        self.trade_plan_poller: TradePlanPoller | None = None
+        # Recorded plans replayed in backtesting instead of requesting the backend
+        replay_file = server.get("replay_file")
+        self.trade_plan_replay = TradePlanReplay.from_file(replay_file) if replay_file else None
+        # Every backend response is appended to record_file (JSONL) by a background writer
+        record_file = server.get("record_file")
+        self.trade_plan_recorder = TradePlanRecorder(record_file) if record_file else None
+        # Parsed entry tags, memoized for tag_cache_size tags (default: twice max_open_trades, at least 1024;
+        # UNLIMITED_TAG_CACHE_SIZE with unlimited open trades) so the tags of all open trades stay cached between loops
+        tag_cache_size = server.get("tag_cache_size")
+        if tag_cache_size is None:
+            max_open_trades = config.get("max_open_trades", -1)
+            if max_open_trades < 0 or max_open_trades == float("inf"):
+                tag_cache_size = UNLIMITED_TAG_CACHE_SIZE
+            else:
+                tag_cache_size = max(1024, 2 * int(max_open_trades))
+        self.parse_tag = tag_parser(int(tag_cache_size))
+        # Pairs with an open trade, refreshed once per bot loop (None: query on next use)
+        self._open_pairs: set[str] | None = None
+
+        # Opt-in callback timing, the methods are only wrapped when enabled
+        timing = config.get("strategy_timing", {})
+        self.timing: TimingRegistry | None = None
+        if timing.get("enabled", False):
+            self.timing = TimingRegistry(window=int(timing.get("window", 1000)))
+            self.timing_log_interval = float(timing.get("log_interval", 300))
+            self.timing_prometheus_file = timing.get("prometheus_file")
+            self._timing_reported = time.monotonic()
+            instrument(self, self.timing)
+
+    def is_live(self) -> bool:
+        return self.config.get('runmode') in (RunMode.LIVE, RunMode.DRY_RUN)
+
+    def last_closed_candle(self, current_time: datetime) -> datetime:
+        """
+        Open time of the last closed candle, i.e. the last row of the analyzed dataframe.
+        """
+        return timeframe_to_prev_date(self.timeframe, current_time) - timedelta(
+            seconds=timeframe_to_seconds(self.timeframe))
+
+    def bot_start(self, **kwargs) -> None:
+        """
+        Starts the background trade plan poller if poll_interval is configured.
+        """
+        if not self.is_live() or self.trade_plan_poll_interval <= 0:
+            return
+        if self.trade_plan_max_age is None:
+            self.trade_plan_max_age = 2 * self.trade_plan_poll_interval
+        self.trade_plan_poller = TradePlanPoller(
+            pairs=self.dp.current_whitelist,
+            fetch_all=self.fetch_trade_plans,
+            interval=self.trade_plan_poll_interval,
+            max_age=self.trade_plan_max_age)
+        self.trade_plan_poller.start()
+
+    def fetch_trade_plans(self, pairs: list[str]) -> tuple[dict, list[float], bool]:
+        """
+        Fetches the plans of all pairs, in one batch request if enabled and concurrently otherwise.
+        Pairs whose request failed are left out of the plans.
+        """
+        return self.trade_plan_prefetcher.fetch_all(
+            pairs, functools.partial(self.request_trade_plan, raise_errors=True),
+            fetch_batch=self.request_trade_plans if self.trade_plan_batch else None)
+
+    def bot_loop_start(self, current_time: datetime, **kwargs) -> None:
+        """
+        Refreshes the open pairs and fetches the trade plans of all whitelisted pairs
+        concurrently once per candle, populate_entry_trend then only reads the prefetched
+        plan of its pair.
+        """
+        self._open_pairs = None
+        open_pairs = self.open_pairs()
+        if self.timing is not None and time.monotonic() - self._timing_reported >= self.timing_log_interval:
+            self.report_timing()
+        candle = self.last_closed_candle(current_time)
+        if candle != self._trade_plan_cache_reported:
+            self.report_trade_plan_cache(candle)
+        if not self.is_live() or self.dp is None or self.trade_plan_poller is not None:
+            return
+        if candle == self.trade_plan_prefetcher.candle:
+            return
+        self.trade_plan_prefetcher.prefetch(
+            candle, self.dp.current_whitelist(), self.request_trade_plan, skip=open_pairs,
+            fetch_batch=self.request_trade_plans if self.trade_plan_batch else None)
+
+    def report_timing(self):
+        """
+        Logs the callback latency summary and writes the Prometheus text file, if configured.
+        """
+        self._timing_reported = time.monotonic()
+        logger.info(f"Strategy callback timing:\n{self.timing.summary()}")
+        if self.timing_prometheus_file:
+            # Written to a temporary file first, so a scraper never reads a partial file
+            tmp = f"{self.timing_prometheus_file}.tmp"
+            with open(tmp, "w") as f:
+                f.write(self.timing.prometheus())
+            os.replace(tmp, self.timing_prometheus_file)
+
+    def report_trade_plan_cache(self, candle: datetime):
+        """
+        Logs the hit/miss statistics of the per-candle plan cache, once per candle and only
+        once it was used. At debug level outside live/dry-run, where every candle is a loop.
+        """
+        self._trade_plan_cache_reported = candle
+        cache = self.trade_plan_cache
+        if cache.hits or cache.misses:
+            log = logger.info if self.is_live() else logger.debug
+            log(f"Trade plan cache: {cache.stats()}")
+
+    def open_pairs(self) -> set[str]:
+        """
+        Pairs with an open trade, queried at most once per bot loop.
+        """
+        if self._open_pairs is None:
+            self._open_pairs = {trade.pair for trade in Trade.get_open_trades()}
+        return self._open_pairs
+
+    def confirm_trade_entry(self, pair: str, order_type: str, amount: float, rate: float,
+                            time_in_force: str, current_time: datetime, entry_tag: str | None,
+                            side: str, **kwargs) -> bool:
+        # A trade is about to be opened, the open pairs are queried again on next use
+        self._open_pairs = None
+        return True
+
+    def confirm_trade_exit(self, pair: str, trade: Trade, order_type: str, amount: float,
+                           rate: float, time_in_force: str, exit_reason: str,
+                           current_time: datetime, **kwargs) -> bool:
+        # A trade is about to be closed, the open pairs are queried again on next use
+        self._open_pairs = None
+        return True
+
     def is_trade_active(self, pair: str) -> bool:
         """
         Determines if there is an open trade for trading pair.
         """
-        open_trades = Trade.get_open_trades()
-        return any(trade for trade in open_trades if trade.pair == pair)
+        return pair in self.open_pairs()
 
 
     def send_trade_signal(self, metadata: list) -> dict:
@@ -49,28 +220,106 @@ class BackendStrategy(IStrategy):
             logger.info(f"There is already an open trade for {metadata['pair']}")
             return None
 
+        return self.request_trade_plan(metadata['pair'])
+
+
+    def request_trade_plan(self, pair: str, raise_errors: bool = False) -> dict | None:
+        """
+        Requests the trade plan for pair from the external server. Safe to call from worker threads.
+
+        :param raise_errors: re-raise request errors instead of returning None, so callers can tell
+                             a failed request from an answer without a plan
+        """
         exchange_name = self.config.get("exchange", {}).get("name")
 
         payload = {
             "exchange": exchange_name,
-            "pair": metadata['pair'],
+            "pair": pair,
             "timeframe": self.timeframe
         }
-        headers = {}
-        # headers = {"Authorization": f"Bearer {self.api_key}"}
+        requested_at, start = datetime.now(timezone.utc), time.perf_counter()
         try:
-            # TODO: set timeout
-            # Sending POST request to the external server
-            response = requests.post(self.external_server_url, json=payload, headers=headers)
-            response.raise_for_status()  # Raise exception for HTTP errors
-            response_data = response.json()
-            logger.info(f"trade signal from backend: {response_data}")
+            # Sending POST request to the external server (pooled, with timeouts, retries and circuit breaker)
+            response_data = self.trade_plan_client.post(payload)
+            logger.debug("trade signal from backend: %s", response_data)
+            self.record_trade_plans({pair: response_data}, requested_at, start)
             return response_data
         except requests.exceptions.RequestException as e:
             logger.error(f"Error sending signal:{e}")
+            self.record_trade_plans({pair: None}, requested_at, start, error=str(e))
+            if raise_errors:
+                raise
             return None
 
 
+    # Responses of servers without a batch endpoint
+    BATCH_UNSUPPORTED_STATUS = {400, 404, 405, 415, 422, 501}
+
+    def request_trade_plans(self, pairs: list[str]) -> dict | None:
+        """
+        Requests the trade plans of all pairs in one batch call and spreads the returned
+        list of plans across the pairs (by their "pair" field, otherwise by position).
+
+        :return: dict of pair -> plan, or None if the server does not support batches
+                 (batch mode is then switched off and plans are requested per pair)
+        """
+        payload = {
+            "exchange": self.config.get("exchange", {}).get("name"),
+            "timeframe": self.timeframe,
+            "pairs": list(pairs)
+        }
+        requested_at, start = datetime.now(timezone.utc), time.perf_counter()
+        try:
+            response_data = self.trade_plan_client.post(payload, url=self.trade_plan_batch_url)
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or e.response.status_code not in self.BATCH_UNSUPPORTED_STATUS:
+                self.record_trade_plans(dict.fromkeys(pairs), requested_at, start, error=str(e))
+                raise
+            response_data = None
+        except requests.exceptions.RequestException as e:
+            self.record_trade_plans(dict.fromkeys(pairs), requested_at, start, error=str(e))
+            raise
+        if not isinstance(response_data, list):
+            logger.warning("Trade plan server does not support batch requests, falling back to one request per pair")
+            self.trade_plan_batch = False
+            return None
+
+        logger.debug("trade signals from backend: %s", response_data)
+        if all(isinstance(plan, dict) and plan.get("pair") in payload["pairs"] for plan in response_data):
+            plans = {plan["pair"]: plan for plan in response_data}
+        elif len(response_data) == len(pairs):
+            plans = {pair: plan or None for pair, plan in zip(pairs, response_data)}
+        else:
+            error = f"Cannot match {len(response_data)} batch trade plans to {len(pairs)} pairs"
+            self.record_trade_plans(dict.fromkeys(pairs), requested_at, start, batch=True, error=error)
+            raise ValueError(error)
+        self.record_trade_plans({pair: plans.get(pair) for pair in pairs}, requested_at, start, batch=True)
+        return plans
+
+    def record_trade_plans(self, plans: dict, requested_at: datetime, start: float, **fields):
+        """
+        Hands the responses of one request (pair -> plan) to the recorder, if recording is enabled.
+
+        :param start: time.perf_counter() when the request was sent
+        """
+        if self.trade_plan_recorder is None:
+            return
+        latency = time.perf_counter() - start
+        received_at = datetime.now(timezone.utc)
+        for pair, plan in plans.items():
+            self.trade_plan_recorder.record(pair, plan, requested_at, received_at, latency,
+                                            exchange=self.config.get("exchange", {}).get("name"),
+                                            timeframe=self.timeframe, **fields)
+
+
+    def trade_plan(self, entry_tag: str | None) -> TradePlan:
+        """
+        Parsed and normalised trade plan of an entry tag, memoized per tag.
+        """
+        # Maximum SL in percent from self.stoploss (e.g. -0.05 -> 5.0)
+        return self.parse_tag(entry_tag, abs(self.stoploss) * 100.0)
+
+
     def leverage(self, pair: str, current_time: datetime, current_rate: float,
                  proposed_leverage: float, max_leverage: float, entry_tag: str | None, side: str,
                  **kwargs) -> float:
@@ -87,11 +336,8 @@ class BackendStrategy(IStrategy):
         :return: A leverage amount, which is between 1.0 and max_leverage.
         """
         if entry_tag:
-            try:
-                tag_data = json.loads(entry_tag)
-                custom_leverage = float(tag_data.get("leverage", proposed_leverage))
-            except Exception as e:
-                logger.error(f"Error parsing leverage entry_tag: {e}")
+            custom_leverage = self.trade_plan(entry_tag).leverage
+            if custom_leverage is None:
                 custom_leverage = proposed_leverage
         else:
             logger.warning("leverage entry_tag not set")
@@ -121,28 +367,10 @@ class BackendStrategy(IStrategy):
         :return float: New stoploss value, relative to the current_rate
         """
         if after_fill and trade.enter_tag:
-            try:
-                tag_data = json.loads(trade.enter_tag)
-                sl = tag_data.get("stoploss")
-                if sl is not None:
-                    val = float(sl)
-                    # Maximum SL in percent from self.stoploss (e.g. -0.05 -> 5.0)
-                    max_sl_pct = abs(self.stoploss) * 100.0
-                    # Only normalize if val > max_sl_pct
-                    if val > max_sl_pct:
-                        # If decimal places, limit directly to max.
-                        if not val.is_integer():
-                            val = max_sl_pct
-                        else:
-                            # Integer: divide by the appropriate power of 10
-                            digits = len(str(int(val)))
-                            corrected = val / (10 ** (digits - 1))
-                            val = corrected if corrected <= max_sl_pct else max_sl_pct
-                    # Round cleanly to 4 decimal places in percent fractions
-                    stop_pct = round(val / 100.0, 4)
-                    return -stop_pct
-            except Exception as e:
-                logger.error(f"Error parsing trade.enter_tag: {e}")
+            # Normalised (and clamped to self.stoploss) when the tag was parsed
+            stoploss = self.trade_plan(trade.enter_tag).stoploss
+            if stoploss is not None:
+                return -stoploss
 
         return None
 
@@ -153,16 +381,7 @@ class BackendStrategy(IStrategy):
         Custom entry price.
         """
         if entry_tag:
-            try:
-                tag_data = json.loads(entry_tag)
-                entry_price = float(tag_data.get("price", proposed_rate))
-                if side == "long" and entry_price > proposed_rate:
-                    entry_price = proposed_rate
-                elif side == "short" and entry_price < proposed_rate:
-                    entry_price = proposed_rate
-            except Exception as e:
-                logger.error(f"Error parsing price entry_tag: {e}")
-                entry_price = proposed_rate
+            entry_price = float(clamp_entry_price(self.trade_plan(entry_tag).price, proposed_rate, side == "long"))
         else:
             logger.warning("price entry_tag not set")
             entry_price = proposed_rate
@@ -175,18 +394,11 @@ class BackendStrategy(IStrategy):
         """
         Closes the trade individually based on the "takeProfit" value from the trade.enter_tag
         """
-        target_roi = None
-
-        if trade.enter_tag:
-            try:
-                tag_data = json.loads(trade.enter_tag)
-                target_roi = tag_data.get("takeProfit")
-            except Exception as e:
-                logger.error(f"Error parsing enter_tag: {e}")
+        target_roi = self.trade_plan(trade.enter_tag).takeProfit
 
         if target_roi is not None:
             # If the current profit is greater than or equal to target_roi, close the trade
-            if current_profit >= (target_roi / 100):
+            if take_profit_reached(current_profit, target_roi):
                 return True
 
         return False
@@ -194,35 +406,60 @@ class BackendStrategy(IStrategy):
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
-        A placeholder method for populating indicators.
+        Populates indicators with the NumPy indicator engine shared with chart_tools (no TA-Lib needed).
+
+        In live/dry-run mode only candles that are new since the last call are computed (per pair),
+        backtesting and hyperopt compute the whole dataframe at once.
         """
-        #dataframe['rsi_period_14_close'] = ta.RSI(dataframe, timeperiod=14, price='close')
-        #dataframe['sma_period_20_close'] = ta.SMA(dataframe, timeperiod=20, price='close')
-        #dataframe['sma_period_50_close'] = ta.SMA(dataframe, timeperiod=50, price='close')
+        if self.is_live():
+            return self.indicator_cache.update(metadata['pair'], dataframe)
+
+        close = dataframe['close'].to_numpy(dtype=float)
+        dataframe['rsi_period_14_close'] = indicators.rsi(close, 14)
+        dataframe['sma_period_20_close'] = indicators.sma(close, 20)
+        dataframe['sma_period_50_close'] = indicators.sma(close, 50)
         return dataframe
 
 
+    def current_trade_plan(self, dataframe: DataFrame, metadata: dict) -> dict | None:
+        """
+        Trade plan for the last candle of dataframe: read from the poller's store if polling
+        is enabled, else the plan prefetched in bot_loop_start, else requested once per candle.
+        """
+        pair = metadata['pair']
+        if self.trade_plan_poller is not None:
+            found, signal, age = self.trade_plan_poller.store.get(pair, self.trade_plan_max_age)
+            if not found:
+                logger.info(f"No current trade plan for {pair} (age: {age})")
+                return None
+            return None if self.is_trade_active(pair) else signal
+
+        candle = dataframe['date'].iloc[-1] if 'date' in dataframe and len(dataframe) else None
+        found, signal = self.trade_plan_prefetcher.get(pair, candle)
+        if found:
+            return signal
+        if candle is None:
+            return self.send_trade_signal(metadata)
+        return self.trade_plan_cache.get_or_fetch((pair, self.timeframe, candle), lambda: self.send_trade_signal(metadata))
+
+
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
         Determines entry signals based on external trade signals.
         """
+        if self.trade_plan_replay is not None and not self.is_live():
+            return self.trade_plan_replay.populate_entry_trend(
+                dataframe, metadata['pair'], timeframe_to_seconds(self.timeframe))
 
         # Initialize entry signal columns
         dataframe['enter_long'] = 0
         dataframe['enter_short'] = 0
 
-        signal = self.send_trade_signal(metadata)
+        signal = self.current_trade_plan(dataframe, metadata)
         if signal is None:
             return dataframe
 
-        tag = json.dumps({
-            "id": signal.get('id'),
-            "price": signal.get('entryPoint'),
-            "stoploss": signal.get("stoploss"),
-            "takeProfit": signal.get("takeProfit"),
-            "leverage": signal.get("leverage"),
-            "pos": signal.get("probabilityOfSuccess")
-        })
+        tag = plan_tag(signal)
 
         if signal.get('direction') == "long":
             dataframe.loc[dataframe.index[-1], ['enter_long', 'enter_tag']] = (1, tag)
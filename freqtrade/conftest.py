@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The strategy imports the chart_tools package from the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from trade_plan_stub import TradePlanStub  # noqa: E402
+
+
+@pytest.fixture
+def trade_plan_server():
+    with TradePlanStub() as stub:
+        yield stub
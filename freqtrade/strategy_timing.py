@@ -0,0 +1,138 @@
+import functools
+import inspect
+import logging
+import threading
+import time
+import types
+from collections import defaultdict, deque
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Strategy methods timed when timing is enabled
+TIMED_METHODS = (
+    "populate_indicators", "populate_entry_trend", "send_trade_signal", "is_trade_active",
+    "custom_exit", "custom_stoploss", "leverage", "custom_entry_price",
+)
+
+
+class TimingRegistry:
+    """
+    In-process latency registry: call counts, total time and the last window
+    durations per (method, pair), from which p50/p95/p99 are computed.
+    """
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self.samples: dict = defaultdict(lambda: deque(maxlen=self.window))
+        self.counts: dict = defaultdict(int)
+        self.totals: dict = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, pair: str | None, seconds: float):
+        key = (method, pair or "")
+        with self._lock:
+            self.samples[key].append(seconds)
+            self.counts[key] += 1
+            self.totals[key] += seconds
+
+    def stats(self, by_pair: bool = True) -> dict:
+        """
+        :return: dict of (method, pair) (or method if not by_pair) ->
+                 {"count", "sum", "p50", "p95", "p99"} in seconds
+        """
+        with self._lock:
+            items = [(key, list(self.samples[key]), self.counts[key], self.totals[key]) for key in self.samples]
+        groups = defaultdict(lambda: ([], 0, 0.0))
+        for key, samples, count, total in items:
+            group = key if by_pair else key[0]
+            values, n, s = groups[group]
+            groups[group] = (values + samples, n + count, s + total)
+
+        stats = {}
+        for group, (values, count, total) in groups.items():
+            quantiles = np.quantile(values, QUANTILES) if values else [np.nan] * len(QUANTILES)
+            stats[group] = {"count": count, "sum": total,
+                            **{f"p{round(q * 100)}": float(v) for q, v in zip(QUANTILES, quantiles)}}
+        return stats
+
+    def prometheus(self, metric: str = "strategy_callback_seconds") -> str:
+        """
+        Prometheus text exposition (summary per method and pair).
+        """
+        lines = [f"# HELP {metric} Duration of strategy callbacks.", f"# TYPE {metric} summary"]
+        for (method, pair), values in sorted(self.stats().items()):
+            labels = f'method="{method}",pair="{pair}"'
+            for q in QUANTILES:
+                lines.append(f'{metric}{{{labels},quantile="{q}"}} {values[f"p{round(q * 100)}"]:.9f}')
+            lines.append(f"{metric}_sum{{{labels}}} {values['sum']:.9f}")
+            lines.append(f"{metric}_count{{{labels}}} {values['count']}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """
+        One line per method, aggregated over all pairs.
+        """
+        return "\n".join(
+            f"{method}: n={values['count']} p50={values['p50'] * 1000:.2f}ms "
+            f"p95={values['p95'] * 1000:.2f}ms p99={values['p99'] * 1000:.2f}ms"
+            for method, values in sorted(self.stats(by_pair=False).items())
+        )
+
+    def reset(self):
+        with self._lock:
+            self.samples.clear()
+            self.counts.clear()
+            self.totals.clear()
+
+
+def _pair(args, kwargs) -> str | None:
+    """
+    Pair of a strategy callback call: the pair argument or metadata["pair"].
+    """
+    if "pair" in kwargs:
+        return kwargs["pair"]
+    if "metadata" in kwargs:
+        return kwargs["metadata"].get("pair")
+    for arg in args[:2]:
+        if isinstance(arg, str):
+            return arg
+        if isinstance(arg, dict):
+            return arg.get("pair")
+    return None
+
+
+def timed(registry: TimingRegistry, method: str, func):
+    """
+    Wraps func so every call is observed in registry. A bound method gives a
+    bound method again with the original signature: freqtrade inspects the
+    callback arguments (getfullargspec, which ignores __wrapped__), e.g. to
+    decide whether custom_stoploss is called with after_fill.
+    """
+    target = getattr(func, "__func__", func)
+    owner = getattr(func, "__self__", None)
+    skip = 0 if owner is None else 1
+
+    @functools.wraps(target)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return target(*args, **kwargs)
+        finally:
+            registry.observe(method, _pair(args[skip:], kwargs), time.perf_counter() - start)
+
+    wrapper.__signature__ = inspect.signature(target)
+    return wrapper if owner is None else types.MethodType(wrapper, owner)
+
+
+def instrument(obj, registry: TimingRegistry, methods=TIMED_METHODS):
+    """
+    Replaces the given bound methods of obj by timed wrappers (instance
+    attributes, the class is untouched). Objects that are not instrumented pay
+    nothing.
+    """
+    for method in methods:
+        setattr(obj, method, timed(registry, method, getattr(obj, method)))
@@ -1,17 +1,26 @@
 import json
+import numpy as np
+import pandas as pd
 import pytest
-from datetime import datetime
+import requests
+from datetime import datetime, timezone
+import backend_strategy
 from backend_strategy import BackendStrategy
+import trade_plan_client
+from trade_plan_client import TradePlanClient
+from trade_plan_prefetch import TradePlanPrefetcher, latency_histogram
 from pathlib import Path
 
+# The example config next to the strategy, independent of the working directory
+CONFIG_PATH = Path(__file__).resolve().parent / "config.json"
+
 class DummyTrade:
     def __init__(self, enter_tag):
         self.enter_tag = enter_tag
 
 @pytest.fixture
 def strategy():
-    config_path = Path("config.json")
-    with config_path.open() as f:
+    with CONFIG_PATH.open() as f:
         config = json.load(f)
     return BackendStrategy(config)
 
@@ -132,3 +141,581 @@ def test_custom_exit_target_not_reached(strategy):
         current_profit=0.03 # 3% profit
     )
     assert result is False # Trade to continue
+
+def test_populate_indicators(strategy):
+    close = np.linspace(100.0, 200.0, 60)
+    dataframe = pd.DataFrame({"open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 1.0})
+    result = strategy.populate_indicators(dataframe, {"pair": "BTC/USDT"})
+    assert np.isnan(result['sma_period_50_close'].iloc[48])
+    assert result['sma_period_50_close'].iloc[-1] == pytest.approx(close[-50:].mean())
+    assert result['rsi_period_14_close'].iloc[-1] == pytest.approx(100.0)
+
+def test_populate_indicators_incremental_matches_full(strategy):
+    from freqtrade.enums import RunMode
+    rng = np.random.default_rng(1)
+    close = 100 + np.cumsum(rng.normal(0, 1, 300))
+    candles = pd.DataFrame({
+        "date": pd.date_range("2025-01-01", periods=300, freq="5min", tz="UTC"),
+        "open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 1.0,
+    })
+    expected = strategy.populate_indicators(candles.copy(), {"pair": "BTC/USDT"})
+
+    strategy.config['runmode'] = RunMode.DRY_RUN
+    for end in range(250, 301):
+        result = strategy.populate_indicators(candles.iloc[:end].copy(), {"pair": "BTC/USDT"})
+    assert strategy.indicator_cache.full_recomputes == 1
+    for column in ('rsi_period_14_close', 'sma_period_20_close', 'sma_period_50_close'):
+        np.testing.assert_allclose(result[column], expected[column], rtol=1e-9, equal_nan=True)
+
+class FakeResponse:
+    def __init__(self, status_code=200, data=None):
+        self.status_code = status_code
+        self._data = data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code}", response=self)
+
+    def json(self):
+        return self._data
+
+class FakeSession:
+    """Returns the queued responses (or raises queued exceptions) in order."""
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    def post(self, url, json=None, timeout=None):
+        self.calls.append((url, json, timeout))
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(trade_plan_client.time, "sleep", lambda seconds: None)
+
+def test_trade_plan_client_from_config(strategy):
+    client = strategy.trade_plan_client
+    assert client.url == "http://trading-server:3000/api/v1/trading/tradePlan"
+    assert client.timeout == (3.05, 10.0)
+    assert client.retries == 2
+    assert client.circuit_breaker.failure_threshold == 5
+
+def test_trade_plan_client_retries_then_succeeds(no_sleep):
+    client = TradePlanClient("http://stub", retries=2)
+    client.session = FakeSession(
+        requests.exceptions.ConnectionError("refused"),
+        FakeResponse(503),
+        FakeResponse(200, {"direction": "long"}),
+    )
+    assert client.post({"pair": "BTC/USDT"}) == {"direction": "long"}
+    assert len(client.session.calls) == 3
+    assert client.session.calls[0][2] == client.timeout
+    assert client.circuit_breaker.state == "closed"
+
+def test_trade_plan_client_does_not_retry_client_errors(no_sleep):
+    client = TradePlanClient("http://stub", retries=2)
+    client.session = FakeSession(FakeResponse(400))
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.post({})
+    assert len(client.session.calls) == 1
+    assert client.circuit_breaker.failures == 0
+
+def test_trade_plan_client_does_not_retry_read_timeouts(no_sleep):
+    client = TradePlanClient("http://stub", retries=2)
+    client.session = FakeSession(requests.exceptions.ReadTimeout("hung"), FakeResponse(200, {}))
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.post({})
+    assert len(client.session.calls) == 1
+    assert client.circuit_breaker.failures == 1
+
+def test_circuit_breaker_counts_every_attempt(no_sleep):
+    client = TradePlanClient("http://stub", retries=5, failure_threshold=3)
+    client.session = FakeSession(*[requests.exceptions.ConnectionError("refused")] * 6)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.post({})
+    # The circuit opens during the first call instead of after three candles
+    assert len(client.session.calls) == 3
+    assert client.circuit_breaker.state == "open"
+
+def test_trade_plan_client_backoff_is_bounded():
+    client = TradePlanClient("http://stub", backoff_factor=1.0, backoff_max=3.0)
+    assert all(0 <= client.backoff(attempt) <= 3.0 for attempt in range(1, 10))
+
+def test_circuit_breaker_opens_and_recovers(no_sleep, monkeypatch):
+    client = TradePlanClient("http://stub", retries=0, failure_threshold=2, reset_timeout=30)
+    client.session = FakeSession(*[requests.exceptions.Timeout("slow")] * 2, FakeResponse(200, {}))
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.Timeout):
+            client.post({})
+    assert client.circuit_breaker.state == "open"
+    with pytest.raises(trade_plan_client.CircuitOpenError):
+        client.post({})
+    assert len(client.session.calls) == 2
+
+    # After reset_timeout one trial request is let through
+    now = trade_plan_client.time.monotonic()
+    monkeypatch.setattr(trade_plan_client.time, "monotonic", lambda: now + 31)
+    assert client.post({}) == {}
+    assert client.circuit_breaker.state == "closed"
+
+def test_send_trade_signal_returns_none_on_error(strategy, monkeypatch, no_sleep):
+    monkeypatch.setattr(strategy, "is_trade_active", lambda pair: False)
+    strategy.trade_plan_client.session = FakeSession(*[requests.exceptions.ConnectionError("down")] * 3)
+    assert strategy.send_trade_signal({"pair": "BTC/USDT"}) is None
+
+def test_latency_histogram():
+    summary = latency_histogram([0.05, 0.2, 0.3, 0.7, 1.2, 9.0])
+    assert summary.startswith("n=6 ")
+    assert "<100ms:1 <250ms:1 <500ms:1 <1000ms:1 <2500ms:1 <5000ms:0 >=5000ms:1" in summary
+    assert latency_histogram([]) == "n=0"
+
+def test_prefetcher_fetches_concurrently_once_per_candle():
+    import threading
+    barrier = threading.Barrier(4, timeout=5)
+    calls = []
+
+    def fetch(pair):
+        calls.append(pair)
+        barrier.wait()  # only passes if all four requests run at the same time
+        return {"pair": pair}
+
+    prefetcher = TradePlanPrefetcher(max_workers=4)
+    candle = datetime(2025, 1, 1, 0, 5)
+    pairs = ["A", "B", "C", "D", "E"]
+    plans = prefetcher.prefetch(candle, pairs, fetch, skip={"E"})
+    assert plans == {"A": {"pair": "A"}, "B": {"pair": "B"}, "C": {"pair": "C"}, "D": {"pair": "D"}, "E": None}
+    assert prefetcher.get("E", candle) == (True, None)
+    assert prefetcher.get("A", datetime(2025, 1, 1, 0, 10)) == (False, None)
+
+    prefetcher.prefetch(candle, pairs, fetch)
+    assert sorted(calls) == ["A", "B", "C", "D"]
+    prefetcher.shutdown()
+
+class DummyDataProvider:
+    def __init__(self, pairs):
+        self.pairs = pairs
+
+    def current_whitelist(self):
+        return self.pairs
+
+def test_populate_entry_trend_uses_prefetched_plan(strategy, monkeypatch):
+    from freqtrade.enums import RunMode
+    strategy.config['runmode'] = RunMode.DRY_RUN
+    strategy.dp = DummyDataProvider(["BTC/USDT", "ETH/USDT"])
+    monkeypatch.setattr(backend_strategy.Trade, "get_open_trades", lambda: [])
+    monkeypatch.setattr(strategy, "request_trade_plan",
+                        lambda pair: {"id": pair, "direction": "long", "entryPoint": 100.0})
+    strategy.bot_loop_start(current_time=datetime(2025, 1, 1, 0, 12, tzinfo=timezone.utc))
+
+    def no_request(metadata):
+        raise AssertionError("plan should have been prefetched")
+    monkeypatch.setattr(strategy, "send_trade_signal", no_request)
+
+    dataframe = pd.DataFrame({"date": pd.date_range("2025-01-01 00:00", periods=2, freq="5min", tz="UTC")})
+    result = strategy.populate_entry_trend(dataframe, {"pair": "ETH/USDT"})
+    assert result['enter_long'].iloc[-1] == 1
+    assert json.loads(result['enter_tag'].iloc[-1])["id"] == "ETH/USDT"
+    strategy.trade_plan_prefetcher.shutdown()
+
+def _live_strategy(strategy, monkeypatch, server, pairs, batch):
+    from freqtrade.enums import RunMode
+    strategy.config['runmode'] = RunMode.DRY_RUN
+    strategy.dp = DummyDataProvider(pairs)
+    strategy.trade_plan_client.url = server.url
+    strategy.trade_plan_batch = batch
+    monkeypatch.setattr(backend_strategy.Trade, "get_open_trades", lambda: [])
+    return strategy
+
+def test_prefetch_batch_mode(strategy, monkeypatch, trade_plan_server):
+    pairs = ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
+    _live_strategy(strategy, monkeypatch, trade_plan_server, pairs, batch=True)
+    strategy.bot_loop_start(current_time=datetime(2025, 1, 1, 0, 12, tzinfo=timezone.utc))
+
+    assert trade_plan_server.requests == [{"exchange": strategy.config["exchange"]["name"], "timeframe": "5m", "pairs": pairs}]
+    for pair in pairs:
+        assert strategy.trade_plan_prefetcher.get(pair, strategy.trade_plan_prefetcher.candle) == (
+            True, trade_plan_server.plan(pair))
+    assert strategy.trade_plan_batch
+    strategy.trade_plan_prefetcher.shutdown()
+
+def test_prefetch_batch_falls_back_to_single_requests(strategy, monkeypatch, trade_plan_server):
+    trade_plan_server.batch = False
+    pairs = ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
+    _live_strategy(strategy, monkeypatch, trade_plan_server, pairs, batch=True)
+    strategy.bot_loop_start(current_time=datetime(2025, 1, 1, 0, 12, tzinfo=timezone.utc))
+
+    assert "pairs" in trade_plan_server.requests[0]
+    assert sorted(r["pair"] for r in trade_plan_server.requests[1:]) == pairs
+    assert strategy.trade_plan_prefetcher.plans == {pair: trade_plan_server.plan(pair) for pair in pairs}
+    assert not strategy.trade_plan_batch
+
+    # The next candle goes straight to per-pair requests
+    strategy.bot_loop_start(current_time=datetime(2025, 1, 1, 0, 17, tzinfo=timezone.utc))
+    assert len(trade_plan_server.requests) == 7
+    strategy.trade_plan_prefetcher.shutdown()
+
+def test_request_trade_plans_matches_by_position(strategy, monkeypatch):
+    monkeypatch.setattr(strategy.trade_plan_client, "post", lambda payload, url=None: [{"id": 1}, None])
+    assert strategy.request_trade_plans(["BTC/USDT", "ETH/USDT"]) == {"BTC/USDT": {"id": 1}, "ETH/USDT": None}
+
+def test_trade_plan_cache_lru_and_ttl(monkeypatch):
+    from trade_plan_cache import TradePlanCache
+    import trade_plan_cache
+    now = [0.0]
+    monkeypatch.setattr(trade_plan_cache.time, "monotonic", lambda: now[0])
+    cache = TradePlanCache(max_size=2, ttl=300)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)  # evicts "b", the least recently used
+    assert cache.get("b") is None
+    now[0] = 301.0
+    assert cache.get("a") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_populate_entry_trend_requests_once_per_candle(strategy, monkeypatch):
+    calls = []
+
+    def send(metadata):
+        calls.append(metadata['pair'])
+        return None
+    monkeypatch.setattr(strategy, "send_trade_signal", send)
+    dates = pd.date_range("2025-01-01 00:00", periods=3, freq="5min", tz="UTC")
+    for _ in range(3):
+        strategy.populate_entry_trend(pd.DataFrame({"date": dates[:2]}), {"pair": "BTC/USDT"})
+    strategy.populate_entry_trend(pd.DataFrame({"date": dates}), {"pair": "BTC/USDT"})
+    assert calls == ["BTC/USDT", "BTC/USDT"]
+    assert (strategy.trade_plan_cache.hits, strategy.trade_plan_cache.misses) == (2, 2)
+
+class OpenTrade:
+    def __init__(self, pair):
+        self.pair = pair
+
+def test_is_trade_active_queries_once_per_loop(strategy, monkeypatch):
+    trades = [OpenTrade("BTC/USDT")]
+    queries = []
+
+    def get_open_trades():
+        queries.append(1)
+        return list(trades)
+    monkeypatch.setattr(backend_strategy.Trade, "get_open_trades", get_open_trades)
+
+    strategy.bot_loop_start(current_time=datetime(2025, 1, 1, 0, 12, tzinfo=timezone.utc))
+    assert all(strategy.is_trade_active("BTC/USDT") for _ in range(10))
+    assert not strategy.is_trade_active("ETH/USDT")
+    assert len(queries) == 1
+
+    trades.append(OpenTrade("ETH/USDT"))
+    assert strategy.confirm_trade_entry("ETH/USDT", "limit", 1.0, 100.0, "GTC", datetime.now(), None, "long")
+    assert strategy.is_trade_active("ETH/USDT")
+    trades.clear()
+    assert strategy.confirm_trade_exit("ETH/USDT", OpenTrade("ETH/USDT"), "limit", 1.0, 100.0, "GTC", "roi", datetime.now())
+    assert not strategy.is_trade_active("ETH/USDT")
+    assert len(queries) == 3
+
+def test_trade_plan_cache_stats_logged_once_per_candle(strategy, monkeypatch, caplog):
+    from freqtrade.enums import RunMode
+    monkeypatch.setattr(backend_strategy.Trade, "get_open_trades", lambda: [])
+    strategy.config['runmode'] = RunMode.DRY_RUN
+    strategy.dp = None
+    strategy.trade_plan_cache.get_or_fetch(("BTC/USDT", "5m", 1), lambda: None)
+    strategy.trade_plan_cache.get_or_fetch(("BTC/USDT", "5m", 1), lambda: None)
+    caplog.set_level("INFO", logger=backend_strategy.logger.name)
+    for minute in (12, 13, 17):
+        strategy.bot_loop_start(current_time=datetime(2025, 1, 1, 0, minute, tzinfo=timezone.utc))
+    reports = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Trade plan cache")]
+    assert reports == ["Trade plan cache: size=1/256 hits=1 misses=1 hit_ratio=0.50"] * 2
+
+def test_trade_plan_parsed_once_per_tag(strategy, monkeypatch):
+    import trade_plan
+    tag = json.dumps({"id": 7, "price": 98.0, "stoploss": 125, "takeProfit": 5, "leverage": 3, "pos": 0.6})
+    plan = strategy.trade_plan(tag)
+    assert plan == trade_plan.TradePlan(id=7, price=98.0, stoploss=0.0125, takeProfit=0.05, leverage=3.0, pos=0.6)
+
+    def no_parse(*args, **kwargs):
+        raise AssertionError("tag should not be parsed again")
+    monkeypatch.setattr(trade_plan.json, "loads", no_parse)
+    assert strategy.trade_plan(tag) is plan
+    assert strategy.leverage("BTC/USDT", datetime.now(), 100.0, 1.0, 10.0, tag, "long") == 3.0
+    assert strategy.custom_entry_price("BTC/USDT", None, datetime.now(), 100.0, tag, "long") == 98.0
+    assert strategy.custom_stoploss("BTC/USDT", DummyTrade(tag), datetime.now(), 100.0, 0.0, True) == -0.0125
+    assert strategy.custom_exit("BTC/USDT", DummyTrade(tag), datetime.now(), 100.0, 0.05) is True
+
+def test_tag_cache_sized_from_max_open_trades():
+    with CONFIG_PATH.open() as f:
+        config = json.load(f)
+    assert BackendStrategy(config).parse_tag.cache_info().maxsize == 1024
+    assert BackendStrategy({**config, "max_open_trades": 5000}).parse_tag.cache_info().maxsize == 10000
+    # Unlimited open trades still get a bounded cache
+    for unlimited in (-1, float("inf")):
+        assert BackendStrategy({**config, "max_open_trades": unlimited}).parse_tag.cache_info().maxsize == 4096
+    server = {**config["trade_plan_server"], "tag_cache_size": 50}
+    assert BackendStrategy({**config, "trade_plan_server": server}).parse_tag.cache_info().maxsize == 50
+
+def test_tag_cache_keeps_all_open_trades():
+    with CONFIG_PATH.open() as f:
+        config = json.load(f)
+    strategy = BackendStrategy({**config, "max_open_trades": 1500})
+    tags = [json.dumps({"id": i, "takeProfit": 5}) for i in range(1500)]
+    for _ in range(2):
+        for tag in tags:
+            strategy.trade_plan(tag)
+    assert strategy.parse_tag.cache_info().misses == len(tags)
+
+def test_trade_plan_invalid_tag_falls_back(strategy):
+    assert strategy.leverage("BTC/USDT", datetime.now(), 100.0, 2.0, 10.0, "not json", "long") == 2.0
+    assert strategy.custom_entry_price("BTC/USDT", None, datetime.now(), 100.0, '{"price": "n/a"}', "long") == 100.0
+    assert strategy.custom_exit("BTC/USDT", DummyTrade('["takeProfit"]'), datetime.now(), 100.0, 0.5) is False
+
+def test_trade_plan_store_staleness(monkeypatch):
+    import trade_plan_poller
+    from trade_plan_poller import TradePlanStore
+    monkeypatch.setattr(trade_plan_poller.time, "time", lambda: 1000.0)
+    store = TradePlanStore()
+    store.update({"BTC/USDT": {"id": 1}}, fetched_at=990.0)
+    store.update({"ETH/USDT": {"id": 2}}, fetched_at=700.0)
+    assert store.staleness() == {"BTC/USDT": 10.0, "ETH/USDT": 300.0}
+    assert store.get("BTC/USDT", max_age=60) == (True, {"id": 1}, 10.0)
+    assert store.get("ETH/USDT", max_age=60) == (False, None, 300.0)
+    assert store.get("SOL/USDT") == (False, None, None)
+    assert store.staleness_summary(max_age=60) == "pairs=2 median=155.0s max=300.0s (ETH/USDT) stale=1"
+
+def test_poller_logs_staleness_per_pair(monkeypatch, caplog):
+    import trade_plan_poller
+    from trade_plan_poller import TradePlanPoller
+    monkeypatch.setattr(trade_plan_poller.time, "time", lambda: 1000.0)
+    poller = TradePlanPoller(pairs=lambda: [], fetch_all=lambda pairs: ({}, [], False), max_age=60)
+    poller.store.update({"BTC/USDT": {"id": 1}}, fetched_at=990.0)
+    poller.store.update({"ETH/USDT": {"id": 2}}, fetched_at=700.0)
+    caplog.set_level("DEBUG", logger=trade_plan_poller.logger.name)
+    poller.poll()
+    messages = [r.getMessage() for r in caplog.records]
+    assert "Trade plan of BTC/USDT fetched 10.0s ago" in messages
+    assert "Trade plan of ETH/USDT fetched 300.0s ago" in messages
+    assert [r.getMessage() for r in caplog.records if r.levelname == "WARNING"] == ["Trade plans older than 60s: ETH/USDT"]
+
+def test_poller_fills_store_in_background(strategy, monkeypatch, trade_plan_server):
+    import time
+    pairs = ["BTC/USDT", "ETH/USDT"]
+    _live_strategy(strategy, monkeypatch, trade_plan_server, pairs, batch=False)
+    strategy.trade_plan_poll_interval = 0.05
+    strategy.bot_start()
+    try:
+        deadline = time.monotonic() + 5
+        while strategy.trade_plan_poller.rounds < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert strategy.trade_plan_poller.rounds >= 2
+        # bot_loop_start leaves the requests to the poller
+        requests_before = len(trade_plan_server.requests)
+        strategy.bot_loop_start(current_time=datetime(2025, 1, 1, 0, 12, tzinfo=timezone.utc))
+        assert strategy.trade_plan_prefetcher.candle is None
+    finally:
+        strategy.trade_plan_poller.stop()
+        strategy.trade_plan_prefetcher.shutdown()
+    assert requests_before >= 4
+
+    def no_request(metadata):
+        raise AssertionError("callbacks should only read the plan store")
+    monkeypatch.setattr(strategy, "send_trade_signal", no_request)
+    dataframe = pd.DataFrame({"date": pd.date_range("2025-01-01 00:00", periods=2, freq="5min", tz="UTC")})
+    result = strategy.populate_entry_trend(dataframe, {"pair": "ETH/USDT"})
+    assert json.loads(result['enter_tag'].iloc[-1])["id"] == "ETH/USDT"
+    assert strategy.trade_plan_poller.store.staleness().keys() == set(pairs)
+
+def test_poller_clears_withdrawn_plans(strategy, monkeypatch):
+    from trade_plan_poller import TradePlanPoller
+    answers = {"BTC/USDT": {"id": 1, "direction": "long"}, "ETH/USDT": {"id": 2, "direction": "short"}}
+
+    def post(payload, url=None):
+        if payload["pair"] in answers:
+            return answers[payload["pair"]]
+        raise requests.exceptions.ConnectionError("backend down")
+    monkeypatch.setattr(strategy.trade_plan_client, "post", post)
+    poller = TradePlanPoller(lambda: ["BTC/USDT", "ETH/USDT"], strategy.fetch_trade_plans, max_age=60)
+    poller.poll()
+    assert poller.store.get("BTC/USDT", 60)[:2] == (True, {"id": 1, "direction": "long"})
+
+    # The backend withdraws the BTC plan, the ETH request fails and keeps its last plan
+    answers = {"BTC/USDT": None}
+    poller.poll()
+    assert poller.store.get("BTC/USDT", 60)[:2] == (True, None)
+    assert poller.store.get("ETH/USDT", 60)[:2] == (True, {"id": 2, "direction": "short"})
+
+    # A batch answer that leaves a pair out withdraws its plan as well
+    strategy.trade_plan_batch = True
+    monkeypatch.setattr(strategy.trade_plan_client, "post",
+                        lambda payload, url=None: [{"pair": "BTC/USDT", "id": 3, "direction": "long"}])
+    poller.poll()
+    assert poller.store.get("BTC/USDT", 60)[:2] == (True, {"pair": "BTC/USDT", "id": 3, "direction": "long"})
+    assert poller.store.get("ETH/USDT", 60)[:2] == (True, None)
+    strategy.trade_plan_prefetcher.shutdown()
+
+def test_poller_max_age_defaults_to_two_rounds(strategy, monkeypatch, trade_plan_server):
+    _live_strategy(strategy, monkeypatch, trade_plan_server, ["BTC/USDT"], batch=False)
+    strategy.trade_plan_poll_interval = 30
+    strategy.bot_start()
+    strategy.trade_plan_poller.stop()
+    strategy.trade_plan_prefetcher.shutdown()
+    assert strategy.trade_plan_max_age == strategy.trade_plan_poller.max_age == 60
+
+def test_replay_recorded_plans(strategy, tmp_path):
+    from trade_plan_replay import TradePlanReplay
+    long_plan = {"id": 1, "direction": "long", "entryPoint": 100.0, "stoploss": 2, "takeProfit": 4,
+                 "leverage": 3, "probabilityOfSuccess": 0.7}
+    records = [
+        # requested after the 00:05 candle closed -> row 00:05
+        {"pair": "BTC/USDT", "requested_at": "2025-01-01T00:10:02Z", "plan": long_plan},
+        {"pair": "BTC/USDT", "requested_at": "2025-01-01T00:20:01Z", "plan": {"id": 2, "direction": "short"}},
+        {"pair": "BTC/USDT", "requested_at": "2025-01-01T00:25:01Z", "plan": None},
+        {"pair": "ETH/USDT", "requested_at": "2025-01-01T00:05:01Z", "plan": long_plan},
+    ]
+    path = tmp_path / "plans.jsonl"
+    path.write_text("\n".join(json.dumps(record) for record in records))
+
+    strategy.trade_plan_replay = TradePlanReplay.from_file(path)
+    dataframe = pd.DataFrame({"date": pd.date_range("2025-01-01 00:00", periods=6, freq="5min", tz="UTC")})
+    result = strategy.populate_entry_trend(dataframe, {"pair": "BTC/USDT"})
+
+    assert result['enter_long'].tolist() == [0, 1, 0, 0, 0, 0]
+    assert result['enter_short'].tolist() == [0, 0, 0, 1, 0, 0]
+    assert json.loads(result['enter_tag'].iloc[1]) == {"id": 1, "price": 100.0, "stoploss": 2, "takeProfit": 4,
+                                                       "leverage": 3, "pos": 0.7}
+    assert result['enter_tag'].iloc[[0, 2, 4, 5]].isna().all()
+
+    # The same plans from a flat Parquet file
+    flat = pd.DataFrame([{"pair": r["pair"], "time": r["requested_at"], **r["plan"]} for r in records if r["plan"]])
+    flat.to_parquet(tmp_path / "plans.parquet")
+    strategy.trade_plan_replay = TradePlanReplay.from_file(tmp_path / "plans.parquet")
+    result = strategy.populate_entry_trend(dataframe.copy(), {"pair": "BTC/USDT"})
+    assert result['enter_long'].tolist() == [0, 1, 0, 0, 0, 0]
+    assert result['enter_short'].tolist() == [0, 0, 0, 1, 0, 0]
+
+def test_recorder_writes_batches_in_background(tmp_path):
+    from trade_plan_recorder import TradePlanRecorder
+    recorder = TradePlanRecorder(tmp_path / "plans.jsonl", batch_size=3, flush_interval=60)
+    now = datetime(2025, 1, 1, 0, 10, 1, tzinfo=timezone.utc)
+    for i in range(7):
+        recorder.record("BTC/USDT", {"id": i}, now, now, 0.25)
+    recorder.close()
+    lines = [json.loads(line) for line in (tmp_path / "plans.jsonl").read_text().splitlines()]
+    assert [line["plan"]["id"] for line in lines] == list(range(7))
+    assert lines[0] == {"pair": "BTC/USDT", "requested_at": "2025-01-01T00:10:01+00:00",
+                        "received_at": "2025-01-01T00:10:01+00:00", "latency": 0.25, "plan": {"id": 0}}
+    assert recorder.written == 7
+
+def test_recorded_plans_can_be_replayed(strategy, tmp_path, trade_plan_server, monkeypatch):
+    from trade_plan_recorder import TradePlanRecorder
+    from trade_plan_replay import load_plans
+    strategy.trade_plan_client.url = trade_plan_server.url
+    strategy.trade_plan_recorder = TradePlanRecorder(tmp_path / "plans.jsonl")
+    monkeypatch.setattr(strategy.trade_plan_client, "retries", 0)
+    assert strategy.request_trade_plan("BTC/USDT") == trade_plan_server.plan("BTC/USDT")
+    assert strategy.request_trade_plans(["ETH/USDT", "SOL/USDT"]) == {
+        pair: trade_plan_server.plan(pair) for pair in ["ETH/USDT", "SOL/USDT"]}
+    trade_plan_server.server.shutdown()
+    trade_plan_server.server.server_close()
+    assert strategy.request_trade_plan("XRP/USDT") is None
+    strategy.trade_plan_recorder.close()
+
+    lines = [json.loads(line) for line in (tmp_path / "plans.jsonl").read_text().splitlines()]
+    assert [line["pair"] for line in lines] == ["BTC/USDT", "ETH/USDT", "SOL/USDT", "XRP/USDT"]
+    assert lines[1]["batch"] and lines[3]["plan"] is None and "error" in lines[3]
+    assert all(line["latency"] >= 0 and line["timeframe"] == "5m" for line in lines)
+    assert load_plans(tmp_path / "plans.jsonl")["pair"].tolist() == ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
+
+def test_timing_disabled_by_default(strategy):
+    assert strategy.timing is None
+    assert "custom_exit" not in vars(strategy)
+
+def test_timing_records_callbacks_per_pair(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend_strategy.Trade, "get_open_trades", lambda: [])
+    with CONFIG_PATH.open() as f:
+        config = json.load(f)
+    config["strategy_timing"] = {"enabled": True, "log_interval": 0,
+                                 "prometheus_file": str(tmp_path / "strategy.prom")}
+    strategy = BackendStrategy(config)
+    tag = json.dumps({"takeProfit": 5})
+    for pair in ["BTC/USDT", "ETH/USDT"]:
+        strategy.custom_exit(pair=pair, trade=DummyTrade(tag), current_time=datetime.now(),
+                             current_rate=100.0, current_profit=0.01)
+    strategy.leverage("BTC/USDT", datetime.now(), 100.0, 1.0, 10.0, tag, "long")
+
+    stats = strategy.timing.stats()
+    assert stats[("custom_exit", "BTC/USDT")]["count"] == 1
+    assert stats[("custom_exit", "ETH/USDT")]["count"] == 1
+    assert stats[("leverage", "BTC/USDT")]["p99"] >= 0
+    assert strategy.timing.stats(by_pair=False)["custom_exit"]["count"] == 2
+
+    strategy.bot_loop_start(current_time=datetime(2025, 1, 1, 0, 12, tzinfo=timezone.utc))
+    text = (tmp_path / "strategy.prom").read_text()
+    assert '# TYPE strategy_callback_seconds summary' in text
+    assert 'strategy_callback_seconds_count{method="custom_exit",pair="ETH/USDT"} 1' in text
+    assert 'strategy_callback_seconds{method="is_trade_active"' not in text
+    assert 'quantile="0.99"' in text
+
+def test_shadow_evaluator_matches_strategy_callbacks(strategy):
+    from trade_plan import plan_tag
+    from trade_plan_shadow import calibration, simulate, summary
+    dates = pd.date_range("2025-01-01 00:00", periods=10, freq="5min", tz="UTC")
+    ohlc = [(100, 100.5, 99.5, 100), (100, 100.2, 98.8, 99.5), (99.5, 100.5, 99, 100.2), (100.2, 101.8, 100, 101.5),
+            (101.5, 102, 101, 101.8), (101.8, 103, 101.5, 102.5)] + [(102.5, 102.6, 102.4, 102.5)] * 4
+    candles = pd.DataFrame(ohlc, columns=["open", "high", "low", "close"])
+    candles.insert(0, "date", dates)
+    plans = pd.DataFrame([
+        # limit entry at 99 below the open, filled in the same candle, takeProfit at the 00:15 close
+        {"pair": "BTC/USDT", "time": "2025-01-01T00:05:02Z", "id": 1, "direction": "long", "entryPoint": 99.0,
+         "stoploss": 2, "takeProfit": 4, "leverage": 2, "probabilityOfSuccess": 0.7},
+        # stoploss 125 is normalised to 1.25 % and hit at 00:25
+        {"pair": "BTC/USDT", "time": "2025-01-01T00:20:01Z", "id": 2, "direction": "short", "entryPoint": None,
+         "stoploss": 125, "takeProfit": 10, "leverage": 1, "probabilityOfSuccess": 0.4},
+        {"pair": "BTC/USDT", "time": "2025-01-01T00:30:00Z", "id": 3, "direction": "long", "entryPoint": 90.0,
+         "stoploss": 2, "takeProfit": 4, "leverage": 1, "probabilityOfSuccess": 0.9},
+        {"pair": "ETH/USDT", "time": "2025-01-01T00:05:00Z", "id": 4, "direction": "long", "entryPoint": 99.0,
+         "stoploss": 2, "takeProfit": 4, "leverage": 1, "probabilityOfSuccess": 0.5},
+    ])
+    plans["time"] = pd.to_datetime(plans["time"], utc=True).astype("datetime64[ns, UTC]")
+    plans = plans.astype({field: object for field in ("id", "entryPoint", "stoploss", "takeProfit", "leverage")})
+
+    results = simulate(plans, {"BTC/USDT": candles}, "5m", max_stoploss_pct=abs(strategy.stoploss) * 100)
+    assert results["outcome"].tolist() == ["take_profit", "stoploss", "unfilled", "no_data"]
+    assert results["exit_time"].iloc[0] == dates[3] and results["exit_time"].iloc[1] == dates[5]
+    assert results["r"].iloc[0] == pytest.approx((101.5 / 99 - 1) * 2 / 0.02)
+    assert results["r"].iloc[1] == pytest.approx(-1.0)
+
+    # Entry price and stop are what the strategy callbacks return for the same entry tags
+    for i, proposed in [(0, 100.0), (1, 101.5)]:
+        tag = plan_tag(plans.iloc[i].where(plans.iloc[i].notna(), None).to_dict())
+        side = plans["direction"].iloc[i]
+        assert results["entry_price"].iloc[i] == strategy.custom_entry_price(
+            "BTC/USDT", None, datetime.now(), proposed, tag, side)
+        assert -results["stoploss"].iloc[i] == strategy.custom_stoploss(
+            "BTC/USDT", DummyTrade(tag), datetime.now(), proposed, 0.0, True)
+        assert strategy.custom_exit("BTC/USDT", DummyTrade(tag), datetime.now(), proposed,
+                                    results["profit"].iloc[i]) == (results["outcome"].iloc[i] == "take_profit")
+
+    report = summary(results)
+    assert report["hit_rate"] == 0.5 and report["unfilled"] == 1 and report["no_data"] == 1
+    assert report["total_r"] == pytest.approx(results["r"].iloc[0] - 1.0)
+    assert report["brier"] == pytest.approx(((0.7 - 1) ** 2 + 0.4 ** 2) / 2)
+    bins = calibration(results, bins=5).set_index("bin")
+    assert bins.loc["0.6-0.8", "hit_rate"] == 1.0 and bins.loc["0.4-0.6", "hit_rate"] == 0.0
+
+def test_timing_keeps_callback_signatures(monkeypatch):
+    from inspect import getfullargspec
+    from freqtrade.resolvers.strategy_resolver import StrategyResolver
+    with CONFIG_PATH.open() as f:
+        config = json.load(f)
+    plain = BackendStrategy(config)
+    config["strategy_timing"] = {"enabled": True}
+    strategy = StrategyResolver.validate_strategy(BackendStrategy(config))
+
+    # freqtrade only calls custom_stoploss with after_fill=True if it sees the argument
+    assert strategy._ft_stop_uses_after_fill
+    for method in ("custom_stoploss", "custom_exit", "populate_indicators", "leverage"):
+        assert getfullargspec(getattr(strategy, method)).args == getfullargspec(getattr(plain, method)).args
+    assert strategy.custom_stoploss("BTC/USDT", DummyTrade('{"stoploss": 2.5}'), datetime.now(), 100.0, 0.0,
+                                    True) == -0.025
+    assert strategy.timing.stats()[("custom_stoploss", "BTC/USDT")]["count"] == 1
@@ -0,0 +1,134 @@
+import json
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Tags memoized by a strategy whose max_open_trades is unlimited
+UNLIMITED_TAG_CACHE_SIZE = 4096
+
+
+def normalise_stoploss(value: float, max_stoploss_pct: float) -> float:
+    """
+    Stop distance in percent from the backend, clamped to max_stoploss_pct.
+    Integer values above the maximum are assumed to have lost their decimal
+    point (e.g. 125 -> 1.25) and are divided by the matching power of 10.
+
+    :return: stop distance as ratio, rounded to 4 decimals (e.g. 0.025 for 2.5 %)
+    """
+    if value > max_stoploss_pct:
+        # If decimal places, limit directly to max.
+        if not value.is_integer():
+            value = max_stoploss_pct
+        else:
+            # Integer: divide by the appropriate power of 10
+            digits = len(str(int(value)))
+            corrected = value / (10 ** (digits - 1))
+            value = corrected if corrected <= max_stoploss_pct else max_stoploss_pct
+    # Round cleanly to 4 decimal places in percent fractions
+    return round(value / 100.0, 4)
+
+
+def clamp_entry_price(price, proposed_rate, is_long):
+    """
+    Entry price of a plan: its price, but never worse than proposed_rate (not
+    above it for longs, not below it for shorts); proposed_rate if the plan has
+    no price (None or NaN). Works element-wise on NumPy arrays.
+    """
+    price = np.asarray(np.nan if price is None else price, dtype=float)
+    return np.where(is_long, np.fmin(price, proposed_rate), np.fmax(price, proposed_rate))
+
+
+def take_profit_reached(current_profit, take_profit):
+    """
+    Whether a trade's profit (ratio) reached the plan's takeProfit (ratio).
+    Works element-wise on NumPy arrays, a NaN takeProfit is never reached.
+    """
+    return current_profit >= take_profit
+
+
+def _float(data: dict, key: str) -> float | None:
+    value = data.get(key)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        logger.error(f"Invalid {key} in entry_tag: {value!r}")
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class TradePlan:
+    """
+    Trade plan stored in the entry tag of a trade, parsed and normalised once.
+
+    :param stoploss: stop distance as ratio (0.025 = 2.5 %), already normalised
+    :param takeProfit: target profit as ratio (0.05 = 5 %)
+    :param pos: probability of success reported by the backend
+    """
+    id: object = None
+    price: float | None = None
+    stoploss: float | None = None
+    takeProfit: float | None = None
+    leverage: float | None = None
+    pos: float | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict, max_stoploss_pct: float) -> "TradePlan":
+        stoploss = _float(data, "stoploss")
+        take_profit = _float(data, "takeProfit")
+        return cls(
+            id=data.get("id"),
+            price=_float(data, "price"),
+            stoploss=normalise_stoploss(stoploss, max_stoploss_pct) if stoploss is not None else None,
+            takeProfit=take_profit / 100 if take_profit is not None else None,
+            leverage=_float(data, "leverage"),
+            pos=_float(data, "pos"),
+        )
+
+
+EMPTY_PLAN = TradePlan()
+
+
+def plan_tag(signal: dict) -> str:
+    """
+    Entry tag of a trade plan from the backend, read back by parse_tag.
+    """
+    return json.dumps({
+        "id": signal.get('id'),
+        "price": signal.get('entryPoint'),
+        "stoploss": signal.get("stoploss"),
+        "takeProfit": signal.get("takeProfit"),
+        "leverage": signal.get("leverage"),
+        "pos": signal.get("probabilityOfSuccess")
+    })
+
+
+def _parse_tag(entry_tag: str | None, max_stoploss_pct: float) -> TradePlan:
+    if not entry_tag:
+        return EMPTY_PLAN
+    try:
+        data = json.loads(entry_tag)
+        if not isinstance(data, dict):
+            raise ValueError(f"expected an object, got {type(data).__name__}")
+    except ValueError as e:
+        logger.error(f"Error parsing entry_tag {entry_tag!r}: {e}")
+        return EMPTY_PLAN
+    return TradePlan.from_dict(data, max_stoploss_pct)
+
+
+def tag_parser(maxsize: int = 1024):
+    """
+    _parse_tag memoized per tag in an LRU cache of maxsize tags, so the
+    callbacks that run for every open trade on every loop do no JSON parsing. maxsize must exceed the number of open trades, otherwise
+    each loop evicts the tags it is about to look up. Tags that are missing or
+    cannot be parsed give an empty plan.
+    """
+    return lru_cache(maxsize=maxsize)(_parse_tag)
+
+
+parse_tag = tag_parser()
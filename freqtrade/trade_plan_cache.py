@@ -0,0 +1,60 @@
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TradePlanCache:
+    """
+    Bounded LRU cache with a time-to-live for trade plans, keyed by
+    (pair, timeframe, candle timestamp). A plan is requested at most once per
+    candle, repeated analyses of the same candle are served from memory.
+    """
+
+    def __init__(self, max_size: int = 256, ttl: float = 300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self.entries[key] = (time.monotonic(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def get_or_fetch(self, key, fetch):
+        """
+        Returns the cached value of key, or calls fetch() and caches its result
+        (None included, so a candle without a plan is not requested again).
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = fetch()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        ratio = self.hits / total if total else 0.0
+        return f"size={len(self.entries)}/{self.max_size} hits={self.hits} misses={self.misses} hit_ratio={ratio:.2f}"
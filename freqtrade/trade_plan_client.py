@@ -0,0 +1,161 @@
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """
+    Raised instead of calling a backend that keeps failing.
+    """
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing backend for reset_timeout seconds after
+    failure_threshold consecutive failures. After that, one trial call is let
+    through (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class TradePlanClient:
+    """
+    HTTP client for the trade plan server: pooled keep-alive connections,
+    connect/read timeouts, bounded retries with jittered exponential backoff
+    and a circuit breaker that counts every failed attempt. Read timeouts are
+    not retried, so a hung backend blocks a call for one read_timeout only.
+    """
+
+    # Responses worth retrying, everything else 4xx is returned to the caller
+    RETRY_STATUS = {429, 500, 502, 503, 504}
+
+    def __init__(self, url: str, connect_timeout: float = 3.05, read_timeout: float = 10.0, retries: int = 2,
+                 backoff_factor: float = 0.5, backoff_max: float = 5.0, pool_maxsize: int = 10,
+                 failure_threshold: int = 5, reset_timeout: float = 60.0, headers: dict | None = None):
+        self.url = url
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.circuit_breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+    @classmethod
+    def from_config(cls, config: dict, default_url: str) -> "TradePlanClient":
+        """
+        Creates the client from the "trade_plan_server" section of the freqtrade config.
+        """
+        server = config.get("trade_plan_server", {})
+        breaker = server.get("circuit_breaker", {})
+        return cls(
+            url=server.get("url", default_url),
+            connect_timeout=float(server.get("connect_timeout", 3.05)),
+            read_timeout=float(server.get("read_timeout", 10.0)),
+            retries=int(server.get("retries", 2)),
+            backoff_factor=float(server.get("backoff_factor", 0.5)),
+            backoff_max=float(server.get("backoff_max", 5.0)),
+            pool_maxsize=int(server.get("pool_maxsize", 10)),
+            failure_threshold=int(breaker.get("failure_threshold", 5)),
+            reset_timeout=float(breaker.get("reset_timeout", 60.0)),
+            headers=server.get("headers"),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Full-jitter exponential backoff before retry number attempt (1-based).
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * (2 ** (attempt - 1))))
+
+    def post(self, payload: dict, url: str | None = None):
+        """
+        Posts payload (to url, default self.url) and returns the decoded JSON response.
+
+        :raises CircuitOpenError: if the circuit breaker is open
+        :raises requests.exceptions.RequestException: once all retries failed, the
+                 circuit opened or the read timed out
+        """
+        url = url or self.url
+        if not self.circuit_breaker.allow_request():
+            raise CircuitOpenError(f"Circuit open for {url}, skipping request")
+
+        attempt = 0
+        while True:
+            try:
+                response = self.session.post(url, json=payload, timeout=self.timeout)
+                response.raise_for_status()  # Raise exception for HTTP errors
+                data = response.json()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                    requests.exceptions.HTTPError) as e:
+                status = e.response.status_code if e.response is not None else None
+                if status is not None and status not in self.RETRY_STATUS:
+                    # The backend answered (e.g. 400), it is not down
+                    self.circuit_breaker.record_success()
+                    raise
+                self.circuit_breaker.record_failure()
+                # A read timeout means the backend hangs, another attempt would block for read_timeout again
+                if (isinstance(e, requests.exceptions.ReadTimeout) or attempt >= self.retries
+                        or not self.circuit_breaker.allow_request()):
+                    raise
+                attempt += 1
+                delay = self.backoff(attempt)
+                logger.warning(f"Trade plan request failed ({e}), retry {attempt}/{self.retries} in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+            except requests.exceptions.RequestException:
+                self.circuit_breaker.record_failure()
+                raise
+            self.circuit_breaker.record_success()
+            return data
+
+    def close(self):
+        self.session.close()
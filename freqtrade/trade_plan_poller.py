@@ -0,0 +1,132 @@
+import logging
+import threading
+import time
+
+import numpy as np
+
+from trade_plan_prefetch import latency_histogram
+
+logger = logging.getLogger(__name__)
+
+
+class TradePlanStore:
+    """
+    Latest trade plan per pair with the time it was fetched, written by the
+    poller thread and read by the strategy callbacks.
+    """
+
+    def __init__(self):
+        self.plans: dict = {}
+        self._lock = threading.Lock()
+
+    def update(self, plans: dict, fetched_at: float | None = None):
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._lock:
+            for pair, plan in plans.items():
+                self.plans[pair] = (plan, fetched_at)
+
+    def get(self, pair: str, max_age: float | None = None) -> tuple[bool, dict | None, float | None]:
+        """
+        :return: (found, plan, age in seconds) - found is False if pair was never
+                 fetched or its plan is older than max_age
+        """
+        with self._lock:
+            entry = self.plans.get(pair)
+        if entry is None:
+            return False, None, None
+        plan, fetched_at = entry
+        age = time.time() - fetched_at
+        if max_age is not None and age > max_age:
+            return False, None, age
+        return True, plan, age
+
+    def staleness(self) -> dict[str, float]:
+        """
+        Seconds since the plan of each pair was last fetched.
+        """
+        now = time.time()
+        with self._lock:
+            return {pair: now - fetched_at for pair, (_, fetched_at) in self.plans.items()}
+
+    def staleness_summary(self, max_age: float | None = None) -> str:
+        ages = self.staleness()
+        if not ages:
+            return "pairs=0"
+        values = np.fromiter(ages.values(), dtype=float)
+        oldest = max(ages, key=ages.get)
+        summary = f"pairs={len(values)} median={np.median(values):.1f}s max={values.max():.1f}s ({oldest})"
+        if max_age is not None:
+            summary += f" stale={int((values > max_age).sum())}"
+        return summary
+
+
+class TradePlanPoller:
+    """
+    Background thread that refreshes the plans of all pairs every interval
+    seconds, so the strategy callbacks never wait for the backend.
+
+    :param pairs: callable returning the pairs to poll
+    :param fetch_all: callable(pairs) -> (dict of pair -> plan, latencies, batched),
+                      see TradePlanPrefetcher.fetch_all
+    """
+
+    def __init__(self, pairs, fetch_all, interval: float = 60.0, store: TradePlanStore | None = None,
+                 max_age: float | None = None):
+        self.pairs = pairs
+        self.fetch_all = fetch_all
+        self.interval = interval
+        self.max_age = max_age
+        self.store = store or TradePlanStore()
+        self.rounds = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll(self):
+        """
+        Fetches all pairs once and updates the store. An answer without a plan
+        (withdrawn, or left out of a batch answer) replaces the previous plan by
+        None; only failed requests keep it, and it then shows up as stale.
+        """
+        start = time.perf_counter()
+        pairs = list(self.pairs())
+        plans, latencies, batch = self.fetch_all(pairs)
+        self.store.update(plans)
+        self.rounds += 1
+        logger.info(
+            f"Polled {len(pairs)} trade plans{' in one batch' if batch else ''} in "
+            f"{time.perf_counter() - start:.2f}s, latency {latency_histogram(latencies)}, "
+            f"staleness {self.store.staleness_summary(self.max_age)}"
+        )
+        self.log_staleness()
+
+    def log_staleness(self):
+        """
+        Logs the staleness of every pair at debug level, and the pairs whose
+        plan is older than max_age as a warning.
+        """
+        ages = self.store.staleness()
+        for pair, age in sorted(ages.items()):
+            logger.debug(f"Trade plan of {pair} fetched {age:.1f}s ago")
+        stale = sorted(pair for pair, age in ages.items() if self.max_age is not None and age > self.max_age)
+        if stale:
+            logger.warning(f"Trade plans older than {self.max_age:.0f}s: {', '.join(stale)}")
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Error polling trade plans: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="trade-plan-poller", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,124 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets, the last bucket is open-ended
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def latency_histogram(latencies: list[float], buckets: tuple = LATENCY_BUCKETS) -> str:
+    """
+    One-line latency summary: count, p50/p95/max and counts per bucket.
+    """
+    if not latencies:
+        return "n=0"
+    values = np.asarray(latencies)
+    counts = np.bincount(np.searchsorted(buckets, values, side="right"), minlength=len(buckets) + 1)
+    labels = [f"<{int(b * 1000)}ms" for b in buckets] + [f">={int(buckets[-1] * 1000)}ms"]
+    histogram = " ".join(f"{label}:{count}" for label, count in zip(labels, counts))
+    p50, p95 = np.percentile(values, [50, 95])
+    return f"n={len(values)} p50={p50 * 1000:.0f}ms p95={p95 * 1000:.0f}ms max={values.max() * 1000:.0f}ms [{histogram}]"
+
+
+class TradePlanPrefetcher:
+    """
+    Fetches the trade plans of many pairs concurrently once per candle, so a
+    candle cycle costs about one backend latency instead of one per pair.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max_workers
+        self.executor = None
+        self.candle: datetime | None = None
+        self.plans: dict = {}
+        self.last_latencies: list[float] = []
+        self._lock = threading.Lock()
+
+    def fetch_all(self, pairs: list[str], fetch, fetch_batch=None) -> tuple[dict, list[float], bool]:
+        """
+        Calls fetch(pair) for every pair on a bounded thread pool, or
+        fetch_batch(pairs) once if given. Safe to call from several threads.
+
+        :param fetch_batch: optional fetch_batch(pairs) -> dict of pair -> plan that
+                            requests all pairs at once. If it returns None (batches not
+                            supported), the pairs are fetched one by one.
+        :return: (dict of pair -> plan for every pair whose request succeeded, the plan
+                 being None if the server had none; request latencies, batched)
+        """
+        if fetch_batch is not None and pairs:
+            start = time.perf_counter()
+            try:
+                batch = fetch_batch(pairs)
+            except Exception as e:
+                logger.error(f"Error prefetching trade plans in batch: {e}")
+                return {}, [time.perf_counter() - start], True
+            if batch is not None:
+                return {pair: batch.get(pair) for pair in pairs}, [time.perf_counter() - start], True
+
+        with self._lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="trade-plan")
+
+        def timed(pair):
+            start = time.perf_counter()
+            try:
+                return True, fetch(pair), time.perf_counter() - start
+            except Exception as e:
+                logger.error(f"Error prefetching trade plan for {pair}: {e}")
+                return False, None, time.perf_counter() - start
+
+        plans = {}
+        latencies = []
+        futures = {self.executor.submit(timed, pair): pair for pair in pairs}
+        for future in as_completed(futures):
+            ok, plan, latency = future.result()
+            if ok:
+                plans[futures[future]] = plan
+            latencies.append(latency)
+        return plans, latencies, False
+
+    def prefetch(self, candle: datetime, pairs: list[str], fetch, skip: set | None = None,
+                 fetch_batch=None) -> dict:
+        """
+        Fetches the plans of all pairs (see fetch_all) and stores them for
+        candle. Does nothing if candle was fetched already.
+
+        :param skip: pairs that get no request, their plan is None
+        :return: dict of pair -> plan (None if the request failed or was skipped)
+        """
+        if candle == self.candle:
+            return self.plans
+
+        start = time.perf_counter()
+        skip = skip or set()
+        fetched, latencies, batch = self.fetch_all([pair for pair in pairs if pair not in skip], fetch, fetch_batch)
+        plans = {pair: fetched.get(pair) for pair in pairs}
+
+        self.candle = candle
+        self.plans = plans
+        self.last_latencies = latencies
+        logger.info(
+            f"Prefetched {sum(plan is not None for plan in plans.values())}/{len(plans)} trade plans "
+            f"for candle {candle}{' in one batch' if batch else ''} in "
+            f"{time.perf_counter() - start:.2f}s, latency {latency_histogram(latencies)}"
+        )
+        return plans
+
+    def get(self, pair: str, candle: datetime) -> tuple[bool, dict | None]:
+        """
+        :return: (found, plan) - found is False if pair was not prefetched for candle
+        """
+        if candle != self.candle or pair not in self.plans:
+            return False, None
+        return True, self.plans[pair]
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
@@ -0,0 +1,99 @@
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class TradePlanRecorder:
+    """
+    Appends trade plan responses to a JSONL file without blocking the caller.
+    Records are queued and written in batches by a background thread, one JSON
+    object per line, so the file can be replayed with TradePlanReplay.
+
+    :param batch_size: records written per batch
+    :param flush_interval: seconds after which a partial batch is written
+    :param max_queue: records queued at most, further records are dropped (and counted)
+    """
+
+    def __init__(self, path, batch_size: int = 100, flush_interval: float = 1.0, max_queue: int = 100_000):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self.written = 0
+        self.dropped = 0
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._thread = threading.Thread(target=self._run, name="trade-plan-recorder", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def record(self, pair: str, plan, requested_at: datetime, received_at: datetime, latency: float,
+               error: str | None = None, **fields):
+        """
+        Queues one backend response. Never blocks, drops the record if the queue is full.
+        """
+        if self._thread is None:
+            self.start()
+        record = {
+            "pair": pair,
+            **fields,
+            "requested_at": requested_at.isoformat(),
+            "received_at": received_at.isoformat(),
+            "latency": round(latency, 6),
+            "plan": plan,
+        }
+        if error is not None:
+            record["error"] = error
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        with self.path.open("a", encoding="utf-8") as f:
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                try:
+                    record = self.queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+                except queue.Empty:
+                    record = None
+                if record is not None and record is not _STOP:
+                    batch.append(json.dumps(record, default=str))
+                if batch and (len(batch) >= self.batch_size or record is None or record is _STOP):
+                    f.write("\n".join(batch) + "\n")
+                    f.flush()
+                    self.written += len(batch)
+                    batch = []
+                if record is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if record is _STOP:
+                    return
+
+    def close(self, timeout: float | None = 5.0):
+        """
+        Writes all queued records and stops the writer thread.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self.queue.put(_STOP)
+        thread.join(timeout)
+        atexit.unregister(self.close)
+        if self.dropped:
+            logger.warning(f"Trade plan recorder dropped {self.dropped} records, queue was full")
@@ -0,0 +1,98 @@
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from trade_plan import plan_tag
+
+logger = logging.getLogger(__name__)
+
+# Plan fields used for the entry signal and tag
+PLAN_FIELDS = ("id", "direction", "entryPoint", "stoploss", "takeProfit", "leverage", "probabilityOfSuccess")
+
+
+def load_plans(path) -> pd.DataFrame:
+    """
+    Loads recorded trade plans from JSONL (one record per line) or Parquet.
+
+    Each record has a "pair", a "time" (or "requested_at", when the plan was
+    requested) and the plan fields, either flat or nested in "plan" as written
+    by the trade plan recorder. Records without a plan are dropped.
+
+    :return: DataFrame with pair, time (UTC) and PLAN_FIELDS columns, sorted by time
+    """
+    path = Path(path)
+    if path.suffix == ".parquet":
+        records = pd.read_parquet(path)
+    else:
+        with path.open() as f:
+            records = pd.DataFrame.from_records([json.loads(line) for line in f if line.strip()])
+
+    if "plan" in records:
+        has_plan = records["plan"].map(lambda plan: isinstance(plan, dict))
+        records = records[has_plan].reset_index(drop=True)
+        records = records.drop(columns=["plan"]).join(pd.json_normalize(records["plan"].tolist()), rsuffix="_plan")
+
+    time_column = "time" if "time" in records else "requested_at"
+    plans = pd.DataFrame({
+        "pair": records["pair"],
+        "time": pd.to_datetime(records[time_column], utc=True, format="ISO8601").astype("datetime64[ns, UTC]"),
+    })
+    for field in PLAN_FIELDS:
+        # object dtype keeps ids and numbers as recorded when rows without a plan become NaN
+        plans[field] = records[field].astype(object) if field in records else None
+    return plans.sort_values("time", kind="stable").reset_index(drop=True)
+
+
+class TradePlanReplay:
+    """
+    Replays recorded trade plans in backtesting: the plans of a pair are merged
+    onto its whole dataframe at once instead of requesting one candle at a time.
+
+    A plan requested during candle D + 1 (i.e. after candle D closed) belongs to
+    row D, which is the last row the live bot analysed when it requested it.
+    """
+
+    def __init__(self, plans: pd.DataFrame):
+        self.plans = {pair: group.drop(columns=["pair"]).reset_index(drop=True)
+                      for pair, group in plans.groupby("pair", sort=False)}
+
+    @classmethod
+    def from_file(cls, path) -> "TradePlanReplay":
+        plans = load_plans(path)
+        logger.info(f"Loaded {len(plans)} recorded trade plans for {plans['pair'].nunique()} pairs from {path}")
+        return cls(plans)
+
+    def populate_entry_trend(self, dataframe: pd.DataFrame, pair: str, timeframe_seconds: int) -> pd.DataFrame:
+        """
+        Sets enter_long, enter_short and enter_tag for every candle with a recorded plan.
+        """
+        dataframe['enter_long'] = 0
+        dataframe['enter_short'] = 0
+        dataframe['enter_tag'] = None
+        plans = self.plans.get(pair)
+        if plans is None or dataframe.empty:
+            return dataframe
+
+        timeframe = pd.Timedelta(seconds=timeframe_seconds)
+        candles = pd.DataFrame({"close_time": (dataframe['date'] + timeframe).astype("datetime64[ns, UTC]")})
+        # First plan requested in [close_time, close_time + timeframe) of each candle
+        matched = pd.merge_asof(candles, plans, left_on="close_time", right_on="time", direction="forward",
+                                tolerance=timeframe - pd.Timedelta(1, "ns"))
+
+        direction = matched["direction"].to_numpy(dtype=object)
+        long = direction == "long"
+        short = direction == "short"
+        dataframe['enter_long'] = long.astype(int)
+        dataframe['enter_short'] = short.astype(int)
+
+        rows = np.flatnonzero(long | short)
+        if len(rows):
+            signals = matched.loc[rows, list(PLAN_FIELDS)].astype(object)
+            signals = signals.where(signals.notna(), None).to_dict("records")
+            tags = np.full(len(dataframe), None, dtype=object)
+            tags[rows] = [plan_tag(signal) for signal in signals]
+            dataframe['enter_tag'] = tags
+        return dataframe
@@ -0,0 +1,303 @@
+"""
+Shadow-mode evaluation of recorded trade plans against OHLCV data.
+
+Every plan is simulated as BackendStrategy would trade it: the plan goes
+through plan_tag/parse_tag like an entry tag (stoploss normalisation), the
+entry price is clamped with clamp_entry_price (custom_entry_price), the stop
+is the normalised stoploss or the strategy's stoploss (custom_stoploss) and
+the trade exits once take_profit_reached holds at a candle close
+(custom_exit). Profits are leveraged ratios like freqtrade's current_profit
+in futures mode, fees and minimal_roi are not simulated.
+
+The candle paths of many plans are scanned at once as (plans x candles)
+NumPy windows, so a year of 5m candles and thousands of plans take seconds.
+
+Usage:
+    python -m trade_plan_shadow plans.jsonl --datadir user_data/data/hyperliquid [--timeframe 5m]
+"""
+import argparse
+import logging
+import sys
+
+import numpy as np
+import pandas as pd
+from freqtrade.exchange import timeframe_to_seconds
+
+from trade_plan import clamp_entry_price, parse_tag, plan_tag, take_profit_reached
+from trade_plan_replay import PLAN_FIELDS, load_plans
+
+logger = logging.getLogger(__name__)
+
+# Upper bound of window cells (plans x candles) scanned at once
+CHUNK_CELLS = 4_000_000
+
+OUTCOMES = ("take_profit", "stoploss", "timeout", "unfilled", "no_data")
+
+
+def _first(cond: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Per row of cond: whether any column is set and the first such column.
+    """
+    return cond.any(axis=1), cond.argmax(axis=1)
+
+
+def _windows(start: np.ndarray, length: int, n_candles: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Candle indices start .. start + length - 1 per plan, clipped to the data,
+    and the mask of indices that exist.
+    """
+    idx = start[:, None] + np.arange(length)[None, :]
+    valid = idx < n_candles
+    return np.minimum(idx, n_candles - 1), valid
+
+
+def _ns(times: pd.Series) -> np.ndarray:
+    return pd.DatetimeIndex(pd.to_datetime(times, utc=True)).as_unit("ns").asi8
+
+
+def _candle_times(dates: np.ndarray, at: np.ndarray) -> pd.DatetimeIndex:
+    """
+    Open times of the candles at, NaT where at is -1.
+    """
+    nat = np.iinfo(np.int64).min
+    ns = np.where(at >= 0, dates[np.maximum(at, 0)] if len(dates) else nat, nat)
+    return pd.DatetimeIndex(ns.view("datetime64[ns]")).tz_localize("UTC")
+
+
+def parse_plans(plans: pd.DataFrame, max_stoploss_pct: float) -> pd.DataFrame:
+    """
+    Plan parameters as BackendStrategy reads them back from the entry tag.
+
+    :return: DataFrame on plans.index with is_long, is_trade (long or short) and
+             price, stoploss, takeProfit, leverage and pos as floats (NaN if missing)
+    """
+    signals = plans[list(PLAN_FIELDS)].astype(object)
+    signals = signals.where(signals.notna(), None).to_dict("records")
+    parsed = [parse_tag(plan_tag(signal), max_stoploss_pct) for signal in signals]
+
+    def column(name):
+        return np.array([np.nan if getattr(p, name) is None else getattr(p, name) for p in parsed], dtype=float)
+
+    direction = plans["direction"].to_numpy(dtype=object)
+    return pd.DataFrame({
+        "is_long": direction == "long",
+        "is_trade": (direction == "long") | (direction == "short"),
+        "price": column("price"),
+        "stoploss": column("stoploss"),
+        "takeProfit": column("takeProfit"),
+        "leverage": column("leverage"),
+        "pos": column("pos"),
+    }, index=plans.index)
+
+
+def simulate_pair(plans: pd.DataFrame, candles: pd.DataFrame, timeframe: str, max_stoploss_pct: float = 5.0,
+                  entry_timeout: pd.Timedelta = pd.Timedelta(minutes=30), max_candles: int = 2016,
+                  max_leverage: float = np.inf) -> pd.DataFrame:
+    """
+    Simulates the plans of one pair over its candles.
+
+    A plan requested during a candle enters at that candle's open (the
+    proposed rate). A clamped limit price below (long) or above (short) it has
+    to be touched within entry_timeout, else the plan is "unfilled". From the
+    fill candle on, the stop is checked before the takeProfit; trades still
+    open after max_candles close at the last close ("timeout").
+
+    :param plans: plans of the pair as returned by trade_plan_replay.load_plans
+    :param candles: freqtrade OHLCV dataframe (date, open, high, low, close), sorted by date
+    :param max_stoploss_pct: abs(strategy.stoploss) * 100, also the stop of plans without one
+    :return: DataFrame on plans.index with the parsed plan, entry and exit
+             prices and times, outcome, profit (ratio) and r (profit / stoploss)
+    """
+    plan = parse_plans(plans, max_stoploss_pct)
+    n_plans, n_candles = len(plans), len(candles)
+    tf_ns = timeframe_to_seconds(timeframe) * 1_000_000_000
+    dates = _ns(candles["date"])
+    o, h, l, c = (candles[col].to_numpy(dtype=float) for col in ("open", "high", "low", "close"))
+
+    times = _ns(plans["time"])
+    start = np.searchsorted(dates, times, side="right") - 1
+    has_candle = (start >= 0) & (start < n_candles)
+    start = np.clip(start, 0, max(n_candles - 1, 0))
+    if n_candles:
+        has_candle &= times < dates[start] + tf_ns
+    active = has_candle & plan["is_trade"].to_numpy()
+
+    is_long = plan["is_long"].to_numpy()
+    sign = np.where(is_long, 1.0, -1.0)
+    leverage = np.minimum(np.nan_to_num(plan["leverage"].to_numpy(), nan=1.0), max_leverage)
+    # custom_stoploss returns None without a plan stoploss, leaving the strategy's stoploss
+    stoploss = np.nan_to_num(plan["stoploss"].to_numpy(), nan=round(max_stoploss_pct / 100.0, 4))
+    take_profit = plan["takeProfit"].to_numpy()
+
+    proposed = o[start] if n_candles else np.full(n_plans, np.nan)
+    entry = clamp_entry_price(plan["price"].to_numpy(), proposed, is_long)
+    stop = entry * (1 - sign * stoploss / leverage)
+
+    result = pd.DataFrame({
+        "outcome": np.where(active, "unfilled", "no_data").astype(object),
+        "entry_price": entry,
+    }, index=plans.index)
+    fill_candles = max(int(np.ceil(entry_timeout.value / tf_ns)), 1)
+    fill_at = np.full(n_plans, -1)
+    exit_at = np.full(n_plans, -1)
+    exit_price = np.full(n_plans, np.nan)
+    outcome = result["outcome"].to_numpy()
+
+    rows = np.flatnonzero(active)
+    chunk = max(CHUNK_CELLS // max(max_candles, fill_candles), 1)
+    for first_row in range(0, len(rows), chunk):
+        r = rows[first_row:first_row + chunk]
+        long = is_long[r][:, None]
+
+        # Entry: the clamped limit price is touched within the entry timeout
+        idx, valid = _windows(start[r], fill_candles, n_candles)
+        touched = np.where(long, l[idx] <= entry[r][:, None], h[idx] >= entry[r][:, None]) & valid
+        filled, offset = _first(touched)
+        r, fill = r[filled], start[r][filled] + offset[filled]
+        fill_at[r] = fill
+        if not len(r):
+            continue
+
+        # Exit: stoploss before takeProfit (at the close, like custom_exit)
+        long = is_long[r][:, None]
+        idx, valid = _windows(fill, max_candles, n_candles)
+        stop_r = stop[r][:, None]
+        stopped = np.where(long, l[idx] <= stop_r, h[idx] >= stop_r) & valid
+        profit_close = (c[idx] / entry[r][:, None] - 1) * sign[r][:, None] * leverage[r][:, None]
+        target = take_profit_reached(profit_close, take_profit[r][:, None]) & valid
+        any_stop, stop_off = _first(stopped)
+        any_target, target_off = _first(target)
+        stop_off = np.where(any_stop, stop_off, max_candles)
+        target_off = np.where(any_target, target_off, max_candles)
+
+        by_stop = any_stop & (stop_off <= target_off)
+        by_target = any_target & ~by_stop
+        last_off = valid.sum(axis=1) - 1
+        off = np.where(by_stop, stop_off, np.where(by_target, target_off, last_off))
+        at = fill + off
+        # A stop gapped through at the open fills at the open, not on the fill candle itself
+        gapped = np.where(is_long[r], np.fmin(o[at], stop[r]), np.fmax(o[at], stop[r]))
+        stop_price = np.where(off > 0, gapped, stop[r])
+        exit_at[r] = at
+        exit_price[r] = np.where(by_stop, stop_price, c[at])
+        outcome[r] = np.where(by_stop, "stoploss", np.where(by_target, "take_profit", "timeout"))
+
+    filled = fill_at >= 0
+    result["outcome"] = outcome
+    result["entry_time"] = _candle_times(dates, fill_at)
+    result["exit_time"] = _candle_times(dates, exit_at)
+    result["exit_price"] = exit_price
+    result["profit"] = np.where(filled, (exit_price / entry - 1) * sign * leverage, np.nan)
+    result["r"] = result["profit"] / stoploss
+    result["stoploss"] = stoploss
+    result["takeProfit"] = take_profit
+    result["leverage"] = leverage
+    result["pos"] = plan["pos"].to_numpy()
+    return result
+
+
+def simulate(plans: pd.DataFrame, candles: dict[str, pd.DataFrame], timeframe: str, **kwargs) -> pd.DataFrame:
+    """
+    Simulates all plans, pair by pair (see simulate_pair). Plans of pairs
+    without candles get the outcome "no_data".
+
+    :return: plans with the simulation columns added, stoploss, takeProfit and
+             leverage replaced by the values the strategy would have used
+    """
+    parts = []
+    empty = pd.DataFrame(columns=["date", "open", "high", "low", "close"])
+    for pair, group in plans.groupby("pair", sort=False):
+        parts.append(simulate_pair(group, candles.get(pair, empty), timeframe, **kwargs))
+    simulated = pd.concat(parts) if parts else pd.DataFrame(columns=["outcome"])
+    return plans.drop(columns=[c for c in simulated.columns if c in plans]).join(simulated)
+
+
+def _resolved_pos(results: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """
+    pos (as probability) and whether the takeProfit was hit, for trades that
+    ended at their stop or target.
+    """
+    resolved = results[results["outcome"].isin(("take_profit", "stoploss")) & results["pos"].notna()]
+    pos = resolved["pos"].to_numpy(dtype=float)
+    if len(pos) and pos.max() > 1:
+        # Reported in percent
+        pos = pos / 100.0
+    return pos, (resolved["outcome"] == "take_profit").to_numpy()
+
+
+def calibration(results: pd.DataFrame, bins: int = 10) -> pd.DataFrame:
+    """
+    Observed take-profit rate of resolved trades per bin of probabilityOfSuccess.
+
+    :return: DataFrame per bin with trades, mean pos and hit_rate
+    """
+    pos, hit = _resolved_pos(results)
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    which = np.clip(np.digitize(pos, edges[1:-1]), 0, bins - 1)
+    trades = np.bincount(which, minlength=bins)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return pd.DataFrame({
+            "bin": [f"{edges[i]:.1f}-{edges[i + 1]:.1f}" for i in range(bins)],
+            "trades": trades,
+            "pos": np.bincount(which, weights=pos, minlength=bins) / trades,
+            "hit_rate": np.bincount(which, weights=hit, minlength=bins) / trades,
+        })
+
+
+def summary(results: pd.DataFrame) -> dict:
+    """
+    Hit rate (take profits of resolved trades), realised R and Brier score of pos.
+    """
+    counts = results["outcome"].value_counts()
+    filled = results[results["outcome"].isin(("take_profit", "stoploss", "timeout"))]
+    take_profits, stoplosses = int(counts.get("take_profit", 0)), int(counts.get("stoploss", 0))
+    pos, hit = _resolved_pos(results)
+    return {
+        "plans": len(results),
+        **{outcome: int(counts.get(outcome, 0)) for outcome in OUTCOMES},
+        "hit_rate": take_profits / (take_profits + stoplosses) if take_profits + stoplosses else float("nan"),
+        "mean_r": float(filled["r"].mean()) if len(filled) else float("nan"),
+        "total_r": float(filled["r"].sum()),
+        "mean_profit": float(filled["profit"].mean()) if len(filled) else float("nan"),
+        "brier": float(np.mean((pos - hit) ** 2)) if len(pos) else float("nan"),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    from backend_strategy import BackendStrategy
+
+    parser = argparse.ArgumentParser(prog="python -m trade_plan_shadow",
+                                     description="Scores recorded trade plans against OHLCV data.")
+    parser.add_argument("plans", help="recorded trade plans (JSONL or Parquet)")
+    parser.add_argument("--datadir", required=True, help="freqtrade data directory with the pairs' candles")
+    parser.add_argument("--timeframe", default=BackendStrategy.timeframe)
+    parser.add_argument("--candle-type", default="futures", help="freqtrade candle type (default: futures)")
+    parser.add_argument("--data-format", default="feather")
+    parser.add_argument("--entry-timeout", type=float, default=30, help="minutes a limit entry may stay open")
+    parser.add_argument("--max-candles", type=int, default=2016, help="candles a trade may stay open")
+    parser.add_argument("--max-leverage", type=float, default=np.inf)
+    parser.add_argument("-o", "--output", default=None, help="write per-plan results to this CSV file")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    from pathlib import Path
+
+    from freqtrade.data.history import load_data
+    from freqtrade.enums import CandleType
+
+    plans = load_plans(args.plans)
+    candles = load_data(Path(args.datadir), args.timeframe, plans["pair"].unique().tolist(),
+                        data_format=args.data_format, candle_type=CandleType(args.candle_type))
+    results = simulate(plans, candles, args.timeframe, max_stoploss_pct=abs(BackendStrategy.stoploss) * 100.0,
+                       entry_timeout=pd.Timedelta(minutes=args.entry_timeout), max_candles=args.max_candles,
+                       max_leverage=args.max_leverage)
+    for key, value in summary(results).items():
+        logger.info(f"{key:>12}: {value:.4f}" if isinstance(value, float) else f"{key:>12}: {value}")
+    logger.info(f"Calibration of probabilityOfSuccess:\n{calibration(results).to_string(index=False)}")
+    if args.output:
+        results.to_csv(args.output, index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
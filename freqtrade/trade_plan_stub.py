@@ -0,0 +1,60 @@
+"""
+Local stand-in for the trade plan server, used by the tests and benchmarks
+instead of the network.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def default_plan(pair: str) -> dict:
+    return {"id": pair, "pair": pair, "direction": "long", "entryPoint": 100.0, "stoploss": 2.0,
+            "takeProfit": 4.0, "leverage": 3, "probabilityOfSuccess": 0.6}
+
+
+class TradePlanStub:
+    """
+    Local stand-in for the trade plan server. Answers {"pair": ...} requests with
+    plan(pair) and, if batch is set, {"pairs": [...]} requests with a list of plans.
+    Without batch support, batch requests get 404 like from a server that does not
+    know them. All request payloads are recorded in requests.
+    """
+
+    def __init__(self, plan=default_plan, batch: bool = True):
+        self.plan = plan
+        self.batch = batch
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stub.requests.append(payload)
+                if "pairs" in payload:
+                    if not stub.batch:
+                        return self._reply(404, {"error": "pair is required"})
+                    return self._reply(200, [stub.plan(pair) for pair in payload["pairs"]])
+                return self._reply(200, stub.plan(payload["pair"]))
+
+            def _reply(self, status, data):
+                body = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/api/v1/trading/tradePlan"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()